@@ -0,0 +1,129 @@
+import asyncio
+import functools
+
+
+class ExecutorAsyncClient(object):
+    client_class = None
+
+    def __init__(self, conn_string, executor=None):
+        """
+        An ``asyncio`` wrapper around a regular (blocking) backend
+        ``Client``.
+
+        Each call is run in an executor, so the event loop is never blocked.
+        Subclasses set ``client_class`` to the ``Client`` to wrap.
+
+        Args:
+            conn_string (str): The DSN. Passed along to the wrapped client.
+            executor (concurrent.futures.Executor): Optional. The executor
+                to run calls in. Default is `None` (the loop's default
+                executor).
+        """
+        self.conn_string = conn_string
+        self.executor = executor
+        self.client = self.client_class(conn_string)
+
+        # Only advertise blocking pops if the wrapped client can do them.
+        if getattr(self.client, "pop_blocking", None) is None:
+            self.pop_blocking = None
+
+        # Likewise for the other optional methods.
+        for name in (
+            "flush",
+            "reserve",
+            "ack",
+            "nack",
+            "reap",
+            "park",
+            "mark_complete",
+        ):
+            if getattr(self.client, name, None) is None:
+                setattr(self, name, None)
+
+    async def run_in_executor(self, method_name, *args, **kwargs):
+        """
+        Calls a method on the wrapped client within the executor.
+
+        Args:
+            method_name (str): The name of the client method to call
+            args (list): Positional arguments to pass to the method
+            kwargs (dict): Keyword arguments to pass to the method
+
+        Returns:
+            The method's return value
+        """
+        loop = asyncio.get_running_loop()
+        method = getattr(self.client, method_name)
+        return await loop.run_in_executor(
+            self.executor, functools.partial(method, *args, **kwargs)
+        )
+
+    async def len(self, queue_name):
+        return await self.run_in_executor("len", queue_name)
+
+    async def drop_all(self, queue_name):
+        return await self.run_in_executor("drop_all", queue_name)
+
+    async def push(
+        self, queue_name, task_id, data, delay_until=None, **kwargs
+    ):
+        return await self.run_in_executor(
+            "push",
+            queue_name,
+            task_id,
+            data,
+            delay_until=delay_until,
+            **kwargs
+        )
+
+    async def push_many(self, queue_name, items, **kwargs):
+        return await self.run_in_executor(
+            "push_many", queue_name, items, **kwargs
+        )
+
+    async def pop(self, queue_name):
+        return await self.run_in_executor("pop", queue_name)
+
+    async def pop_many(self, queue_name, count):
+        return await self.run_in_executor("pop_many", queue_name, count)
+
+    async def pop_blocking(self, queue_name, timeout, count=1):
+        return await self.run_in_executor(
+            "pop_blocking", queue_name, timeout, count=count
+        )
+
+    async def get(self, queue_name, task_id):
+        return await self.run_in_executor("get", queue_name, task_id)
+
+    async def flush(self):
+        return await self.run_in_executor("flush")
+
+    async def reserve(self, queue_name, count, lease_time):
+        return await self.run_in_executor(
+            "reserve", queue_name, count, lease_time
+        )
+
+    async def ack(self, queue_name, receipt):
+        return await self.run_in_executor("ack", queue_name, receipt)
+
+    async def nack(self, queue_name, receipt):
+        return await self.run_in_executor("nack", queue_name, receipt)
+
+    async def reap(self, queue_name):
+        return await self.run_in_executor("reap", queue_name)
+
+    async def park(
+        self, queue_name, task_id, data, depends_on, delay_until=None, **kwargs
+    ):
+        return await self.run_in_executor(
+            "park",
+            queue_name,
+            task_id,
+            data,
+            depends_on,
+            delay_until=delay_until,
+            **kwargs
+        )
+
+    async def mark_complete(self, queue_name, task_id):
+        return await self.run_in_executor("mark_complete", queue_name, task_id)
@@ -1,16 +1,205 @@
-import math
+import collections
+import heapq
+import itertools
+import threading
 import time
 
+from alligator.backends.aio import ExecutorAsyncClient
+
+
+
+class TaskQueue(object):
+    def __init__(self):
+        """
+        The in-memory structure behind a single locmem queue.
+
+        Ready tasks sit in a FIFO ``deque`` (one per priority, with the
+        default priority in ``ready``), while delayed tasks sit in a heap
+        ordered by ``delay_until`` until they come due. Tasks are also
+        indexed by ID, so removing one (via ``get``) just marks its entry as
+        dead (a tombstone) rather than searching the queue. Dead entries
+        are skipped when popped.
+
+        Not thread-safe on its own. The `Client` holds a lock around it.
+        """
+        self.ready = collections.deque()
+        # Deques for the non-zero priorities, highest first in ``levels``.
+        self.prioritized = {}
+        self.levels = []
+        self.delayed = []
+        self.entries = {}
+        self.tombstones = 0
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, task_id):
+        return task_id in self.entries
+
+    def push(self, task_id, delay_until=None, now=None, priority=0):
+        """
+        Adds a task to the queue.
+
+        Args:
+            task_id (str): The identifier of the task.
+            delay_until (float): Optional. The Unix timestamp to delay
+                the task until. Default is `None` (no delay).
+            now (float): Optional. The current Unix timestamp. Default is
+                `None` (look it up).
+            priority (int): Optional. Higher priorities are popped first.
+                Default is `0`.
+        """
+        if task_id in self.entries:
+            self.remove(task_id)
+
+        entry = [task_id, delay_until]
+        self.entries[task_id] = entry
+
+        if delay_until is not None:
+            now = time.time() if now is None else now
+
+            if delay_until > now:
+                # The counter breaks ties, keeping the heap stable.
+                heapq.heappush(
+                    self.delayed,
+                    (delay_until, next(self.counter), entry, priority),
+                )
+                return
+
+        self._ready(priority).append(entry)
+
+    def _ready(self, priority):
+        if not priority:
+            return self.ready
+
+        if priority not in self.prioritized:
+            self.prioritized[priority] = collections.deque()
+            self.levels = sorted(self.prioritized, reverse=True)
+
+        return self.prioritized[priority]
+
+    def promote(self, now):
+        """
+        Moves any delayed tasks that have come due onto the ready queue.
+
+        Args:
+            now (float): The current Unix timestamp.
+        """
+        while self.delayed and self.delayed[0][0] <= now:
+            _, _, entry, priority = heapq.heappop(self.delayed)
+            self._ready(priority).append(entry)
+
+    def pop(self, now):
+        """
+        Removes & returns the ID of the next ready task, from the highest
+        priority with any waiting.
+
+        Args:
+            now (float): The current Unix timestamp.
+
+        Returns:
+            str: The task's ID, or `None` if no task is ready
+        """
+        self.promote(now)
+
+        for priority in self.levels + [0]:
+            ready = self._ready(priority)
+
+            while ready:
+                entry = ready.popleft()
+
+                if entry[0] is None:
+                    self.tombstones -= 1
+                    continue
+
+                del self.entries[entry[0]]
+                return entry[0]
+
+    def next_delay(self):
+        """
+        Returns when the next delayed task comes due.
+
+        Returns:
+            float: The Unix timestamp, or `None` if nothing is delayed
+        """
+        while self.delayed and self.delayed[0][2][0] is None:
+            heapq.heappop(self.delayed)
+            self.tombstones -= 1
+
+        if self.delayed:
+            return self.delayed[0][0]
+
+    def remove(self, task_id):
+        """
+        Removes a specific task from the queue.
+
+        Args:
+            task_id (str): The identifier of the task.
+
+        Returns:
+            bool: `True` if the task was in the queue
+        """
+        entry = self.entries.pop(task_id, None)
+
+        if entry is None:
+            return False
+
+        entry[0] = None
+        self.tombstones += 1
+
+        # Don't let the dead entries pile up.
+        if self.tombstones > max(len(self.entries), 64):
+            self.compact()
+
+        return True
+
+    def compact(self):
+        """
+        Drops all the dead entries.
+        """
+        self.ready = collections.deque(
+            entry for entry in self.ready if entry[0] is not None
+        )
+
+        for priority, ready in self.prioritized.items():
+            self.prioritized[priority] = collections.deque(
+                entry for entry in ready if entry[0] is not None
+            )
+
+        self.delayed = [
+            item for item in self.delayed if item[2][0] is not None
+        ]
+        heapq.heapify(self.delayed)
+        self.tombstones = 0
+
 
 class Client(object):
     queues = {}
     task_data = {}
+    # Reserved tasks, as ``{queue_name: {task_id: lease_until}}``.
+    leases = {}
+    # Parked tasks, as ``{queue_name: {task_id: [remaining, delay_until]}}``.
+    pending = {}
+    # The tasks waiting on each task, as ``{task_id: [(queue_name,
+    # task_id), ...]}``.
+    dependents = {}
+    # Held locks, as ``{name: (owner, expires_at)}``.
+    locks = {}
+    # The non-zero priorities of tasks (so reserved & parked tasks keep
+    # theirs), as ``{task_id: priority}``.
+    priorities = {}
+    # Guards all the shared state & wakes up anything blocked in
+    # ``pop_blocking`` when tasks arrive.
+    condition = threading.Condition(threading.RLock())
 
     def __init__(self, conn_string):
         """
         An in-memory `Client`. Useful for development & testing.
 
-        Likely not particularly thread-safe.
+        All instances share the same (thread-safe) storage. Pushes, pops &
+        fetching a specific task by ID are all ``O(1)`` (or ``O(log n)``
+        for delayed tasks), regardless of queue length.
 
         Args:
             conn_string (str): The DSN. Ignored.
@@ -18,6 +207,14 @@ class Client(object):
         # We ignore the conn_string, since everything is happening in-memory.
         pass
 
+    def _queue(self, queue_name):
+        queues = self.__class__.queues
+
+        if queue_name not in queues:
+            queues[queue_name] = TaskQueue()
+
+        return queues[queue_name]
+
     def len(self, queue_name):
         """
         Returns the length of the queue.
@@ -29,7 +226,8 @@ class Client(object):
         Returns:
             int: The length of the queue
         """
-        return len(self.__class__.queues.get(queue_name, []))
+        with self.__class__.condition:
+            return len(self.__class__.queues.get(queue_name, ()))
 
     def drop_all(self, queue_name):
         """
@@ -41,12 +239,19 @@ class Client(object):
         """
         cls = self.__class__
 
-        for task_id, _ in cls.queues.get(queue_name, []):
-            cls.task_data.pop(task_id, None)
+        with cls.condition:
+            for task_ids in (
+                cls.queues.get(queue_name, TaskQueue()).entries,
+                cls.leases.pop(queue_name, {}),
+                cls.pending.pop(queue_name, {}),
+            ):
+                for task_id in task_ids:
+                    cls.task_data.pop(task_id, None)
+                    cls.priorities.pop(task_id, None)
 
-        cls.queues[queue_name] = []
+            cls.queues[queue_name] = TaskQueue()
 
-    def push(self, queue_name, task_id, data, delay_until=None):
+    def push(self, queue_name, task_id, data, delay_until=None, priority=0):
         """
         Pushes a task onto the queue.
 
@@ -57,16 +262,52 @@ class Client(object):
             data (str): The relevant data for the task.
             delay_until (float): Optional. The Unix timestamp to delay
                 execution of the task until. Default is `None` (no delay).
+            priority (int): Optional. Higher priorities are popped first.
+                Default is `0`.
 
         Returns:
             str: The task's ID
         """
-        cls = self.__class__
-        cls.queues.setdefault(queue_name, [])
-        cls.queues[queue_name].append([task_id, delay_until])
-        cls.task_data[task_id] = data
+        self._push_items(
+            queue_name, [(task_id, data, delay_until)], priority=priority
+        )
         return task_id
 
+    def push_many(self, queue_name, items, priority=0):
+        """
+        Pushes many tasks onto the queue at once.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                `Gator` instance.
+            items (list): A list of ``(task_id, data, delay_until)`` tuples.
+            priority (int): Optional. The priority of every task. Higher
+                priorities are popped first. Default is `0`.
+
+        Returns:
+            list: The tasks' IDs
+        """
+        self._push_items(queue_name, items, priority=priority)
+        return [task_id for task_id, _, _ in items]
+
+    def _push_items(self, queue_name, items, priority=0):
+        cls = self.__class__
+        now = time.time()
+
+        with cls.condition:
+            queue = self._queue(queue_name)
+
+            for task_id, data, delay_until in items:
+                queue.push(task_id, delay_until, now=now, priority=priority)
+                cls.task_data[task_id] = data
+
+                if priority:
+                    cls.priorities[task_id] = priority
+                else:
+                    cls.priorities.pop(task_id, None)
+
+            cls.condition.notify_all()
+
     def pop(self, queue_name):
         """
         Pops a task off the queue.
@@ -78,21 +319,353 @@ class Client(object):
         Returns:
             str: The data for the task.
         """
+        popped = self._pop_items(queue_name, 1)
+
+        if popped:
+            return popped[0]
+
+    def pop_many(self, queue_name, count):
+        """
+        Pops up to ``count`` tasks off the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                `Gator` instance.
+            count (int): The maximum number of tasks to pop.
+
+        Returns:
+            list: The data for the tasks.
+        """
+        return self._pop_items(queue_name, count)
+
+    def _pop_items(self, queue_name, count):
+        cls = self.__class__
+        now = time.time()
+        popped = []
+
+        with cls.condition:
+            queue = cls.queues.get(queue_name)
+
+            while queue is not None and len(popped) < count:
+                task_id = queue.pop(now)
+
+                if task_id is None:
+                    break
+
+                cls.priorities.pop(task_id, None)
+                popped.append(cls.task_data.pop(task_id, None))
+
+        return popped
+
+    def pop_blocking(self, queue_name, timeout, count=1):
+        """
+        Pops up to ``count`` tasks off the queue, waiting up to ``timeout``
+        seconds for one to become available.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                `Gator` instance.
+            timeout (float): The maximum number of seconds to wait.
+            count (int): Optional. The maximum number of tasks to pop.
+                Default is `1`.
+
+        Returns:
+            list: The data for the tasks. Empty if none arrived in time.
+        """
+        cls = self.__class__
+        deadline = time.time() + timeout
+
+        with cls.condition:
+            while True:
+                popped = self._pop_items(queue_name, count)
+
+                if popped:
+                    return popped
+
+                now = time.time()
+                wait_for = deadline - now
+
+                if wait_for <= 0:
+                    return []
+
+                # Wake up in time for the next delayed task, if any.
+                next_delay = self._queue(queue_name).next_delay()
+
+                if next_delay is not None:
+                    wait_for = min(wait_for, max(next_delay - now, 0.01))
+
+                cls.condition.wait(wait_for)
+
+    def reserve(self, queue_name, count, lease_time):
+        """
+        Takes up to ``count`` tasks off the queue, holding onto them until
+        they're acknowledged (see `Client.ack`).
+
+        Any not acknowledged within ``lease_time`` seconds are placed back
+        on the queue by `Client.reap`.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                `Gator` instance.
+            count (int): The maximum number of tasks to reserve.
+            lease_time (float): How long (in seconds) to hold each task.
+
+        Returns:
+            list: ``(receipt, data)`` tuples, one per task.
+        """
+        cls = self.__class__
+        now = time.time()
+        reserved = []
+
+        with cls.condition:
+            queue = cls.queues.get(queue_name)
+            leases = cls.leases.setdefault(queue_name, {})
+
+            while queue is not None and len(reserved) < count:
+                task_id = queue.pop(now)
+
+                if task_id is None:
+                    break
+
+                leases[task_id] = now + lease_time
+                reserved.append((task_id, cls.task_data.get(task_id)))
+
+        return reserved
+
+    def ack(self, queue_name, receipt):
+        """
+        Acknowledges a reserved task is done with, removing it for good.
+
+        If the task was pushed again under the same ID (for instance, to be
+        retried), only the lease is removed.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                `Gator` instance.
+            receipt (str): The receipt from `Client.reserve`.
+        """
+        cls = self.__class__
+
+        with cls.condition:
+            leased = cls.leases.get(queue_name, {}).pop(receipt, None)
+
+            if leased is not None and receipt not in self._queue(queue_name):
+                cls.task_data.pop(receipt, None)
+                cls.priorities.pop(receipt, None)
+
+    def nack(self, queue_name, receipt):
+        """
+        Places a reserved task straight back on the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                `Gator` instance.
+            receipt (str): The receipt from `Client.reserve`.
+        """
+        self._requeue(queue_name, [receipt])
+
+    def reap(self, queue_name):
+        """
+        Places any reserved tasks whose lease has run out back on the
+        queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                `Gator` instance.
+
+        Returns:
+            int: The number of tasks placed back on the queue.
+        """
+        cls = self.__class__
+        now = time.time()
+
+        with cls.condition:
+            expired = [
+                task_id
+                for task_id, lease_until in cls.leases.get(
+                    queue_name, {}
+                ).items()
+                if lease_until <= now
+            ]
+            return self._requeue(queue_name, expired)
+
+    def _requeue(self, queue_name, task_ids):
+        cls = self.__class__
+        requeued = 0
+
+        with cls.condition:
+            leases = cls.leases.get(queue_name, {})
+            queue = self._queue(queue_name)
+
+            for task_id in task_ids:
+                if leases.pop(task_id, None) is not None:
+                    queue.push(
+                        task_id, priority=cls.priorities.get(task_id, 0)
+                    )
+                    requeued += 1
+
+            if requeued:
+                cls.condition.notify_all()
+
+        return requeued
+
+    def park(
+        self,
+        queue_name,
+        task_id,
+        data,
+        depends_on,
+        delay_until=None,
+        priority=0,
+    ):
+        """
+        Stores a task that can't run until the tasks it depends on have
+        completed (see `Client.mark_complete`).
+
+        The task is kept out of the queue (& doesn't count towards its
+        length) until then. Dependencies that are no longer queued,
+        reserved or parked are taken to have completed, so if that's all of
+        them, it's pushed right away.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                `Gator` instance.
+            task_id (str): The identifier of the task.
+            data (str): The relevant data for the task.
+            depends_on (list): The IDs of the tasks it depends on.
+            delay_until (float): Optional. The Unix timestamp to delay
+                execution of the task until. Default is `None` (no delay).
+            priority (int): Optional. Higher priorities are popped first.
+                Default is `0`.
+
+        Returns:
+            str: The task's ID
+        """
+        cls = self.__class__
+
+        with cls.condition:
+            waiting_on = [
+                depends
+                for depends in set(depends_on)
+                if depends in cls.task_data
+            ]
+
+            if not waiting_on:
+                return self.push(
+                    queue_name,
+                    task_id,
+                    data,
+                    delay_until=delay_until,
+                    priority=priority,
+                )
+
+            cls.task_data[task_id] = data
+
+            if priority:
+                cls.priorities[task_id] = priority
+
+            cls.pending.setdefault(queue_name, {})[task_id] = [
+                len(waiting_on),
+                delay_until,
+            ]
+
+            for depends in waiting_on:
+                cls.dependents.setdefault(depends, []).append(
+                    (queue_name, task_id)
+                )
+
+        return task_id
+
+    def mark_complete(self, queue_name, task_id):
+        """
+        Releases any parked tasks that were only waiting on a completed task
+        onto their queues.
+
+        Each parked task keeps a count of the dependencies it's still
+        waiting on, so releasing one is ``O(1)``. Nothing is recorded for
+        tasks without dependents.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                `Gator` instance.
+            task_id (str): The identifier of the completed task.
+
+        Returns:
+            int: The number of tasks released.
+        """
         cls = self.__class__
-        queue = cls.queues.get(queue_name, [])
-        now = math.floor(time.time())
+        now = time.time()
+        released = 0
 
-        for offset, task_info in enumerate(queue):
-            task_id, delay_until = task_info[0], task_info[1]
+        with cls.condition:
+            for dependent_queue, dependent_id in cls.dependents.pop(
+                task_id, []
+            ):
+                pending = cls.pending.get(dependent_queue, {})
+                waiting = pending.get(dependent_id)
 
-            # Check for a delay.
-            if delay_until is not None:
-                if now < delay_until:
+                if waiting is None:
                     continue
 
-            # We've found one we can process.
-            queue.pop(offset)
-            return cls.task_data.pop(task_id, None)
+                waiting[0] -= 1
+
+                if waiting[0] <= 0:
+                    del pending[dependent_id]
+                    self._queue(dependent_queue).push(
+                        dependent_id,
+                        waiting[1],
+                        now=now,
+                        priority=cls.priorities.get(dependent_id, 0),
+                    )
+                    released += 1
+
+            if released:
+                cls.condition.notify_all()
+
+        return released
+
+    def acquire_lock(self, name, owner, timeout):
+        """
+        Takes (or renews) a named lock, if no one else holds it.
+
+        Used so only one `Scheduler` enqueues tasks at a time.
+
+        Args:
+            name (str): The name of the lock.
+            owner (str): A unique identifier for whoever's taking it.
+            timeout (float): How long (in seconds) the lock is held for,
+                unless renewed.
+
+        Returns:
+            bool: `True` if ``owner`` now holds the lock
+        """
+        cls = self.__class__
+        now = time.time()
+
+        with cls.condition:
+            held = cls.locks.get(name)
+
+            if held is not None and held[0] != owner and held[1] > now:
+                return False
+
+            cls.locks[name] = (owner, now + timeout)
+            return True
+
+    def release_lock(self, name, owner):
+        """
+        Gives up a named lock, if ``owner`` holds it.
+
+        Args:
+            name (str): The name of the lock.
+            owner (str): The identifier used to take it.
+        """
+        cls = self.__class__
+
+        with cls.condition:
+            held = cls.locks.get(name)
+
+            if held is not None and held[0] == owner:
+                del cls.locks[name]
 
     def get(self, queue_name, task_id):
         """
@@ -106,11 +679,96 @@ class Client(object):
         Returns:
             str: The data for the task.
         """
-        # This method is *very* non-thread-safe.
         cls = self.__class__
-        queue = cls.queues.get(queue_name, [])
 
-        for offset, task_info in enumerate(queue):
-            if task_info[0] == task_id:
-                queue.pop(offset)
+        with cls.condition:
+            queue = cls.queues.get(queue_name)
+
+            # Parked tasks can be fetched too.
+            if (
+                queue is not None and queue.remove(task_id)
+            ) or cls.pending.get(queue_name, {}).pop(task_id, None):
+                cls.priorities.pop(task_id, None)
                 return cls.task_data.pop(task_id, None)
+
+
+class AsyncClient(ExecutorAsyncClient):
+    client_class = Client
+
+    def __init__(self, conn_string, executor=None):
+        """
+        An ``asyncio`` version of the in-memory `Client`.
+
+        Shares the same storage as `Client`. Since nothing here ever waits
+        on I/O, calls are made directly on the event loop, except for
+        `AsyncClient.pop_blocking` (which is run in an executor).
+
+        Args:
+            conn_string (str): The DSN. Ignored.
+            executor (concurrent.futures.Executor): Optional. The executor
+                to wait for tasks in. Default is `None` (the loop's default
+                executor).
+        """
+        super(AsyncClient, self).__init__(conn_string, executor=executor)
+
+    async def len(self, queue_name):
+        return self.client.len(queue_name)
+
+    async def drop_all(self, queue_name):
+        return self.client.drop_all(queue_name)
+
+    async def push(
+        self, queue_name, task_id, data, delay_until=None, priority=0
+    ):
+        return self.client.push(
+            queue_name,
+            task_id,
+            data,
+            delay_until=delay_until,
+            priority=priority,
+        )
+
+    async def push_many(self, queue_name, items, priority=0):
+        return self.client.push_many(queue_name, items, priority=priority)
+
+    async def pop(self, queue_name):
+        return self.client.pop(queue_name)
+
+    async def pop_many(self, queue_name, count):
+        return self.client.pop_many(queue_name, count)
+
+    async def get(self, queue_name, task_id):
+        return self.client.get(queue_name, task_id)
+
+    async def reserve(self, queue_name, count, lease_time):
+        return self.client.reserve(queue_name, count, lease_time)
+
+    async def ack(self, queue_name, receipt):
+        return self.client.ack(queue_name, receipt)
+
+    async def nack(self, queue_name, receipt):
+        return self.client.nack(queue_name, receipt)
+
+    async def reap(self, queue_name):
+        return self.client.reap(queue_name)
+
+    async def park(
+        self,
+        queue_name,
+        task_id,
+        data,
+        depends_on,
+        delay_until=None,
+        priority=0,
+    ):
+        return self.client.park(
+            queue_name,
+            task_id,
+            data,
+            depends_on,
+            delay_until=delay_until,
+            priority=priority,
+        )
+
+    async def mark_complete(self, queue_name, task_id):
+        return self.client.mark_complete(queue_name, task_id)
@@ -1,8 +1,356 @@
-import math
+import sys
 import time
 from urllib.parse import urlparse
 
 import redis
+import redis.asyncio
+
+
+# The most pending wake-ups kept around for workers blocked on a queue.
+MAX_NOTIFICATIONS = 100
+# Tasks with the same score pop in task ID order, so each task pushed gets a
+# score at least this far past the last one (of the same priority).
+SCORE_STEP = 0.000001
+# The most delayed tasks moved onto the queue per pop.
+PROMOTE_BATCH = 1000
+# Each step of priority takes this much (in seconds) off a ready task's
+# score, so it sorts ahead of every lower priority task.
+PRIORITY_SPAN = 10**10
+
+# Every key a script is handed up front is declared in ``KEYS``. Some are
+# only found as the script runs, though (the data of the tasks it pops & the
+# tasks waiting on one that completed), so these scripts need a standalone
+# Redis server (or a single shard), not Redis Cluster.
+
+# Moves up to ``limit`` delayed tasks that have come due (by ``now``) from
+# the ``delayed`` sorted set onto the ``queue``, scored by when they came due
+# (less ``span`` per step of priority, from the ``priorities`` hash). Only
+# the due tasks are touched, however many are delayed.
+PROMOTE_FUNCTION = """
+local function promote(queue, delayed, priorities, now, limit, span)
+    local due = redis.call(
+        "ZRANGEBYSCORE", delayed, "-inf", now, "WITHSCORES", "LIMIT", 0, limit
+    )
+    local promoted = 0
+
+    for i = 1, #due, 2 do
+        local priority = tonumber(redis.call("HGET", priorities, due[i])) or 0
+        local score = tonumber(due[i + 1]) - priority * tonumber(span)
+        redis.call("ZADD", queue, "NX", score, due[i])
+        promoted = promoted + 1
+    end
+
+    if promoted > 0 then
+        redis.call("ZREMRANGEBYRANK", delayed, 0, promoted - 1)
+    end
+end
+
+-- Ready tasks have a score of no more than ``now``, or the last score handed
+-- out to an unprioritized task (from the ``scores`` hash), which a burst of
+-- pushes can run a little ahead of the clock.
+local function ready_by(scores, now)
+    local last = tonumber(redis.call("HGET", scores, "0")) or 0
+    return math.max(tonumber(now), last)
+end
+"""
+
+# Atomically pushes tasks (``KEYS[6]`` onward, each with a pair of ``ARGV``,
+# its data & ``delay_until``, from ``ARGV[6]`` onward). Ready tasks go on
+# the queue (``KEYS[1]``), scored from ``ARGV[1]`` (now) less ``ARGV[3]``
+# per step of priority (``ARGV[2]``), ``ARGV[4]`` apart. Scores carry on
+# from the last one handed out for the priority (kept in ``KEYS[5]``), so
+# they only ever increase & batches pushed close together don't interleave.
+# Tasks still to come go in the delayed tasks (``KEYS[2]``). A non-zero
+# priority is kept in ``KEYS[3]`` & blocked workers are notified
+# (``KEYS[4]``, keeping up to ``ARGV[5]`` wake-ups).
+PUSH_SCRIPT = """
+local now = tonumber(ARGV[1])
+local offset = tonumber(ARGV[2]) * tonumber(ARGV[3])
+local step = tonumber(ARGV[4])
+local score = now - offset
+local last = tonumber(redis.call("HGET", KEYS[5], ARGV[2]))
+
+if last and last >= score then
+    score = last + step
+end
+
+last = nil
+
+for i = 6, #KEYS do
+    local task_id = KEYS[i]
+    local delay_until = ARGV[2 * i - 5]
+
+    if delay_until == "" then
+        redis.call("ZADD", KEYS[1], "NX", score, task_id)
+        last = score
+        score = score + step
+    elseif tonumber(delay_until) > now then
+        redis.call("ZADD", KEYS[2], "NX", delay_until, task_id)
+    else
+        local due = tonumber(delay_until) - offset
+        redis.call("ZADD", KEYS[1], "NX", due, task_id)
+    end
+
+    redis.call("SET", task_id, ARGV[2 * i - 6])
+
+    if tonumber(ARGV[2]) ~= 0 then
+        redis.call("HSET", KEYS[3], task_id, ARGV[2])
+    else
+        redis.call("HDEL", KEYS[3], task_id)
+    end
+end
+
+if last then
+    redis.call("HSET", KEYS[5], ARGV[2], last)
+end
+
+for i = 1, math.min(#KEYS - 5, tonumber(ARGV[5])) do
+    redis.call("RPUSH", KEYS[4], 1)
+end
+
+redis.call("LTRIM", KEYS[4], -tonumber(ARGV[5]), -1)
+return #KEYS - 5
+"""
+
+# Atomically promotes due delayed tasks (``KEYS[2]``, up to ``ARGV[3]``),
+# then pops up to ``ARGV[2]`` ready tasks (by ``ARGV[1]``, see ``ready_by``
+# & ``KEYS[4]``), deleting & returning their data (& forgetting
+# their priority in ``KEYS[3]``). The data is kept under each task's ID,
+# which is only known once popped.
+POP_SCRIPT = PROMOTE_FUNCTION + """
+promote(KEYS[1], KEYS[2], KEYS[3], ARGV[1], ARGV[3], ARGV[4])
+
+local task_ids = redis.call(
+    "ZRANGEBYSCORE", KEYS[1], "-inf", ready_by(KEYS[4], ARGV[1]),
+    "LIMIT", 0, ARGV[2]
+)
+local popped = {}
+
+for _, task_id in ipairs(task_ids) do
+    redis.call("ZREM", KEYS[1], task_id)
+    local data = redis.call("GET", task_id)
+
+    if data then
+        redis.call("DEL", task_id)
+        redis.call("HDEL", KEYS[3], task_id)
+        table.insert(popped, data)
+    end
+end
+
+return popped
+"""
+
+# Atomically promotes due delayed tasks (``KEYS[3]``, up to ``ARGV[4]``),
+# then moves up to ``ARGV[2]`` ready tasks (by ``ARGV[1]``, see ``ready_by``
+# & ``KEYS[5]``) into the leases sorted set (``KEYS[2]``), scored by when
+# their lease runs out (``ARGV[3]``).
+# Returns a flat list of task IDs & their data.
+RESERVE_SCRIPT = PROMOTE_FUNCTION + """
+promote(KEYS[1], KEYS[3], KEYS[4], ARGV[1], ARGV[4], ARGV[5])
+
+local task_ids = redis.call(
+    "ZRANGEBYSCORE", KEYS[1], "-inf", ready_by(KEYS[5], ARGV[1]),
+    "LIMIT", 0, ARGV[2]
+)
+local reserved = {}
+
+for _, task_id in ipairs(task_ids) do
+    redis.call("ZREM", KEYS[1], task_id)
+    local data = redis.call("GET", task_id)
+
+    if data then
+        redis.call("ZADD", KEYS[2], ARGV[3], task_id)
+        table.insert(reserved, task_id)
+        table.insert(reserved, data)
+    end
+end
+
+return reserved
+"""
+
+# Atomically removes a reserved task's lease (from ``KEYS[1]``). Unless it
+# was pushed again under the same ID (onto the queue, ``KEYS[2]``, or its
+# delayed tasks, ``KEYS[3]``), its data (``KEYS[5]``) & priority (in
+# ``KEYS[4]``) are deleted too.
+ACK_SCRIPT = """
+redis.call("ZREM", KEYS[1], KEYS[5])
+
+if redis.call("ZSCORE", KEYS[2], KEYS[5]) then
+    return 0
+end
+
+if redis.call("ZSCORE", KEYS[3], KEYS[5]) then
+    return 0
+end
+
+redis.call("DEL", KEYS[5])
+redis.call("HDEL", KEYS[4], KEYS[5])
+return 1
+"""
+
+# Atomically moves reserved tasks from the leases sorted set (``KEYS[1]``)
+# back onto the queue (``KEYS[2]``), notifying any blocked workers
+# (``KEYS[3]``). Moves just ``ARGV[4]`` if provided, otherwise every task
+# whose lease ran out by ``ARGV[1]``. Scores are lowered by ``ARGV[3]`` per
+# step of priority (from ``KEYS[4]``).
+REQUEUE_SCRIPT = """
+local task_ids
+
+if ARGV[4] then
+    task_ids = {ARGV[4]}
+else
+    task_ids = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1])
+end
+
+local requeued = 0
+
+for _, task_id in ipairs(task_ids) do
+    if redis.call("ZREM", KEYS[1], task_id) == 1 then
+        local priority = tonumber(redis.call("HGET", KEYS[4], task_id)) or 0
+        local score = tonumber(ARGV[1]) - priority * tonumber(ARGV[3])
+        redis.call("ZADD", KEYS[2], score, task_id)
+        redis.call("RPUSH", KEYS[3], 1)
+        requeued = requeued + 1
+    end
+end
+
+if requeued > 0 then
+    redis.call("LTRIM", KEYS[3], -tonumber(ARGV[2]), -1)
+end
+
+return requeued
+"""
+
+
+# Atomically parks a task (``ARGV[1]``, with its data in ``KEYS[6]``) until
+# the tasks it depends on complete. Each dependency is a pair of keys (its
+# data & ``:dependents`` keys), from ``KEYS[8]`` onward. Dependencies whose
+# data is gone (no longer queued, reserved or parked) count as complete. A non-zero priority (``ARGV[6]``) is kept
+# in ``KEYS[5]``. If none are left, the task goes straight onto the queue
+# (``KEYS[1]``), scored by ``ARGV[3]`` (or ``ARGV[4]``, now, if empty) less
+# ``ARGV[7]`` per step of priority, or the delayed tasks (``KEYS[4]``) if
+# that's still to come. Otherwise, it's recorded as a dependent of each &
+# how many it's waiting on is kept in ``KEYS[7]``. Returns that count.
+PARK_SCRIPT = """
+local task_id = ARGV[1]
+local score = ARGV[3]
+local remaining = 0
+
+if score == "" then
+    score = ARGV[4]
+end
+
+redis.call("SET", KEYS[6], ARGV[2])
+
+if tonumber(ARGV[6]) ~= 0 then
+    redis.call("HSET", KEYS[5], task_id, ARGV[6])
+end
+
+for i = 8, #KEYS, 2 do
+    if redis.call("EXISTS", KEYS[i]) == 1 then
+        redis.call("SADD", KEYS[i + 1], task_id)
+        remaining = remaining + 1
+    end
+end
+
+if remaining == 0 then
+    if tonumber(score) > tonumber(ARGV[4]) then
+        redis.call("ZADD", KEYS[4], "NX", score, task_id)
+    else
+        score = tonumber(score) - tonumber(ARGV[6]) * tonumber(ARGV[7])
+        redis.call("ZADD", KEYS[1], "NX", score, task_id)
+    end
+
+    redis.call("RPUSH", KEYS[2], 1)
+    redis.call("LTRIM", KEYS[2], -tonumber(ARGV[5]), -1)
+    return 0
+end
+
+redis.call(
+    "HSET", KEYS[7],
+    "remaining", remaining, "queue", KEYS[1], "delay_until", ARGV[3]
+)
+redis.call("SADD", KEYS[3], task_id)
+return remaining
+"""
+
+# Atomically decrements the count of each task waiting on a completed task
+# (from ``KEYS[1]``), moving any with nothing left to wait on onto their
+# queue (or its delayed tasks), less ``ARGV[3]`` per step of priority.
+# Writes nothing if no tasks are waiting. The waiting
+# tasks (& their queues) are only known once read. Returns the number of
+# tasks released.
+COMPLETE_SCRIPT = """
+local dependents = redis.call("SMEMBERS", KEYS[1])
+local released = 0
+
+if #dependents == 0 then
+    return 0
+end
+
+redis.call("DEL", KEYS[1])
+
+for _, task_id in ipairs(dependents) do
+    local waiting_key = task_id .. ":waiting"
+
+    if redis.call("EXISTS", waiting_key) == 1 then
+        if redis.call("HINCRBY", waiting_key, "remaining", -1) <= 0 then
+            local queue = redis.call("HGET", waiting_key, "queue")
+            local score = redis.call("HGET", waiting_key, "delay_until")
+
+            if score == "" then
+                score = ARGV[1]
+            end
+
+            redis.call("DEL", waiting_key)
+            redis.call("SREM", queue .. ":pending", task_id)
+
+            if tonumber(score) > tonumber(ARGV[1]) then
+                redis.call("ZADD", queue .. ":delayed", "NX", score, task_id)
+            else
+                local priority = tonumber(
+                    redis.call("HGET", queue .. ":priorities", task_id)
+                ) or 0
+                score = tonumber(score) - priority * tonumber(ARGV[3])
+                redis.call("ZADD", queue, "NX", score, task_id)
+            end
+
+            redis.call("RPUSH", queue .. ":notify", 1)
+            redis.call("LTRIM", queue .. ":notify", -tonumber(ARGV[2]), -1)
+            released = released + 1
+        end
+    end
+end
+
+return released
+"""
+
+
+# Takes (or renews) the lock ``KEYS[1]`` for ``ARGV[1]``, for ``ARGV[2]``
+# milliseconds, unless someone else holds it. Returns 1 if taken.
+LOCK_SCRIPT = """
+local owner = redis.call("GET", KEYS[1])
+
+if owner == ARGV[1] then
+    redis.call("PEXPIRE", KEYS[1], ARGV[2])
+    return 1
+end
+
+if redis.call("SET", KEYS[1], ARGV[1], "NX", "PX", ARGV[2]) then
+    return 1
+end
+
+return 0
+"""
+
+# Deletes the lock ``KEYS[1]``, if ``ARGV[1]`` holds it.
+UNLOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+
+return 0
+"""
 
 
 class Client(object):
@@ -21,15 +369,77 @@ class Client(object):
             port=bits.port,
             db=bits.path.lstrip("/").split("/")[0],
         )
+        # Sent via ``EVALSHA``, only loading the script when Redis doesn't
+        # already have it cached.
+        self._push_script = self.conn.register_script(PUSH_SCRIPT)
+        self._pop_script = self.conn.register_script(POP_SCRIPT)
+        self._reserve_script = self.conn.register_script(RESERVE_SCRIPT)
+        self._ack_script = self.conn.register_script(ACK_SCRIPT)
+        self._requeue_script = self.conn.register_script(REQUEUE_SCRIPT)
+        self._park_script = self.conn.register_script(PARK_SCRIPT)
+        self._complete_script = self.conn.register_script(COMPLETE_SCRIPT)
+        self._lock_script = self.conn.register_script(LOCK_SCRIPT)
+        self._unlock_script = self.conn.register_script(UNLOCK_SCRIPT)
 
     def get_connection(self, host, port, db):
         """
         Returns a ``StrictRedis`` connection instance.
+
+        Task data may be binary (see ``alligator.serializers``), so
+        responses are left as bytes.
         """
         return redis.StrictRedis(
-            host=host, port=port, db=db, decode_responses=True
+            host=host, port=port, db=db, decode_responses=False
         )
 
+    def _notify_key(self, queue_name):
+        return "{}:notify".format(queue_name)
+
+    def _leases_key(self, queue_name):
+        return "{}:leases".format(queue_name)
+
+    def _pending_key(self, queue_name):
+        return "{}:pending".format(queue_name)
+
+    def _delayed_key(self, queue_name):
+        return "{}:delayed".format(queue_name)
+
+    def _priorities_key(self, queue_name):
+        return "{}:priorities".format(queue_name)
+
+    def _scores_key(self, queue_name):
+        return "{}:scores".format(queue_name)
+
+    def _park_keys(self, queue_name, task_id, depends_on):
+        keys = [
+            queue_name,
+            self._notify_key(queue_name),
+            self._pending_key(queue_name),
+            self._delayed_key(queue_name),
+            self._priorities_key(queue_name),
+            task_id,
+            "{}:waiting".format(task_id),
+        ]
+
+        for dependency in sorted(set(depends_on)):
+            keys.extend([dependency, "{}:dependents".format(dependency)])
+
+        return keys
+
+    def _complete_keys(self, task_id):
+        return ["{}:dependents".format(task_id)]
+
+    def _park_args(self, task_id, data, delay_until, priority):
+        return [
+            task_id,
+            data,
+            "" if delay_until is None else delay_until,
+            time.time(),
+            MAX_NOTIFICATIONS,
+            priority,
+            PRIORITY_SPAN,
+        ]
+
     def len(self, queue_name):
         """
         Returns the length of the queue.
@@ -41,7 +451,10 @@ class Client(object):
         Returns:
             int: The length of the queue
         """
-        return self.conn.zcard(queue_name)
+        pipe = self.conn.pipeline(transaction=False)
+        pipe.zcard(queue_name)
+        pipe.zcard(self._delayed_key(queue_name))
+        return sum(pipe.execute())
 
     def drop_all(self, queue_name):
         """
@@ -51,14 +464,30 @@ class Client(object):
             queue_name (str): The name of the queue. Usually handled by the
                 ``Gator`` instance.
         """
+        leases_key = self._leases_key(queue_name)
+        pending_key = self._pending_key(queue_name)
+        delayed_key = self._delayed_key(queue_name)
         task_ids = self.conn.zrange(queue_name, 0, -1)
+        task_ids += self.conn.zrange(leases_key, 0, -1)
+        task_ids += self.conn.zrange(delayed_key, 0, -1)
 
         for task_id in task_ids:
             self.conn.delete(task_id)
 
-        self.conn.delete(queue_name)
+        for task_id in self.conn.smembers(pending_key):
+            self.conn.delete(task_id, task_id + b":waiting")
+
+        self.conn.delete(
+            queue_name,
+            self._notify_key(queue_name),
+            leases_key,
+            pending_key,
+            delayed_key,
+            self._priorities_key(queue_name),
+            self._scores_key(queue_name),
+        )
 
-    def push(self, queue_name, task_id, data, delay_until=None):
+    def push(self, queue_name, task_id, data, delay_until=None, priority=0):
         """
         Pushes a task onto the queue.
 
@@ -66,19 +495,74 @@ class Client(object):
             queue_name (str): The name of the queue. Usually handled by the
                 ``Gator`` instance.
             task_id (str): The identifier of the task.
-            data (str): The relevant data for the task.
+            data (str|bytes): The relevant data for the task.
             delay_until (float): Optional. The Unix timestamp to delay
                 processing of the task until. Default is `None`.
+            priority (int): Optional. Higher priorities are popped first.
+                Default is `0`.
 
         Returns:
             str: The task ID.
         """
-        if delay_until is None:
-            delay_until = math.ceil(time.time())
+        return self.push_many(
+            queue_name, [(task_id, data, delay_until)], priority=priority
+        )[0]
 
-        self.conn.zadd(queue_name, {task_id: delay_until}, nx=True)
-        self.conn.set(task_id, data)
-        return task_id
+    def push_many(self, queue_name, items, priority=0):
+        """
+        Pushes many tasks onto the queue at once.
+
+        Everything is sent in a single round trip (a Lua script). Tasks
+        delayed into the future are kept in a separate ``<queue_name>:delayed``
+        sorted set, so they don't slow down pops (see `Client.pop_many`).
+
+        Ready tasks are scored by when they were pushed (or came due), less
+        ``PRIORITY_SPAN`` per step of priority, so higher priorities pop
+        first. Each score is also at least ``SCORE_STEP`` past the last one
+        handed out for the priority (kept in ``<queue_name>:scores``), so
+        each priority stays first-in, first-out, however big or close
+        together the batches are. Non-zero
+        priorities are also kept in a ``<queue_name>:priorities`` hash,
+        for when tasks are delayed, reserved or parked.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            items (list): A list of ``(task_id, data, delay_until)`` tuples.
+            priority (int): Optional. The priority of every task. Higher
+                priorities are popped first. Default is `0`.
+
+        Returns:
+            list: The task IDs.
+        """
+        if items:
+            self._push_script(
+                keys=self._push_keys(queue_name, items),
+                args=self._push_args(items, priority),
+            )
+
+        return [task_id for task_id, _, _ in items]
+
+    def _push_keys(self, queue_name, items):
+        return [
+            queue_name,
+            self._delayed_key(queue_name),
+            self._priorities_key(queue_name),
+            self._notify_key(queue_name),
+            self._scores_key(queue_name),
+        ] + [task_id for task_id, _, _ in items]
+
+    def _push_args(self, items, priority):
+        now = time.time()
+        base = now - priority * PRIORITY_SPAN
+        # Big (prioritized) scores lose precision, so nudge them further.
+        step = max(SCORE_STEP, abs(base) * sys.float_info.epsilon * 2)
+        args = [now, priority, PRIORITY_SPAN, step, MAX_NOTIFICATIONS]
+
+        for _, data, delay_until in items:
+            args += [data, "" if delay_until is None else delay_until]
+
+        return args
 
     def pop(self, queue_name):
         """
@@ -89,21 +573,299 @@ class Client(object):
                 ``Gator`` instance.
 
         Returns:
-            str: The data for the task.
+            bytes: The data for the task.
+        """
+        popped = self.pop_many(queue_name, 1)
+
+        if popped:
+            return popped[0]
+
+    def pop_many(self, queue_name, count):
         """
-        now = math.floor(time.time())
-        available_to_pop = self.conn.zrangebyscore(
-            queue_name, 0, now, start=0, num=1
+        Pops up to ``count`` tasks off the queue.
+
+        This happens atomically (via a Lua script) in a single round trip,
+        so only tasks whose delay has passed are ever popped, even with
+        many workers consuming the same queue. Delayed tasks that have come
+        due are first moved onto the queue, up to ``PROMOTE_BATCH`` at a
+        time, so a pop costs the same however many tasks are delayed.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            count (int): The maximum number of tasks to pop.
+
+        Returns:
+            list: The data for the tasks.
+        """
+        now = time.time()
+        return self._pop_script(
+            keys=[
+                queue_name,
+                self._delayed_key(queue_name),
+                self._priorities_key(queue_name),
+                self._scores_key(queue_name),
+            ],
+            args=[now, count, PROMOTE_BATCH, PRIORITY_SPAN],
         )
 
-        if not len(available_to_pop):
-            return None
+    def _next_due(self, queue_name):
+        # Ready scores have the priority taken off, so it's added back to
+        # find when the task is actually due.
+        due = []
+        upcoming = self.conn.zrange(queue_name, 0, 0, withscores=True)
 
-        popped = self.conn.zpopmin(queue_name)
-        task_id, delay_until = popped[0][0], popped[0][1]
-        data = self.conn.get(task_id)
-        self.conn.delete(task_id)
-        return data
+        if upcoming:
+            task_id, score = upcoming[0]
+            priority = self.conn.hget(
+                self._priorities_key(queue_name), task_id
+            )
+            due.append(score + int(priority or 0) * PRIORITY_SPAN)
+
+        upcoming = self.conn.zrange(
+            self._delayed_key(queue_name), 0, 0, withscores=True
+        )
+
+        if upcoming:
+            due.append(upcoming[0][1])
+
+        return min(due) if due else None
+
+    def pop_blocking(self, queue_name, timeout, count=1):
+        """
+        Pops up to ``count`` tasks off the queue, waiting up to ``timeout``
+        seconds for one to become available.
+
+        Rather than polling, this blocks on a notification list that
+        ``push`` & ``push_many`` write to, so new tasks are picked up
+        almost immediately. If a delayed task comes due first, it wakes up
+        in time for that as well.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            timeout (float): The maximum number of seconds to wait.
+            count (int): Optional. The maximum number of tasks to pop.
+                Default is `1`.
+
+        Returns:
+            list: The data for the tasks. Empty if none arrived in time.
+        """
+        deadline = time.time() + timeout
+        notify_key = self._notify_key(queue_name)
+
+        while True:
+            popped = self.pop_many(queue_name, count)
+
+            if popped:
+                return popped
+
+            now = time.time()
+            wait_for = deadline - now
+
+            if wait_for <= 0:
+                return []
+
+            due_at = self._next_due(queue_name)
+
+            if due_at is not None:
+                wait_for = min(wait_for, due_at - now)
+
+            # A timeout of `0` would block forever.
+            self.conn.blpop([notify_key], timeout=max(wait_for, 0.01))
+
+    def reserve(self, queue_name, count, lease_time):
+        """
+        Takes up to ``count`` tasks off the queue, holding onto them until
+        they're acknowledged (see `Client.ack`).
+
+        Reserved tasks are kept in a ``<queue_name>:leases`` sorted set,
+        scored by when their lease runs out. Any not acknowledged within
+        ``lease_time`` seconds are placed back on the queue by
+        `Client.reap`.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            count (int): The maximum number of tasks to reserve.
+            lease_time (float): How long (in seconds) to hold each task.
+
+        Returns:
+            list: ``(receipt, data)`` tuples, one per task.
+        """
+        now = time.time()
+        reserved = self._reserve_script(
+            keys=[
+                queue_name,
+                self._leases_key(queue_name),
+                self._delayed_key(queue_name),
+                self._priorities_key(queue_name),
+                self._scores_key(queue_name),
+            ],
+            args=[
+                now,
+                count,
+                now + lease_time,
+                PROMOTE_BATCH,
+                PRIORITY_SPAN,
+            ],
+        )
+        return list(zip(reserved[::2], reserved[1::2]))
+
+    def ack(self, queue_name, receipt):
+        """
+        Acknowledges a reserved task is done with, removing it for good.
+
+        If the task was pushed again under the same ID (for instance, to be
+        retried), only the lease is removed.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            receipt (bytes): The receipt from `Client.reserve`.
+        """
+        self._ack_script(keys=self._ack_keys(queue_name, receipt))
+
+    def _ack_keys(self, queue_name, receipt):
+        return [
+            self._leases_key(queue_name),
+            queue_name,
+            self._delayed_key(queue_name),
+            self._priorities_key(queue_name),
+            receipt,
+        ]
+
+    def nack(self, queue_name, receipt):
+        """
+        Places a reserved task straight back on the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            receipt (bytes): The receipt from `Client.reserve`.
+        """
+        self._requeue(queue_name, receipt)
+
+    def reap(self, queue_name):
+        """
+        Places any reserved tasks whose lease has run out back on the
+        queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+
+        Returns:
+            int: The number of tasks placed back on the queue.
+        """
+        return self._requeue(queue_name)
+
+    def _requeue(self, queue_name, receipt=None):
+        args = [time.time(), MAX_NOTIFICATIONS, PRIORITY_SPAN]
+
+        if receipt is not None:
+            args.append(receipt)
+
+        return self._requeue_script(
+            keys=[
+                self._leases_key(queue_name),
+                queue_name,
+                self._notify_key(queue_name),
+                self._priorities_key(queue_name),
+            ],
+            args=args,
+        )
+
+    def park(
+        self,
+        queue_name,
+        task_id,
+        data,
+        depends_on,
+        delay_until=None,
+        priority=0,
+    ):
+        """
+        Stores a task that can't run until the tasks it depends on have
+        completed (see `Client.mark_complete`).
+
+        The task is kept out of the queue until then. Dependencies that are
+        no longer queued, reserved or parked are taken to have completed
+        (a task popped without a lease counts as complete once popped). If
+        every dependency has completed, it's pushed right away.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            task_id (str): The identifier of the task.
+            data (str|bytes): The relevant data for the task.
+            depends_on (list): The IDs of the tasks it depends on.
+            delay_until (float): Optional. The Unix timestamp to delay
+                processing of the task until. Default is `None`.
+            priority (int): Optional. Higher priorities are popped first.
+                Default is `0`.
+
+        Returns:
+            str: The task ID.
+        """
+        self._park_script(
+            keys=self._park_keys(queue_name, task_id, depends_on),
+            args=self._park_args(task_id, data, delay_until, priority),
+        )
+        return task_id
+
+    def mark_complete(self, queue_name, task_id):
+        """
+        Releases any parked tasks that were only waiting on a completed task
+        onto their queues.
+
+        Nothing is written for tasks without dependents.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            task_id (str): The identifier of the completed task.
+
+        Returns:
+            int: The number of tasks released.
+        """
+        return self._complete_script(
+            keys=self._complete_keys(task_id),
+            args=[time.time(), MAX_NOTIFICATIONS, PRIORITY_SPAN],
+        )
+
+    def acquire_lock(self, name, owner, timeout):
+        """
+        Takes (or renews) a named lock, if no one else holds it.
+
+        Used so only one `Scheduler` enqueues tasks at a time. The lock
+        key expires on its own, so a crashed owner doesn't hold it forever.
+
+        Args:
+            name (str): The name of the lock.
+            owner (str): A unique identifier for whoever's taking it.
+            timeout (float): How long (in seconds) the lock is held for,
+                unless renewed.
+
+        Returns:
+            bool: `True` if ``owner`` now holds the lock
+        """
+        return bool(
+            self._lock_script(
+                keys=["lock:{}".format(name)],
+                args=[owner, int(timeout * 1000)],
+            )
+        )
+
+    def release_lock(self, name, owner):
+        """
+        Gives up a named lock, if ``owner`` holds it.
+
+        Args:
+            name (str): The name of the lock.
+            owner (str): The identifier used to take it.
+        """
+        self._unlock_script(keys=["lock:{}".format(name)], args=[owner])
 
     def get(self, queue_name, task_id):
         """
@@ -115,11 +877,467 @@ class Client(object):
             task_id (str): The identifier of the task.
 
         Returns:
-            str: The data for the task.
+            bytes: The data for the task.
         """
         self.conn.zrem(queue_name, task_id)
+        self.conn.zrem(self._delayed_key(queue_name), task_id)
         data = self.conn.get(task_id)
 
         if data:
-            self.conn.delete(task_id)
+            # It may have been parked, rather than on the queue.
+            self.conn.srem(self._pending_key(queue_name), task_id)
+            self.conn.hdel(self._priorities_key(queue_name), task_id)
+            self.conn.delete(task_id, "{}:waiting".format(task_id))
+            return data
+
+
+class AsyncClient(object):
+    def __init__(self, conn_string):
+        """
+        An ``asyncio`` Redis-based ``Client``, built on ``redis.asyncio``.
+
+        Stores tasks exactly like `Client` does, so the two can be mixed
+        (for instance, an async web app enqueuing tasks for regular
+        workers).
+
+        Args:
+            conn_string (str): The DSN. The host/port/db are parsed out of it.
+                Should be of the format ``redis://host:port/db``
+        """
+        self.conn_string = conn_string
+        bits = urlparse(self.conn_string)
+        self.conn = self.get_connection(
+            host=bits.hostname,
+            port=bits.port,
+            db=bits.path.lstrip("/").split("/")[0],
+        )
+        self._push_script = self.conn.register_script(PUSH_SCRIPT)
+        self._pop_script = self.conn.register_script(POP_SCRIPT)
+        self._reserve_script = self.conn.register_script(RESERVE_SCRIPT)
+        self._ack_script = self.conn.register_script(ACK_SCRIPT)
+        self._requeue_script = self.conn.register_script(REQUEUE_SCRIPT)
+        self._park_script = self.conn.register_script(PARK_SCRIPT)
+        self._complete_script = self.conn.register_script(COMPLETE_SCRIPT)
+
+    def get_connection(self, host, port, db):
+        """
+        Returns an async ``StrictRedis`` connection instance.
+        """
+        return redis.asyncio.StrictRedis(
+            host=host, port=port, db=db, decode_responses=False
+        )
+
+    def _notify_key(self, queue_name):
+        return "{}:notify".format(queue_name)
+
+    def _leases_key(self, queue_name):
+        return "{}:leases".format(queue_name)
+
+    def _pending_key(self, queue_name):
+        return "{}:pending".format(queue_name)
+
+    def _delayed_key(self, queue_name):
+        return "{}:delayed".format(queue_name)
+
+    def _priorities_key(self, queue_name):
+        return "{}:priorities".format(queue_name)
+
+    def _scores_key(self, queue_name):
+        return "{}:scores".format(queue_name)
+
+    def _park_keys(self, queue_name, task_id, depends_on):
+        keys = [
+            queue_name,
+            self._notify_key(queue_name),
+            self._pending_key(queue_name),
+            self._delayed_key(queue_name),
+            self._priorities_key(queue_name),
+            task_id,
+            "{}:waiting".format(task_id),
+        ]
+
+        for dependency in sorted(set(depends_on)):
+            keys.extend([dependency, "{}:dependents".format(dependency)])
+
+        return keys
+
+    def _complete_keys(self, task_id):
+        return ["{}:dependents".format(task_id)]
+
+    def _park_args(self, task_id, data, delay_until, priority):
+        return [
+            task_id,
+            data,
+            "" if delay_until is None else delay_until,
+            time.time(),
+            MAX_NOTIFICATIONS,
+            priority,
+            PRIORITY_SPAN,
+        ]
+
+    async def len(self, queue_name):
+        """
+        Returns the length of the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+
+        Returns:
+            int: The length of the queue
+        """
+        async with self.conn.pipeline(transaction=False) as pipe:
+            pipe.zcard(queue_name)
+            pipe.zcard(self._delayed_key(queue_name))
+            return sum(await pipe.execute())
+
+    async def drop_all(self, queue_name):
+        """
+        Drops all the task in the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+        """
+        leases_key = self._leases_key(queue_name)
+        pending_key = self._pending_key(queue_name)
+        delayed_key = self._delayed_key(queue_name)
+        task_ids = await self.conn.zrange(queue_name, 0, -1)
+        task_ids += await self.conn.zrange(leases_key, 0, -1)
+        task_ids += await self.conn.zrange(delayed_key, 0, -1)
+
+        for task_id in await self.conn.smembers(pending_key):
+            task_ids += [task_id, task_id + b":waiting"]
+
+        if task_ids:
+            await self.conn.delete(*task_ids)
+
+        await self.conn.delete(
+            queue_name,
+            self._notify_key(queue_name),
+            leases_key,
+            pending_key,
+            delayed_key,
+            self._priorities_key(queue_name),
+            self._scores_key(queue_name),
+        )
+
+    async def push(
+        self, queue_name, task_id, data, delay_until=None, priority=0
+    ):
+        """
+        Pushes a task onto the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            task_id (str): The identifier of the task.
+            data (str|bytes): The relevant data for the task.
+            delay_until (float): Optional. The Unix timestamp to delay
+                processing of the task until. Default is `None`.
+            priority (int): Optional. Higher priorities are popped first.
+                Default is `0`.
+
+        Returns:
+            str: The task ID.
+        """
+        task_ids = await self.push_many(
+            queue_name, [(task_id, data, delay_until)], priority=priority
+        )
+        return task_ids[0]
+
+    async def push_many(self, queue_name, items, priority=0):
+        """
+        Pushes many tasks onto the queue at once, in a single round trip.
+
+        See `Client.push_many`.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            items (list): A list of ``(task_id, data, delay_until)`` tuples.
+            priority (int): Optional. The priority of every task. Higher
+                priorities are popped first. Default is `0`.
+
+        Returns:
+            list: The task IDs.
+        """
+        if items:
+            await self._push_script(
+                keys=self._push_keys(queue_name, items),
+                args=self._push_args(items, priority),
+            )
+
+        return [task_id for task_id, _, _ in items]
+
+    # Building the script's keys & arguments doesn't wait on anything, so
+    # these are shared with `Client`.
+    _push_keys = Client._push_keys
+    _push_args = Client._push_args
+
+    async def pop(self, queue_name):
+        """
+        Pops a task off the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+
+        Returns:
+            bytes: The data for the task.
+        """
+        popped = await self.pop_many(queue_name, 1)
+
+        if popped:
+            return popped[0]
+
+    async def pop_many(self, queue_name, count):
+        """
+        Atomically pops up to ``count`` tasks off the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            count (int): The maximum number of tasks to pop.
+
+        Returns:
+            list: The data for the tasks.
+        """
+        now = time.time()
+        return await self._pop_script(
+            keys=[
+                queue_name,
+                self._delayed_key(queue_name),
+                self._priorities_key(queue_name),
+                self._scores_key(queue_name),
+            ],
+            args=[now, count, PROMOTE_BATCH, PRIORITY_SPAN],
+        )
+
+    async def _next_due(self, queue_name):
+        due = []
+        upcoming = await self.conn.zrange(queue_name, 0, 0, withscores=True)
+
+        if upcoming:
+            task_id, score = upcoming[0]
+            priority = await self.conn.hget(
+                self._priorities_key(queue_name), task_id
+            )
+            due.append(score + int(priority or 0) * PRIORITY_SPAN)
+
+        upcoming = await self.conn.zrange(
+            self._delayed_key(queue_name), 0, 0, withscores=True
+        )
+
+        if upcoming:
+            due.append(upcoming[0][1])
+
+        return min(due) if due else None
+
+    async def pop_blocking(self, queue_name, timeout, count=1):
+        """
+        Pops up to ``count`` tasks off the queue, waiting up to ``timeout``
+        seconds for one to become available.
+
+        See `Client.pop_blocking`. Only the calling coroutine waits, not
+        the event loop.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            timeout (float): The maximum number of seconds to wait.
+            count (int): Optional. The maximum number of tasks to pop.
+                Default is `1`.
+
+        Returns:
+            list: The data for the tasks. Empty if none arrived in time.
+        """
+        deadline = time.time() + timeout
+        notify_key = self._notify_key(queue_name)
+
+        while True:
+            popped = await self.pop_many(queue_name, count)
+
+            if popped:
+                return popped
+
+            now = time.time()
+            wait_for = deadline - now
+
+            if wait_for <= 0:
+                return []
+
+            due_at = await self._next_due(queue_name)
+
+            if due_at is not None:
+                wait_for = min(wait_for, due_at - now)
+
+            # A timeout of `0` would block forever.
+            await self.conn.blpop([notify_key], timeout=max(wait_for, 0.01))
+
+    async def reserve(self, queue_name, count, lease_time):
+        """
+        Takes up to ``count`` tasks off the queue, holding onto them until
+        they're acknowledged.
+
+        See `Client.reserve`.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            count (int): The maximum number of tasks to reserve.
+            lease_time (float): How long (in seconds) to hold each task.
+
+        Returns:
+            list: ``(receipt, data)`` tuples, one per task.
+        """
+        now = time.time()
+        reserved = await self._reserve_script(
+            keys=[
+                queue_name,
+                self._leases_key(queue_name),
+                self._delayed_key(queue_name),
+                self._priorities_key(queue_name),
+                self._scores_key(queue_name),
+            ],
+            args=[
+                now,
+                count,
+                now + lease_time,
+                PROMOTE_BATCH,
+                PRIORITY_SPAN,
+            ],
+        )
+        return list(zip(reserved[::2], reserved[1::2]))
+
+    async def ack(self, queue_name, receipt):
+        """
+        Acknowledges a reserved task is done with, removing it for good.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            receipt (bytes): The receipt from `AsyncClient.reserve`.
+        """
+        await self._ack_script(keys=self._ack_keys(queue_name, receipt))
+
+    _ack_keys = Client._ack_keys
+
+    async def nack(self, queue_name, receipt):
+        """
+        Places a reserved task straight back on the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            receipt (bytes): The receipt from `AsyncClient.reserve`.
+        """
+        await self._requeue(queue_name, receipt)
+
+    async def reap(self, queue_name):
+        """
+        Places any reserved tasks whose lease has run out back on the
+        queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+
+        Returns:
+            int: The number of tasks placed back on the queue.
+        """
+        return await self._requeue(queue_name)
+
+    async def _requeue(self, queue_name, receipt=None):
+        args = [time.time(), MAX_NOTIFICATIONS, PRIORITY_SPAN]
+
+        if receipt is not None:
+            args.append(receipt)
+
+        return await self._requeue_script(
+            keys=[
+                self._leases_key(queue_name),
+                queue_name,
+                self._notify_key(queue_name),
+                self._priorities_key(queue_name),
+            ],
+            args=args,
+        )
+
+    async def park(
+        self,
+        queue_name,
+        task_id,
+        data,
+        depends_on,
+        delay_until=None,
+        priority=0,
+    ):
+        """
+        Stores a task that can't run until the tasks it depends on have
+        completed.
+
+        See `Client.park`.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            task_id (str): The identifier of the task.
+            data (str|bytes): The relevant data for the task.
+            depends_on (list): The IDs of the tasks it depends on.
+            delay_until (float): Optional. The Unix timestamp to delay
+                processing of the task until. Default is `None`.
+            priority (int): Optional. Higher priorities are popped first.
+                Default is `0`.
+
+        Returns:
+            str: The task ID.
+        """
+        await self._park_script(
+            keys=self._park_keys(queue_name, task_id, depends_on),
+            args=self._park_args(task_id, data, delay_until, priority),
+        )
+        return task_id
+
+    async def mark_complete(self, queue_name, task_id):
+        """
+        Releases any parked tasks that were only waiting on a completed task
+        onto their queues.
+
+        See `Client.mark_complete`.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            task_id (str): The identifier of the completed task.
+
+        Returns:
+            int: The number of tasks released.
+        """
+        return await self._complete_script(
+            keys=self._complete_keys(task_id),
+            args=[time.time(), MAX_NOTIFICATIONS, PRIORITY_SPAN],
+        )
+
+    async def get(self, queue_name, task_id):
+        """
+        Pops a specific task off the queue by identifier.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``AsyncGator`` instance.
+            task_id (str): The identifier of the task.
+
+        Returns:
+            bytes: The data for the task.
+        """
+        await self.conn.zrem(queue_name, task_id)
+        await self.conn.zrem(self._delayed_key(queue_name), task_id)
+        data = await self.conn.get(task_id)
+
+        if data:
+            # It may have been parked, rather than on the queue.
+            await self.conn.srem(self._pending_key(queue_name), task_id)
+            await self.conn.hdel(self._priorities_key(queue_name), task_id)
+            await self.conn.delete(task_id, "{}:waiting".format(task_id))
             return data
@@ -1,5 +1,41 @@
+import atexit
+import contextlib
 import sqlite3
+import threading
 import time
+import weakref
+from urllib.parse import parse_qs
+
+from alligator.backends.aio import ExecutorAsyncClient
+
+
+# ``DELETE ... RETURNING`` arrived in SQLite 3.35.
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# The ``synchronous`` setting for each durability level.
+DURABILITY_LEVELS = {
+    # Syncs to disk on every commit.
+    "full": "FULL",
+    # Syncs at WAL checkpoints. Survives crashes, but not power loss.
+    "normal": "NORMAL",
+    # Buffers pushes in memory, committing them in groups.
+    "batch": "NORMAL",
+}
+# In ``batch`` mode, the most pushes buffered before they're committed.
+BATCH_SIZE = 500
+# In ``batch`` mode, the longest (in milliseconds) a push stays buffered.
+BATCH_INTERVAL = 50
+# The tables (across every queue) holding tasks that haven't completed.
+UNFINISHED_TABLES = ("queue_*", "delayed_*", "leases_*", "pending_*")
+# The most delayed tasks moved onto the queue per pop.
+PROMOTE_BATCH = 1000
+
+
+def _flush_at_exit(client_ref):
+    client = client_ref()
+
+    if client is not None:
+        client.flush()
 
 
 class Client(object):
@@ -7,6 +43,29 @@ class Client(object):
         """
         A SQLite-based ``Client``.
 
+        Each thread gets its own connection to the database file, so a
+        single instance can be safely shared between threads. The database
+        uses write-ahead logging (WAL), so readers & writers (including
+        workers in other processes) don't block each other.
+
+        Tables are created the first time a queue is used.
+
+        The durability level can be chosen with a ``durability`` query
+        parameter:
+
+        * ``full``: Every push is synced to disk before returning.
+        * ``normal``: (Default) Pushes survive a crash, but the latest ones
+          may be lost on power loss.
+        * ``batch``: Pushes are buffered in memory & committed together
+          (every ``batch_size`` pushes or ``batch_interval`` milliseconds,
+          whichever comes first). Much faster, but buffered pushes are lost
+          if the process dies. Call `Client.flush` to commit them early;
+          they're also committed when the process exits.
+
+        Ex::
+
+            sqlite:///var/data/queue.db?durability=batch&batch_size=1000
+
         Args:
             conn_string (str): The DSN. The host/port/db are parsed out of it.
                 Should be of the format ``sqlite:///path/to/db/file.db``
@@ -14,8 +73,57 @@ class Client(object):
         # This is actually the filepath to the DB file.
         self.conn_string = conn_string
         # Kill the 'sqlite://' portion.
-        path = self.conn_string.split("://", 1)[1]
-        self.conn = sqlite3.connect(path)
+        path, _, query = self.conn_string.split("://", 1)[1].partition("?")
+        self.path = path
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        self.durability = params.get("durability", "normal")
+
+        if self.durability not in DURABILITY_LEVELS:
+            raise ValueError(
+                "Unknown durability '{}'.".format(self.durability)
+            )
+
+        self.batch_size = int(params.get("batch_size", BATCH_SIZE))
+        self.batch_interval = (
+            int(params.get("batch_interval", BATCH_INTERVAL)) / 1000
+        )
+        self._local = threading.local()
+        self._tables = set()
+        self._buffer = []
+        self._buffer_lock = threading.RLock()
+        self._timer = None
+        self._flush_conn = None
+
+        if self.durability == "batch":
+            atexit.register(_flush_at_exit, weakref.ref(self))
+
+    @property
+    def conn(self):
+        """
+        Returns the ``sqlite3`` connection for the current thread.
+        """
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = self.get_connection(self.path)
+            self._local.conn = conn
+
+        return conn
+
+    def get_connection(self, path):
+        """
+        Returns a new ``sqlite3`` connection instance.
+
+        Switches the database to WAL mode &, unless the durability level is
+        ``full``, relaxes ``synchronous`` to ``NORMAL`` (no ``fsync`` per
+        commit), since WAL can't be corrupted by a crash.
+        """
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "PRAGMA synchronous={}".format(DURABILITY_LEVELS[self.durability])
+        )
+        return conn
 
     def _run_query(self, query, args):
         cur = self.conn.cursor()
@@ -28,21 +136,172 @@ class Client(object):
         self.conn.commit()
         return cur
 
+    def _fetch_all(self, query, args):
+        # Rows from ``RETURNING`` must be read before the commit.
+        cur = self.conn.cursor()
+        cur.execute(query, args)
+        rows = cur.fetchall()
+        self.conn.commit()
+        return rows
+
+    def _run_many(self, query, rows):
+        cur = self.conn.cursor()
+        cur.executemany(query, rows)
+        self.conn.commit()
+        return cur
+
+    @contextlib.contextmanager
+    def _immediate(self):
+        # Takes the write lock up front, so no other connection can claim
+        # the same rows in between reading & writing them.
+        conn = self.conn
+
+        if conn.in_transaction:
+            conn.commit()
+
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+
+        try:
+            yield cur
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _claim(self, select_query, delete_query, args):
+        # For SQLite < 3.35.
+        with self._immediate() as cur:
+            cur.execute(select_query, args)
+            rows = cur.fetchall()
+
+            if rows:
+                cur.executemany(delete_query, [[row[0]] for row in rows])
+
+        return rows
+
+    def _table(self, queue_name):
+        # Returns the table name, creating the table on first use.
+        if queue_name not in self._tables:
+            self.setup_tables(queue_name)
+            self._tables.add(queue_name)
+
+        return "queue_{}".format(queue_name)
+
     def setup_tables(self, queue_name="all"):
         """
-        Allows for manual creation of the needed tables.
+        Creates the table (& index) for a queue, if needed.
+
+        Called automatically the first time a queue is used.
 
         Args:
             queue_name (str): Optional. The name of the queue. Default is
                 `all`.
         """
-        # For manually creating the tables...
         query = (
-            "CREATE TABLE `queue_{}` "
-            "(task_id text, data text, delay_until integer)"
+            "CREATE TABLE IF NOT EXISTS `queue_{}` ("
+            "id INTEGER PRIMARY KEY, "
+            "task_id TEXT NOT NULL UNIQUE, "
+            "data BLOB, "
+            "delay_until REAL NOT NULL, "
+            "priority INTEGER NOT NULL DEFAULT 0"
+            ")"
+        ).format(queue_name)
+        self._run_query(query, None)
+        self._add_priority("queue_{}".format(queue_name))
+
+        query = (
+            "CREATE INDEX IF NOT EXISTS `queue_{0}_priority` "
+            "ON `queue_{0}` (priority DESC, delay_until)"
+        ).format(queue_name)
+        self._run_query(query, None)
+
+        # Tasks delayed into the future (see `Client.push_many`).
+        query = (
+            "CREATE TABLE IF NOT EXISTS `delayed_{}` ("
+            "task_id TEXT PRIMARY KEY, "
+            "data BLOB, "
+            "delay_until REAL NOT NULL, "
+            "priority INTEGER NOT NULL DEFAULT 0"
+            ")"
+        ).format(queue_name)
+        self._run_query(query, None)
+        self._add_priority("delayed_{}".format(queue_name))
+
+        query = (
+            "CREATE INDEX IF NOT EXISTS `delayed_{0}_until` "
+            "ON `delayed_{0}` (delay_until)"
+        ).format(queue_name)
+        self._run_query(query, None)
+
+        # Reserved tasks (see `Client.reserve`).
+        query = (
+            "CREATE TABLE IF NOT EXISTS `leases_{}` ("
+            "task_id TEXT PRIMARY KEY, "
+            "data BLOB, "
+            "lease_until REAL NOT NULL, "
+            "priority INTEGER NOT NULL DEFAULT 0"
+            ")"
+        ).format(queue_name)
+        self._run_query(query, None)
+        self._add_priority("leases_{}".format(queue_name))
+
+        query = (
+            "CREATE INDEX IF NOT EXISTS `leases_{0}_until` "
+            "ON `leases_{0}` (lease_until)"
         ).format(queue_name)
         self._run_query(query, None)
 
+        # Tasks waiting on others to complete (see `Client.park`).
+        query = (
+            "CREATE TABLE IF NOT EXISTS `pending_{}` ("
+            "task_id TEXT PRIMARY KEY, "
+            "data BLOB, "
+            "delay_until REAL, "
+            "remaining INTEGER NOT NULL, "
+            "priority INTEGER NOT NULL DEFAULT 0"
+            ")"
+        ).format(queue_name)
+        self._run_query(query, None)
+        self._add_priority("pending_{}".format(queue_name))
+
+        # Shared by all queues.
+        query = (
+            "CREATE TABLE IF NOT EXISTS `task_dependents` ("
+            "depends_on TEXT NOT NULL, "
+            "queue_name TEXT NOT NULL, "
+            "task_id TEXT NOT NULL"
+            ")"
+        )
+        self._run_query(query, None)
+
+        query = (
+            "CREATE INDEX IF NOT EXISTS `task_dependents_depends_on` "
+            "ON `task_dependents` (depends_on)"
+        )
+        self._run_query(query, None)
+
+        query = (
+            "CREATE TABLE IF NOT EXISTS `locks` ("
+            "name TEXT PRIMARY KEY, "
+            "owner TEXT NOT NULL, "
+            "expires_at REAL NOT NULL"
+            ")"
+        )
+        self._run_query(query, None)
+        self._tables.add(queue_name)
+
+    def _add_priority(self, table):
+        # Tables created by older versions don't have priorities.
+        cur = self._run_query("PRAGMA table_info(`{}`)".format(table), None)
+
+        if "priority" not in [row[1] for row in cur.fetchall()]:
+            self._run_query(
+                "ALTER TABLE `{}` "
+                "ADD COLUMN priority INTEGER NOT NULL DEFAULT 0".format(table),
+                None,
+            )
+
     def len(self, queue_name):
         """
         Returns the length of the queue.
@@ -54,7 +313,11 @@ class Client(object):
         Returns:
             int: The length of the queue
         """
-        query = "SELECT COUNT(task_id) FROM `queue_{}`".format(queue_name)
+        self.flush()
+        query = (
+            "SELECT (SELECT COUNT(*) FROM `{}`) "
+            "+ (SELECT COUNT(*) FROM `delayed_{}`)"
+        ).format(self._table(queue_name), queue_name)
         cur = self._run_query(query, [])
         res = cur.fetchone()
         return res[0]
@@ -67,13 +330,24 @@ class Client(object):
             queue_name (str): The name of the queue. Usually handled by the
                 ``Gator`` instance.
         """
-        query = "DELETE FROM `queue_{}`".format(queue_name)
+        self.flush()
+        query = "DELETE FROM `{}`".format(self._table(queue_name))
         self._run_query(query, [])
+        query = "DELETE FROM `delayed_{}`".format(queue_name)
+        self._run_query(query, [])
+        query = "DELETE FROM `leases_{}`".format(queue_name)
+        self._run_query(query, [])
+        query = "DELETE FROM `pending_{}`".format(queue_name)
+        self._run_query(query, [])
+        query = "DELETE FROM `task_dependents` WHERE queue_name = ?"
+        self._run_query(query, [queue_name])
 
-    def push(self, queue_name, task_id, data, delay_until=None):
+    def push(self, queue_name, task_id, data, delay_until=None, priority=0):
         """
         Pushes a task onto the queue.
 
+        Pushing a task ID that's already queued replaces it.
+
         Args:
             queue_name (str): The name of the queue. Usually handled by the
                 ``Gator`` instance.
@@ -81,20 +355,132 @@ class Client(object):
             data (str): The relevant data for the task.
             delay_until (float): Optional. The Unix timestamp to delay
                 processing of the task until. Default is `None`.
+            priority (int): Optional. Higher priorities are popped first.
+                Default is `0`.
 
         Returns:
             str: The task ID.
         """
-        if delay_until is None:
-            delay_until = time.time()
+        return self.push_many(
+            queue_name, [(task_id, data, delay_until)], priority=priority
+        )[0]
 
-        query = (
-            "INSERT INTO `queue_{}` "
-            "(task_id, data, delay_until) "
-            "VALUES (?, ?, ?)"
-        ).format(queue_name)
-        self._run_query(query, [task_id, data, int(delay_until)])
-        return task_id
+    def push_many(self, queue_name, items, priority=0):
+        """
+        Pushes many tasks onto the queue at once.
+
+        All the rows are inserted within a single transaction. Tasks delayed
+        into the future go in a separate ``delayed_<queue_name>`` table, so
+        they don't slow down pops (see `Client.pop_many`).
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            items (list): A list of ``(task_id, data, delay_until)`` tuples.
+            priority (int): Optional. The priority of every task. Higher
+                priorities are popped first. Default is `0`.
+
+        Returns:
+            list: The task IDs.
+        """
+        now = time.time()
+        rows = []
+
+        for task_id, data, delay_until in items:
+            if delay_until is None:
+                delay_until = now
+
+            rows.append([task_id, data, delay_until, priority])
+
+        if self.durability == "batch":
+            self._buffer_rows(queue_name, rows)
+        else:
+            self._insert_rows(queue_name, rows)
+
+        return [task_id for task_id, _, _ in items]
+
+    def _write_rows(self, cur, queue_name, rows, now=None):
+        # Ready rows go on the queue & future ones in the delayed table.
+        # Each is removed from the other, so a re-pushed task is replaced.
+        now = time.time() if now is None else now
+        tables = (self._table(queue_name), "delayed_{}".format(queue_name))
+        ready = [row for row in rows if row[2] <= now]
+        delayed = [row for row in rows if row[2] > now]
+
+        for table, other, table_rows in (
+            (tables[0], tables[1], ready),
+            (tables[1], tables[0], delayed),
+        ):
+            if not table_rows:
+                continue
+
+            cur.executemany(
+                "DELETE FROM `{}` WHERE task_id = ?".format(other),
+                [[row[0]] for row in table_rows],
+            )
+            cur.executemany(
+                "INSERT OR REPLACE INTO `{}` "
+                "(task_id, data, delay_until, priority) "
+                "VALUES (?, ?, ?, ?)".format(table),
+                table_rows,
+            )
+
+    def _insert_rows(self, queue_name, rows):
+        self._write_rows(self.conn, queue_name, rows)
+        self.conn.commit()
+
+    def _buffer_rows(self, queue_name, rows):
+        with self._buffer_lock:
+            self._buffer.extend((queue_name, row) for row in rows)
+
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.batch_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """
+        Commits any buffered pushes (``batch`` durability only) in a single
+        transaction.
+
+        Reads (``len``, ``pop``, etc.) flush first, so a process always
+        sees its own pushes.
+        """
+        with self._buffer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if not self._buffer:
+                return
+
+            buffered, self._buffer = self._buffer, []
+            by_queue = {}
+
+            for queue_name, row in buffered:
+                by_queue.setdefault(queue_name, []).append(row)
+
+            # Flushes come from whichever thread fills the buffer (or the
+            # timer's), so they share one connection, used under the lock.
+            if self._flush_conn is None:
+                self._flush_conn = sqlite3.connect(
+                    self.path, timeout=30, check_same_thread=False
+                )
+                self._flush_conn.execute("PRAGMA synchronous=NORMAL")
+
+            conn = self._flush_conn
+
+            try:
+                for queue_name, rows in by_queue.items():
+                    self._write_rows(conn, queue_name, rows)
+
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                self._buffer = buffered + self._buffer
+                raise
 
     def pop(self, queue_name):
         """
@@ -107,23 +493,424 @@ class Client(object):
         Returns:
             str: The data for the task.
         """
-        now = int(time.time())
-        query = (
-            "SELECT task_id, data, delay_until "
-            "FROM `queue_{}` "
+        popped = self.pop_many(queue_name, 1)
+
+        if popped:
+            return popped[0]
+
+    def pop_many(self, queue_name, count):
+        """
+        Atomically pops up to ``count`` tasks off the queue, oldest first.
+
+        On SQLite 3.35+, this is a single ``DELETE ... RETURNING``
+        statement. Older versions fall back to a ``SELECT`` & ``DELETE``
+        within a ``BEGIN IMMEDIATE`` transaction. Either way, no two
+        workers can pop the same task. Higher priority tasks come first.
+        Delayed tasks that have come due are
+        first moved onto the queue, ``PROMOTE_BATCH`` at a time, so a pop
+        costs the same however many tasks are delayed.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            count (int): The maximum number of tasks to pop.
+
+        Returns:
+            list: The data for the tasks.
+        """
+        self.flush()
+        now = time.time()
+        table = self._table(queue_name)
+        self._promote(queue_name, now)
+        # Uses ``rowid`` (rather than ``id``), so tables created by older
+        # versions still work.
+        select_query = (
+            "SELECT rowid, data "
+            "FROM `{}` "
+            "WHERE delay_until <= ? "
+            "ORDER BY priority DESC, delay_until, rowid "
+            "LIMIT ?"
+        ).format(table)
+
+        if HAS_RETURNING:
+            query = (
+                "DELETE FROM `{0}` "
+                "WHERE rowid IN ({1}) "
+                "RETURNING rowid, delay_until, data, priority"
+            ).format(table, select_query.replace("rowid, data", "rowid"))
+            rows = self._fetch_all(query, [now, count])
+            # ``RETURNING`` doesn't guarantee any order.
+            rows.sort(key=lambda row: (-row[3], row[1], row[0]))
+            return [row[2] for row in rows]
+
+        delete_query = "DELETE FROM `{}` WHERE rowid = ?".format(table)
+        rows = self._claim(select_query, delete_query, [now, count])
+        return [row[1] for row in rows]
+
+    def _promote(self, queue_name, now):
+        # Moves up to ``PROMOTE_BATCH`` delayed tasks that have come due
+        # onto the queue. They're found via the ``delay_until`` index, so
+        # tasks due later are never touched (& nothing's locked if none are
+        # due yet).
+        table = self._table(queue_name)
+        due_query = (
+            "SELECT rowid FROM `delayed_{}` "
             "WHERE delay_until <= ? "
-            "LIMIT 1"
+            "ORDER BY delay_until, rowid "
+            "LIMIT ?"
         ).format(queue_name)
-        cur = self._run_query(query, [now])
-        res = cur.fetchone()
 
-        if res:
-            query = "DELETE FROM `queue_{}` WHERE task_id = ?".format(
-                queue_name
+        if self.conn.execute(due_query, [now, 1]).fetchone() is None:
+            return 0
+
+        with self._immediate() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO `{0}` "
+                "(task_id, data, delay_until, priority) "
+                "SELECT task_id, data, delay_until, priority "
+                "FROM `delayed_{1}` "
+                "WHERE rowid IN ({2})".format(table, queue_name, due_query),
+                [now, PROMOTE_BATCH],
+            )
+            promoted = cur.rowcount
+            cur.execute(
+                "DELETE FROM `delayed_{}` WHERE rowid IN ({})".format(
+                    queue_name, due_query
+                ),
+                [now, PROMOTE_BATCH],
+            )
+
+        return promoted
+
+    def reserve(self, queue_name, count, lease_time):
+        """
+        Takes up to ``count`` tasks off the queue, holding onto them until
+        they're acknowledged (see `Client.ack`).
+
+        Reserved tasks are moved into a ``leases_<queue_name>`` table. Any
+        not acknowledged within ``lease_time`` seconds are placed back on
+        the queue by `Client.reap`.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            count (int): The maximum number of tasks to reserve.
+            lease_time (float): How long (in seconds) to hold each task.
+
+        Returns:
+            list: ``(receipt, data)`` tuples, one per task.
+        """
+        self.flush()
+        now = time.time()
+        table = self._table(queue_name)
+        self._promote(queue_name, now)
+
+        with self._immediate() as cur:
+            cur.execute(
+                "SELECT rowid, task_id, data, priority "
+                "FROM `{}` "
+                "WHERE delay_until <= ? "
+                "ORDER BY priority DESC, delay_until, rowid "
+                "LIMIT ?".format(table),
+                [now, count],
+            )
+            rows = cur.fetchall()
+
+            if rows:
+                cur.executemany(
+                    "INSERT OR REPLACE INTO `leases_{}` "
+                    "(task_id, data, lease_until, priority) "
+                    "VALUES (?, ?, ?, ?)".format(queue_name),
+                    [
+                        [task_id, data, now + lease_time, priority]
+                        for _, task_id, data, priority in rows
+                    ],
+                )
+                cur.executemany(
+                    "DELETE FROM `{}` WHERE rowid = ?".format(table),
+                    [[row[0]] for row in rows],
+                )
+
+        return [(task_id, data) for _, task_id, data, _ in rows]
+
+    def ack(self, queue_name, receipt):
+        """
+        Acknowledges a reserved task is done with, removing it for good.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            receipt (str): The receipt from `Client.reserve`.
+        """
+        self._table(queue_name)
+        query = "DELETE FROM `leases_{}` WHERE task_id = ?".format(queue_name)
+        self._run_query(query, [receipt])
+
+    def nack(self, queue_name, receipt):
+        """
+        Places a reserved task straight back on the queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            receipt (str): The receipt from `Client.reserve`.
+        """
+        self._requeue(queue_name, "task_id = ?", [receipt])
+
+    def reap(self, queue_name):
+        """
+        Places any reserved tasks whose lease has run out back on the
+        queue.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+
+        Returns:
+            int: The number of tasks placed back on the queue.
+        """
+        return self._requeue(queue_name, "lease_until <= ?", [time.time()])
+
+    def _requeue(self, queue_name, where, args):
+        table = self._table(queue_name)
+
+        with self._immediate() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO `{0}` "
+                "(task_id, data, delay_until, priority) "
+                "SELECT task_id, data, ?, priority FROM `leases_{1}` "
+                "WHERE {2}".format(table, queue_name, where),
+                [time.time()] + args,
             )
-            self._run_query(query, [res[0]])
+            cur.execute(
+                "DELETE FROM `leases_{}` WHERE {}".format(queue_name, where),
+                args,
+            )
+            return cur.rowcount
+
+    def park(
+        self,
+        queue_name,
+        task_id,
+        data,
+        depends_on,
+        delay_until=None,
+        priority=0,
+    ):
+        """
+        Stores a task that can't run until the tasks it depends on have
+        completed (see `Client.mark_complete`).
 
-            return res[1]
+        The task is kept in a ``pending_<queue_name>`` table until then.
+        Dependencies that are no longer queued, reserved or parked (in any
+        queue) are taken to have completed (a task popped without a lease
+        counts as complete once popped). If every dependency has completed,
+        it's pushed right away.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            task_id (str): The identifier of the task.
+            data (str): The relevant data for the task.
+            depends_on (list): The IDs of the tasks it depends on.
+            delay_until (float): Optional. The Unix timestamp to delay
+                processing of the task until. Default is `None`.
+            priority (int): Optional. Higher priorities are popped first.
+                Default is `0`.
+
+        Returns:
+            str: The task ID.
+        """
+        self._table(queue_name)
+        depends_on = sorted(set(depends_on))
+        now = time.time()
+        # Buffered dependencies need to be found.
+        self.flush()
+
+        with self._immediate() as cur:
+            unfinished = self._unfinished(cur, depends_on)
+            waiting_on = [
+                depends for depends in depends_on if depends in unfinished
+            ]
+
+            if not waiting_on:
+                self._write_rows(
+                    cur,
+                    queue_name,
+                    [
+                        [
+                            task_id,
+                            data,
+                            now if delay_until is None else delay_until,
+                            priority,
+                        ]
+                    ],
+                    now=now,
+                )
+                return task_id
+
+            cur.execute(
+                "INSERT OR REPLACE INTO `pending_{}` "
+                "(task_id, data, delay_until, remaining, priority) "
+                "VALUES (?, ?, ?, ?, ?)".format(queue_name),
+                [task_id, data, delay_until, len(waiting_on), priority],
+            )
+            cur.executemany(
+                "INSERT INTO `task_dependents` "
+                "(depends_on, queue_name, task_id) "
+                "VALUES (?, ?, ?)",
+                [[depends, queue_name, task_id] for depends in waiting_on],
+            )
+
+        return task_id
+
+    def _unfinished(self, cur, task_ids):
+        # Which of the tasks are still queued, delayed, reserved or parked.
+        cur.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND ({})".format(
+                " OR ".join("name GLOB ?" for _ in UNFINISHED_TABLES)
+            ),
+            UNFINISHED_TABLES,
+        )
+        tables = [row[0] for row in cur.fetchall()]
+        in_clause = ", ".join("?" * len(task_ids))
+        cur.execute(
+            " UNION ".join(
+                "SELECT task_id FROM `{}` WHERE task_id IN ({})".format(
+                    table, in_clause
+                )
+                for table in tables
+            ),
+            list(task_ids) * len(tables),
+        )
+        return set(row[0] for row in cur.fetchall())
+
+    def mark_complete(self, queue_name, task_id):
+        """
+        Releases any parked tasks that were only waiting on a completed task
+        onto their queues.
+
+        Each parked task keeps a count of the dependencies it's still
+        waiting on, so releasing one is a single-row update. Tasks without
+        dependents only need a read (no write transaction).
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            task_id (str): The identifier of the completed task.
+
+        Returns:
+            int: The number of tasks released.
+        """
+        # Makes sure the shared tables exist.
+        self._table(queue_name)
+        query = "SELECT 1 FROM `task_dependents` WHERE depends_on = ? LIMIT 1"
+
+        if not self._fetch_all(query, [task_id]):
+            return 0
+
+        now = time.time()
+        released = 0
+
+        with self._immediate() as cur:
+            cur.execute(
+                "SELECT queue_name, task_id FROM `task_dependents` "
+                "WHERE depends_on = ?",
+                [task_id],
+            )
+            by_queue = {}
+
+            for name, dependent_id in cur.fetchall():
+                by_queue.setdefault(name, []).append([dependent_id])
+
+            cur.execute(
+                "DELETE FROM `task_dependents` WHERE depends_on = ?",
+                [task_id],
+            )
+
+            for name, dependent_ids in by_queue.items():
+                cur.executemany(
+                    "UPDATE `pending_{}` SET remaining = remaining - 1 "
+                    "WHERE task_id = ?".format(name),
+                    dependent_ids,
+                )
+                # Still-delayed tasks go in the delayed table.
+                for table, compare in (("queue", "<="), ("delayed", ">")):
+                    cur.executemany(
+                        "INSERT OR REPLACE INTO `{0}_{1}` "
+                        "(task_id, data, delay_until, priority) "
+                        "SELECT task_id, data, COALESCE(delay_until, ?), "
+                        "priority "
+                        "FROM `pending_{1}` "
+                        "WHERE task_id = ? AND remaining <= 0 "
+                        "AND COALESCE(delay_until, ?) {2} ?".format(
+                            table, name, compare
+                        ),
+                        [
+                            [now] + dependent_id + [now, now]
+                            for dependent_id in dependent_ids
+                        ],
+                    )
+                    released += cur.rowcount
+
+                cur.executemany(
+                    "DELETE FROM `pending_{}` "
+                    "WHERE task_id = ? AND remaining <= 0".format(name),
+                    dependent_ids,
+                )
+
+        return released
+
+    def acquire_lock(self, name, owner, timeout):
+        """
+        Takes (or renews) a named lock, if no one else holds it.
+
+        Used so only one `Scheduler` enqueues tasks at a time. Locks are
+        kept in a ``locks`` table.
+
+        Args:
+            name (str): The name of the lock.
+            owner (str): A unique identifier for whoever's taking it.
+            timeout (float): How long (in seconds) the lock is held for,
+                unless renewed.
+
+        Returns:
+            bool: `True` if ``owner`` now holds the lock
+        """
+        # Makes sure the shared tables exist.
+        self._table("all")
+        now = time.time()
+
+        with self._immediate() as cur:
+            cur.execute(
+                "SELECT owner, expires_at FROM `locks` WHERE name = ?",
+                [name],
+            )
+            held = cur.fetchone()
+
+            if held is not None and held[0] != owner and held[1] > now:
+                return False
+
+            cur.execute(
+                "INSERT OR REPLACE INTO `locks` (name, owner, expires_at) "
+                "VALUES (?, ?, ?)",
+                [name, owner, now + timeout],
+            )
+
+        return True
+
+    def release_lock(self, name, owner):
+        """
+        Gives up a named lock, if ``owner`` holds it.
+
+        Args:
+            name (str): The name of the lock.
+            owner (str): The identifier used to take it.
+        """
+        self._table("all")
+        self._run_query(
+            "DELETE FROM `locks` WHERE name = ? AND owner = ?", [name, owner]
+        )
 
     def get(self, queue_name, task_id):
         """
@@ -137,17 +924,49 @@ class Client(object):
         Returns:
             str: The data for the task.
         """
-        # fmt: off
-        query = (
-            "SELECT task_id, data "
-            "FROM `queue_{}` "
-            "WHERE task_id = ?"
-        ).format(queue_name)
-        # fmt: on
-        cur = self._run_query(query, [task_id])
-        res = cur.fetchone()
+        self.flush()
+
+        # Delayed & parked tasks can be fetched too.
+        for table in (
+            self._table(queue_name),
+            "delayed_{}".format(queue_name),
+            "pending_{}".format(queue_name),
+        ):
+            if HAS_RETURNING:
+                query = (
+                    "DELETE FROM `{}` WHERE task_id = ? RETURNING data"
+                ).format(table)
+                rows = self._fetch_all(query, [task_id])
+            else:
+                select_query = (
+                    "SELECT rowid, data FROM `{}` WHERE task_id = ?"
+                ).format(table)
+                delete_query = "DELETE FROM `{}` WHERE rowid = ?".format(table)
+                rows = [
+                    row[1:]
+                    for row in self._claim(
+                        select_query, delete_query, [task_id]
+                    )
+                ]
 
-        query = "DELETE FROM `queue_{}` WHERE task_id = ?".format(queue_name)
-        self._run_query(query, [task_id])
+            if rows:
+                return rows[0][0]
 
-        return res[1]
+
+class AsyncClient(ExecutorAsyncClient):
+    client_class = Client
+
+    def __init__(self, conn_string, executor=None):
+        """
+        An ``asyncio`` version of the SQLite `Client`.
+
+        SQLite has no async driver, so every call is run in an executor
+        (each executor thread gets its own connection).
+
+        Args:
+            conn_string (str): The DSN. Passed along to `Client`.
+            executor (concurrent.futures.Executor): Optional. The executor
+                to run calls in. Default is `None` (the loop's default
+                executor).
+        """
+        super(AsyncClient, self).__init__(conn_string, executor=executor)
@@ -1,36 +1,132 @@
+import atexit
+import base64
+import collections
+import threading
 import time
-from urllib.parse import urlparse
+import weakref
+from urllib.parse import parse_qs, urlparse
 
 import boto3
 from botocore.config import Config
 
+from alligator.backends.aio import ExecutorAsyncClient
+
+
+# The most messages SQS will accept in a single batch request.
+MAX_BATCH_SIZE = 10
+# The longest SQS will long poll for messages in a single receive.
+MAX_WAIT_TIME = 20
+# Flags messages whose body is base64-encoded binary task data.
+ENCODING_ATTRIBUTE = "alligator-encoding"
+# How long (in seconds) a received message may wait in the local buffer.
+# Kept well under SQS's default visibility timeout (30 seconds), so stale
+# messages are left for SQS to redeliver rather than handed out twice.
+BUFFER_TIMEOUT = 10
+# The longest (in milliseconds) a processed message waits to be deleted.
+DELETE_INTERVAL = 1000
+
+
+def _flush_at_exit(client_ref):
+    client = client_ref()
+
+    if client is not None:
+        client.flush()
+
 
 class Client(object):
     def __init__(self, conn_string):
         """
         A Amazon SQS-based ``Client``.
 
+        As ``boto3`` resources aren't thread-safe, each thread gets its own
+        connection, so a single instance can be safely shared between
+        threads.
+
+        To save on requests, messages are received 10 at a time & buffered
+        locally (per queue), then handed out by ``pop``/``pop_many``.
+        Deletes are coalesced into batches, sent once 10 are waiting or
+        ``delete_interval`` milliseconds after the first was popped (by a
+        background timer). Call `Client.flush` to send them early; they're
+        also sent when the process exits.
+
+        The DSN accepts a few query parameters:
+
+        * ``endpoint_url``: Talk to a different endpoint (for instance, a
+          local ``moto`` server).
+        * ``prefetch``: How many messages to receive at a time (1-10).
+          Default is `10`.
+        * ``delete_interval``: Default is `1000`. Capped at
+          ``BUFFER_TIMEOUT``, so messages are deleted well before SQS
+          would make them visible again.
+
+        Ex::
+
+            sqs://us-west-2/?endpoint_url=http://localhost:5000&prefetch=5
+
         Args:
             conn_string (str): The DSN. The region is parsed out of it.
                 Should be of the format ``sqs://region-name/``
         """
         self.conn_string = conn_string
         bits = urlparse(self.conn_string)
-        self.conn = self.get_connection(region=bits.hostname)
-        self._queue = None
+        self.region = bits.hostname
+        params = {
+            key: values[-1] for key, values in parse_qs(bits.query).items()
+        }
+        self.endpoint_url = params.get("endpoint_url")
+        self.prefetch = max(
+            1, min(int(params.get("prefetch", MAX_BATCH_SIZE)), MAX_BATCH_SIZE)
+        )
+        self.delete_interval = min(
+            int(params.get("delete_interval", DELETE_INTERVAL)) / 1000,
+            BUFFER_TIMEOUT,
+        )
+        self._local = threading.local()
+        # Received (but not yet popped) messages for each queue, as
+        # ``(received_at, message)`` tuples.
+        self._buffers = collections.defaultdict(collections.deque)
+        # Receipt handles of popped messages, waiting to be deleted.
+        self._deletes = []
+        self._timer = None
+        # Flushes may run in the timer's thread, so they share their own
+        # connection (guarded by the lock).
+        self._flush_conn = None
+        self._flush_queues = {}
+        self._lock = threading.RLock()
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    @property
+    def conn(self):
+        """
+        Returns the SQS resource for the current thread.
+        """
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = self.get_connection(region=self.region)
+            self._local.conn = conn
+            self._local.queues = {}
+
+        return conn
 
     def get_connection(self, region):
         """
         Returns a ``SQSConnection`` connection instance.
         """
         config = Config(region_name=region)
-        return boto3.resource("sqs", config=config)
+        return boto3.resource(
+            "sqs", config=config, endpoint_url=self.endpoint_url
+        )
 
     def _get_queue(self, queue_name):
-        if self._queue is None:
-            self._queue = self.conn.get_queue_by_name(QueueName=queue_name)
+        conn = self.conn
+        queue = self._local.queues.get(queue_name)
+
+        if queue is None:
+            queue = conn.get_queue_by_name(QueueName=queue_name)
+            self._local.queues[queue_name] = queue
 
-        return self._queue
+        return queue
 
     def len(self, queue_name):
         """
@@ -43,6 +139,7 @@ class Client(object):
         Returns:
             int: The length of the queue
         """
+        self.flush()
         queue = self._get_queue(queue_name)
         queue.load()
         return int(queue.attributes.get("ApproximateNumberOfMessages", 0))
@@ -58,10 +155,20 @@ class Client(object):
         queue = self._get_queue(queue_name)
         queue.purge()
 
-    def push(self, queue_name, task_id, data, delay_until=None):
+        with self._lock:
+            self._buffers.pop(queue_name, None)
+            self._deletes = [
+                delete for delete in self._deletes if delete[0] != queue_name
+            ]
+
+    def push(self, queue_name, task_id, data, delay_until=None, priority=0):
         """
         Pushes a task onto the queue.
 
+        SQS has no notion of priority, so ``priority`` is accepted but
+        ignored. Use a separate queue per priority (see ``Worker``'s
+        ``to_consume``) instead.
+
         Args:
             queue_name (str): The name of the queue. Usually handled by the
                 ``Gator`` instance.
@@ -69,14 +176,80 @@ class Client(object):
             data (str): The relevant data for the task.
             delay_until (float): Optional. The Unix timestamp to delay
                 processing of the task until. Default is `None`.
+            priority (int): Optional. Ignored. Default is `0`.
 
         Returns:
             str: The task ID.
         """
+        kwargs = self._message_kwargs(data, delay_until)
+
+        # SQS doesn't let you specify a task id.
+        queue = self._get_queue(queue_name)
+        res = queue.send_message(**kwargs)
+        return res.get("MessageId")
+
+    def push_many(self, queue_name, items, priority=0):
+        """
+        Pushes many tasks onto the queue at once.
+
+        Messages are sent via ``SendMessageBatch``, in groups of up to 10
+        (the SQS limit). Any entries SQS fails to accept are retried
+        individually.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            items (list): A list of ``(task_id, data, delay_until)`` tuples.
+            priority (int): Optional. Ignored. Default is `0`.
+
+        Returns:
+            list: The task IDs (SQS message IDs).
+        """
+        queue = self._get_queue(queue_name)
+        task_ids = []
+
+        for offset in range(0, len(items), MAX_BATCH_SIZE):
+            batch = items[offset : offset + MAX_BATCH_SIZE]
+            entries = []
+
+            for batch_offset, (_, data, delay_until) in enumerate(batch):
+                entry = self._message_kwargs(data, delay_until)
+                entry["Id"] = str(batch_offset)
+                entries.append(entry)
+
+            res = queue.send_messages(Entries=entries)
+            message_ids = {}
+
+            for sent in res.get("Successful", []):
+                message_ids[sent["Id"]] = sent["MessageId"]
+
+            for entry in entries:
+                entry_id = entry.pop("Id")
+
+                if entry_id not in message_ids:
+                    sent = queue.send_message(**entry)
+                    message_ids[entry_id] = sent.get("MessageId")
+
+                task_ids.append(message_ids[entry_id])
+
+        return task_ids
+
+    def _message_kwargs(self, data, delay_until=None):
         kwargs = {
             "MessageBody": data,
         }
 
+        # SQS message bodies must be text, so binary task data gets
+        # base64-encoded & flagged for decoding.
+        if isinstance(data, bytes):
+            kwargs["MessageBody"] = base64.b64encode(data).decode("ascii")
+            kwargs["MessageAttributes"] = {
+                ENCODING_ATTRIBUTE: {
+                    "DataType": "String",
+                    "StringValue": "base64",
+                }
+            }
+
         if delay_until is not None:
             now = time.time()
             delay_by = delay_until - now
@@ -84,10 +257,7 @@ class Client(object):
             if delay_by > 0:
                 kwargs["DelaySeconds"] = int(delay_by)
 
-        # SQS doesn't let you specify a task id.
-        queue = self._get_queue(queue_name)
-        res = queue.send_message(**kwargs)
-        return res.get("MessageId")
+        return kwargs
 
     def pop(self, queue_name):
         """
@@ -100,14 +270,235 @@ class Client(object):
         Returns:
             str: The data for the task.
         """
+        popped = self._receive(queue_name, 1)
+
+        if popped:
+            return popped[0]
+
+    def _message_data(self, message):
+        attributes = message.message_attributes or {}
+        encoding = attributes.get(ENCODING_ATTRIBUTE, {})
+
+        if encoding.get("StringValue") == "base64":
+            return base64.b64decode(message.body)
+
+        return message.body
+
+    def pop_many(self, queue_name, count):
+        """
+        Pops up to ``count`` tasks off the queue.
+
+        Buffered messages are handed out first. SQS caps a single receive
+        at 10 messages, so fewer than ``count`` may be returned even if the
+        queue has more.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            count (int): The maximum number of tasks to pop.
+
+        Returns:
+            list: The data for the tasks.
+        """
+        return self._receive(queue_name, count)
+
+    def pop_blocking(self, queue_name, timeout, count=1):
+        """
+        Pops up to ``count`` tasks off the queue, waiting up to ``timeout``
+        seconds for one to become available.
+
+        This uses SQS long polling, which is capped at 20 seconds.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            timeout (float): The maximum number of seconds to wait.
+            count (int): Optional. The maximum number of tasks to pop.
+                Default is `1`.
+
+        Returns:
+            list: The data for the tasks. Empty if none arrived in time.
+        """
+        wait_time = max(1, min(int(timeout), MAX_WAIT_TIME))
+        return self._receive(queue_name, count, wait_time=wait_time)
+
+    def _receive(self, queue_name, count, wait_time=0):
+        with self._lock:
+            messages = self._take_buffered(queue_name, count)
+
+            # Don't let deletes sit around through a long poll.
+            if wait_time and len(messages) < count:
+                self.flush()
+
+        # Receives happen outside the lock, so a long poll doesn't hold up
+        # other threads.
+        if len(messages) < count:
+            messages.extend(
+                self._receive_messages(
+                    queue_name, count - len(messages), wait_time
+                )
+            )
+
+        with self._lock:
+            self._delete_later(
+                queue_name, [message.receipt_handle for message in messages]
+            )
+
+        return [self._message_data(message) for message in messages]
+
+    def _take_buffered(self, queue_name, count):
+        # Messages that sat too long may already be visible (& handed to
+        # another worker) again, so they're dropped for SQS to redeliver.
+        stale_before = time.monotonic() - BUFFER_TIMEOUT
+        buffer = self._buffers[queue_name]
+        messages = []
+
+        while buffer and len(messages) < count:
+            received_at, message = buffer.popleft()
+
+            if received_at >= stale_before:
+                messages.append(message)
+
+        return messages
+
+    def _receive_messages(self, queue_name, count, wait_time):
         queue = self._get_queue(queue_name)
-        messages = queue.receive_messages(MaxNumberOfMessages=1)
+        received = queue.receive_messages(
+            MaxNumberOfMessages=min(max(count, self.prefetch), MAX_BATCH_SIZE),
+            WaitTimeSeconds=wait_time,
+            MessageAttributeNames=[ENCODING_ATTRIBUTE],
+        )
+        received_at = time.monotonic()
+
+        with self._lock:
+            self._buffers[queue_name].extend(
+                (received_at, message) for message in received[count:]
+            )
+
+        return list(received[:count])
+
+    def _delete_later(self, queue_name, receipt_handles):
+        self._deletes.extend(
+            (queue_name, receipt_handle) for receipt_handle in receipt_handles
+        )
 
-        if messages:
-            message = messages[0]
-            data = message.body
-            message.delete()
-            return data
+        if len(self._deletes) >= MAX_BATCH_SIZE:
+            self.flush()
+        elif self._deletes and self._timer is None:
+            self._timer = threading.Timer(self.delete_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _get_flush_queue(self, queue_name):
+        if self._flush_conn is None:
+            self._flush_conn = self.get_connection(region=self.region)
+
+        queue = self._flush_queues.get(queue_name)
+
+        if queue is None:
+            queue = self._flush_conn.get_queue_by_name(QueueName=queue_name)
+            self._flush_queues[queue_name] = queue
+
+        return queue
+
+    def flush(self):
+        """
+        Deletes all the popped messages still waiting to be deleted, in
+        batches of up to 10.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            deletes, self._deletes = self._deletes, []
+            by_queue = collections.defaultdict(list)
+
+            for queue_name, receipt_handle in deletes:
+                by_queue[queue_name].append(receipt_handle)
+
+            for queue_name, receipt_handles in by_queue.items():
+                queue = self._get_flush_queue(queue_name)
+
+                for offset in range(0, len(receipt_handles), MAX_BATCH_SIZE):
+                    batch = receipt_handles[offset : offset + MAX_BATCH_SIZE]
+                    queue.delete_messages(
+                        Entries=[
+                            {"Id": str(batch_offset), "ReceiptHandle": handle}
+                            for batch_offset, handle in enumerate(batch)
+                        ]
+                    )
+
+    def reserve(self, queue_name, count, lease_time):
+        """
+        Receives up to ``count`` tasks, holding onto them until they're
+        acknowledged (see `Client.ack`).
+
+        This uses SQS's own visibility timeout (set to ``lease_time``), so
+        unacknowledged messages are redelivered by SQS itself. Only one
+        receive's worth (10 messages) can be reserved at a time & the local
+        buffer is bypassed.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            count (int): The maximum number of tasks to reserve.
+            lease_time (float): How long (in seconds) to hold each task.
+
+        Returns:
+            list: ``(receipt, data)`` tuples, one per task.
+        """
+        queue = self._get_queue(queue_name)
+        messages = queue.receive_messages(
+            MaxNumberOfMessages=max(1, min(count, MAX_BATCH_SIZE)),
+            VisibilityTimeout=max(1, int(lease_time)),
+            MessageAttributeNames=[ENCODING_ATTRIBUTE],
+        )
+        return [
+            (message.receipt_handle, self._message_data(message))
+            for message in messages
+        ]
+
+    def ack(self, queue_name, receipt):
+        """
+        Acknowledges a reserved task is done with, deleting the message.
+
+        Unlike popped messages, the delete is sent right away, since the
+        lease may be nearly up by the time the task finishes.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            receipt (str): The receipt handle from `Client.reserve`.
+        """
+        queue = self._get_queue(queue_name)
+        queue.delete_messages(Entries=[{"Id": "0", "ReceiptHandle": receipt}])
+
+    def nack(self, queue_name, receipt):
+        """
+        Makes a reserved task's message visible again right away.
+
+        Args:
+            queue_name (str): The name of the queue. Usually handled by the
+                ``Gator`` instance.
+            receipt (str): The receipt handle from `Client.reserve`.
+        """
+        queue = self._get_queue(queue_name)
+        queue.change_message_visibility_batch(
+            Entries=[
+                {"Id": "0", "ReceiptHandle": receipt, "VisibilityTimeout": 0}
+            ]
+        )
+
+    def reap(self, queue_name):
+        """
+        Does nothing, as SQS redelivers messages itself once their
+        visibility timeout runs out.
+
+        Returns:
+            int: Always `0`.
+        """
+        return 0
 
     def get(self, queue_name, task_id):
         """
@@ -116,3 +507,22 @@ class Client(object):
         raise NotImplementedError(
             "SQS does not support fetching a specific message off the queue."
         )
+
+
+class AsyncClient(ExecutorAsyncClient):
+    client_class = Client
+
+    def __init__(self, conn_string, executor=None):
+        """
+        An ``asyncio`` version of the SQS `Client`.
+
+        Every (blocking) ``boto3`` call is run in an executor, including
+        long polls for messages.
+
+        Args:
+            conn_string (str): The DSN. Passed along to `Client`.
+            executor (concurrent.futures.Executor): Optional. The executor
+                to run calls in. Default is `None` (the loop's default
+                executor).
+        """
+        super(AsyncClient, self).__init__(conn_string, executor=executor)
@@ -0,0 +1,154 @@
+import contextlib
+import hashlib
+import mmap
+import os
+import tempfile
+
+from .exceptions import MissingBlobError
+
+
+# Serialized tasks at least this large (in bytes) go to the blob store.
+BLOB_THRESHOLD = 64 * 1024
+
+
+class BlobStore(object):
+    """
+    A base class for storing oversized task payloads outside the queue.
+
+    Subclasses need ``put``, ``open`` & ``delete`` methods.
+    """
+
+    def put(self, data):
+        """
+        Stores a payload.
+
+        Args:
+            data (bytes): The serialized task
+
+        Returns:
+            str: The key to fetch the payload with (ASCII only)
+        """
+        raise NotImplementedError()
+
+    def open(self, key):
+        """
+        A context manager providing the stored payload.
+
+        If not found, raises ``MissingBlobError``.
+
+        Args:
+            key (str): The key from `BlobStore.put`
+
+        Returns:
+            A bytes-like object with the serialized task
+        """
+        raise NotImplementedError()
+
+    def get(self, key):
+        """
+        Returns a copy of the stored payload.
+
+        Args:
+            key (str): The key from `BlobStore.put`
+
+        Returns:
+            bytes: The serialized task
+        """
+        with self.open(key) as blob:
+            return bytes(blob[:])
+
+    def delete(self, key):
+        """
+        Removes a stored payload. Missing payloads are ignored.
+
+        Args:
+            key (str): The key from `BlobStore.put`
+        """
+        raise NotImplementedError()
+
+
+class FileBlobStore(BlobStore):
+    def __init__(self, path):
+        """
+        A content-addressed ``BlobStore``, keeping each payload in a file
+        named by its SHA-256 hash.
+
+        Payloads are read via ``mmap``, so they aren't copied in full before
+        deserialization. The directory must be shared by everything pushing
+        & consuming the tasks.
+
+        Ex::
+
+            from alligator import Gator
+            from alligator.blobs import FileBlobStore
+
+            gator = Gator(
+                'redis://localhost:6379/0',
+                blob_store=FileBlobStore('/var/lib/alligator/blobs'),
+            )
+
+        Args:
+            path (str): The directory to store payloads in. Created if
+                needed.
+        """
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+
+    def key_path(self, key):
+        """
+        Returns the file path of a payload.
+
+        Payloads are spread out over subdirectories, named by the first two
+        characters of the key.
+
+        Args:
+            key (str): The payload's key
+
+        Returns:
+            str: The file path
+        """
+        return os.path.join(self.path, key[:2], key)
+
+    def put(self, data):
+        key = hashlib.sha256(data).hexdigest()
+        path = self.key_path(key)
+
+        if os.path.exists(path):
+            return key
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temporary file first, so readers never see a partial
+        # payload.
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+
+        try:
+            with os.fdopen(fd, "wb") as blob_file:
+                blob_file.write(data)
+
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+        return key
+
+    @contextlib.contextmanager
+    def open(self, key):
+        try:
+            blob_file = open(self.key_path(key), "rb")
+        except FileNotFoundError:
+            raise MissingBlobError("No payload found for '{}'.".format(key))
+
+        with blob_file:
+            with mmap.mmap(
+                blob_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as blob:
+                yield blob
+
+    def delete(self, key):
+        try:
+            os.unlink(self.key_path(key))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,141 @@
+import lzma
+import zlib
+
+from .exceptions import UnknownCompressorError
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Payloads smaller than this (in bytes) aren't worth compressing.
+COMPRESS_THRESHOLD = 1024
+
+
+class Compressor(object):
+    """
+    A base class for compressing serialized tasks.
+
+    Subclasses need a unique ``name`` & ``flag`` (a value from `1-15`,
+    written to the low bits of the payload header's flags), as well as
+    ``compress`` & ``decompress`` methods.
+    """
+
+    name = None
+    flag = None
+
+    def compress(self, raw):
+        """
+        Compresses a serialized task.
+
+        Args:
+            raw (bytes): The serialized task
+
+        Returns:
+            bytes: The compressed data
+        """
+        raise NotImplementedError()
+
+    def decompress(self, compressed):
+        """
+        Decompresses a serialized task.
+
+        Args:
+            compressed (bytes): The compressed data
+
+        Returns:
+            bytes: The serialized task
+        """
+        raise NotImplementedError()
+
+
+class ZlibCompressor(Compressor):
+    """
+    Compresses tasks with (stdlib) ``zlib``. A good, fast default.
+    """
+
+    name = "zlib"
+    flag = 1
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def compress(self, raw):
+        return zlib.compress(raw, self.level)
+
+    def decompress(self, compressed):
+        return zlib.decompress(compressed)
+
+
+class LZMACompressor(Compressor):
+    """
+    Compresses tasks with (stdlib) ``lzma``.
+
+    Smaller output than ``zlib``, but much slower to compress.
+    """
+
+    name = "lzma"
+    flag = 2
+
+    def __init__(self, preset=None):
+        self.preset = preset
+
+    def compress(self, raw):
+        return lzma.compress(raw, preset=self.preset)
+
+    def decompress(self, compressed):
+        return lzma.decompress(compressed)
+
+
+class ZstdCompressor(Compressor):
+    """
+    Compresses tasks with Zstandard. Smaller & faster than ``zlib``.
+
+    Requires the ``zstandard`` package.
+    """
+
+    name = "zstd"
+    flag = 3
+
+    def __init__(self, level=3):
+        if zstandard is None:
+            raise UnknownCompressorError(
+                "The 'zstd' compressor requires the 'zstandard' package."
+            )
+
+        self.level = level
+
+    def compress(self, raw):
+        return zstandard.ZstdCompressor(level=self.level).compress(raw)
+
+    def decompress(self, compressed):
+        return zstandard.ZstdDecompressor().decompress(compressed)
+
+
+COMPRESSORS = [ZlibCompressor, LZMACompressor, ZstdCompressor]
+
+
+def get_compressor(compressor):
+    """
+    Returns a compressor instance.
+
+    Ex::
+
+        compressor = get_compressor('zlib')
+
+    Args:
+        compressor (str|int|Compressor): A compressor's name, flag or an
+            already-instantiated compressor. `None` is passed through.
+
+    Returns:
+        Compressor: The compressor instance
+    """
+    if compressor is None or isinstance(compressor, Compressor):
+        return compressor
+
+    for compressor_class in COMPRESSORS:
+        if compressor in (compressor_class.name, compressor_class.flag):
+            return compressor_class()
+
+    raise UnknownCompressorError("Unknown compressor '{}'.".format(compressor))
@@ -8,3 +8,7 @@ CANCELED = 5
 
 # The default queue name for Alligator.
 ALL = "all"
+
+# The range of `Task.priority`. Higher priorities are popped first.
+MIN_PRIORITY = 0
+MAX_PRIORITY = 9
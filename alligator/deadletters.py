@@ -0,0 +1,146 @@
+import base64
+import json
+import time
+import uuid
+
+from .utils import determine_module, determine_name
+
+
+class DeadLetter(object):
+    def __init__(
+        self,
+        payload,
+        error_class=None,
+        error=None,
+        task_id=None,
+        attempts=0,
+        failed_at=None,
+        queue_name=None,
+        dead_letter_id=None,
+    ):
+        """
+        A task that couldn't be processed, along with why.
+
+        Dead letters are stored in a `Gator`'s ``dead_letter_queue`` (see
+        `Gator.dead_letter` & `Gator.replay`).
+
+        Args:
+            payload (str|bytes): The raw task data, as it was (or would
+                have been) stored in the queue
+            error_class (str): Optional. The dotted path of the exception
+                class raised. Default is `None`.
+            error (str): Optional. The exception's message. Default is
+                `None`.
+            task_id (str): Optional. The task's ID, if it could be
+                deserialized. Default is `None`.
+            attempts (int): Optional. How many times the task was run.
+                Default is `0`.
+            failed_at (float): Optional. The Unix timestamp of the final
+                failure. Default is `None` (now).
+            queue_name (str): Optional. The queue the task came from.
+                Default is `None`.
+            dead_letter_id (str): Optional. A unique identifier for the
+                dead letter. Default is `None` (create a `uuid4`).
+        """
+        self.payload = payload
+        self.error_class = error_class
+        self.error = error
+        self.task_id = task_id
+        self.attempts = attempts
+        self.failed_at = failed_at
+        self.queue_name = queue_name
+        self.dead_letter_id = dead_letter_id
+
+        if self.failed_at is None:
+            self.failed_at = time.time()
+
+        if self.dead_letter_id is None:
+            self.dead_letter_id = "dead:{}".format(uuid.uuid4())
+
+    def __repr__(self):
+        return "<DeadLetter: {} ({})>".format(
+            self.task_id or self.dead_letter_id, self.error_class
+        )
+
+    @classmethod
+    def from_error(cls, payload, err, task=None, queue_name=None):
+        """
+        Creates a dead letter for a payload that failed with ``err``.
+
+        Args:
+            payload (str|bytes): The raw task data
+            err (Exception): What was raised
+            task (Task): Optional. The task, if it could be deserialized.
+                Default is `None`.
+            queue_name (str): Optional. The queue the task came from.
+                Default is `None`.
+
+        Returns:
+            DeadLetter: The dead letter
+        """
+        error_class = type(err)
+
+        return cls(
+            payload,
+            error_class="{}.{}".format(
+                determine_module(error_class), determine_name(error_class)
+            ),
+            error=str(err),
+            task_id=getattr(task, "task_id", None),
+            attempts=getattr(task, "attempts", 0),
+            queue_name=queue_name,
+        )
+
+    def to_dict(self):
+        """
+        Returns the dead letter's data as a dictionary, ready for
+        serialization.
+
+        Binary payloads are base64-encoded.
+
+        Returns:
+            dict: The dead letter data
+        """
+        data = {
+            "dead_letter_id": self.dead_letter_id,
+            "payload": self.payload,
+            "error_class": self.error_class,
+            "error": self.error,
+            "task_id": self.task_id,
+            "attempts": self.attempts,
+            "failed_at": self.failed_at,
+            "queue_name": self.queue_name,
+        }
+
+        if isinstance(self.payload, bytes):
+            data["payload"] = base64.b64encode(self.payload).decode("ascii")
+            data["encoding"] = "base64"
+
+        return data
+
+    def serialize(self):
+        """
+        Serializes the dead letter (as JSON) for storing in a queue.
+
+        Returns:
+            str: The serialized dead letter
+        """
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def deserialize(cls, data):
+        """
+        Rebuilds a dead letter from `DeadLetter.serialize`.
+
+        Args:
+            data (str|bytes): The serialized dead letter
+
+        Returns:
+            DeadLetter: The dead letter
+        """
+        data = json.loads(data)
+
+        if data.pop("encoding", None) == "base64":
+            data["payload"] = base64.b64decode(data["payload"])
+
+        return cls(**data)
@@ -36,3 +36,67 @@ class MultipleDelayError(AlligatorException):
     """
 
     pass
+
+
+class InvalidPriorityError(AlligatorException):
+    """
+    Thrown when a task's priority is out of range.
+    """
+
+    pass
+
+
+class UnknownSerializerError(AlligatorException):
+    """
+    Thrown when an unknown (or unavailable) serializer is requested.
+    """
+
+    pass
+
+
+class UnknownCompressorError(AlligatorException):
+    """
+    Thrown when an unknown (or unavailable) compressor is requested.
+    """
+
+    pass
+
+
+class MissingBlobError(AlligatorException):
+    """
+    Thrown when a task's payload can't be fetched from the blob store.
+    """
+
+    pass
+
+
+class UnknownRetryPolicyError(AlligatorException):
+    """
+    Thrown when a task's retry policy can't be found.
+    """
+
+    pass
+
+
+class NoResultStoreError(AlligatorException):
+    """
+    Thrown when fetching results without a result store.
+    """
+
+    pass
+
+
+class ResultTimeoutError(AlligatorException):
+    """
+    Thrown when a task's result doesn't arrive in time.
+    """
+
+    pass
+
+
+class ResultTooLargeError(AlligatorException):
+    """
+    Thrown when a task's result was too large to store.
+    """
+
+    pass
@@ -1,11 +1,58 @@
-from .constants import ALL
+import asyncio
+import copy
+import functools
+import time
+
+from . import serializers
+from .blobs import BLOB_THRESHOLD
+from .compressors import COMPRESS_THRESHOLD, get_compressor
+from .constants import ALL, FAILED
+from .deadletters import DeadLetter
+from .exceptions import NoResultStoreError
+from .results import Result
+from .serializers import get_serializer
 from .tasks import Task
 from .utils import import_attr
 
 
+def _priority_kwargs(priority):
+    # Only passed along when set, so backends without priorities still work
+    # for everything else.
+    if priority:
+        return {"priority": priority}
+
+    return {}
+
+
+def _unwrap_reservation(data):
+    # Returns the ``Reservation`` (or `None`) & the raw task data.
+    if isinstance(data, Reservation):
+        return data, data.data
+
+    return None, data
+
+
+def _failed_for_good(task):
+    # Whether a task that raised is out of retries (& should be moved to
+    # the dead letter queue).
+    return task.is_async and task.status == FAILED
+
+
 class Gator(object):
     def __init__(
-        self, conn_string, queue_name=ALL, task_class=Task, backend_class=None
+        self,
+        conn_string,
+        queue_name=ALL,
+        task_class=Task,
+        backend_class=None,
+        serializer=None,
+        compressor=None,
+        compress_threshold=COMPRESS_THRESHOLD,
+        blob_store=None,
+        blob_threshold=BLOB_THRESHOLD,
+        lease_time=None,
+        dead_letter_queue=None,
+        result_store=None,
     ):
         """
         A coordination for scheduling & processing tasks.
@@ -34,11 +81,53 @@ class Gator(object):
             backend_class (class): Optional. The class to use for
                 instantiating the backend. Defaults to ``None`` (DSN
                 detection).
+            serializer (str|Serializer): Optional. How tasks are serialized
+                when placed in the queue, such as ``"msgpack"`` or
+                ``"marshal"`` (see ``alligator.serializers``). Any format
+                can always be read back. Defaults to ``None`` (plain JSON).
+            compressor (str|Compressor): Optional. How large tasks are
+                compressed, such as ``"zlib"``, ``"lzma"`` or ``"zstd"``
+                (see ``alligator.compressors``). Defaults to ``None`` (no
+                compression).
+            compress_threshold (int): Optional. The serialized size (in
+                bytes) at which tasks start getting compressed. Defaults to
+                ``1024``.
+            blob_store (BlobStore): Optional. Where to store oversized
+                tasks, leaving only a small reference (a "claim check") in
+                the queue (see ``alligator.blobs``). Defaults to ``None``
+                (everything goes in the queue).
+            blob_threshold (int): Optional. The serialized size (in bytes)
+                at which tasks go to the ``blob_store``. Defaults to
+                ``65536``.
+            lease_time (float): Optional. If provided (& the backend
+                supports it), tasks are reserved rather than popped, then
+                only removed from the queue once they've run. If a worker
+                dies mid-task, the task goes back on the queue after this
+                many seconds, so should be longer than any task takes to
+                run. Defaults to ``None`` (tasks are removed as they're
+                popped).
+            dead_letter_queue (str): Optional. The name of a queue (on the
+                same backend) to move tasks that can't be processed to,
+                along with the error (see ``Gator.dead_letter``). Defaults
+                to ``None`` (such tasks are dropped).
+            result_store (ResultStore): Optional. Where workers keep the
+                results of finished tasks, so they can be waited on (see
+                ``Task.wait`` & ``alligator.results``). Defaults to ``None``
+                (results are discarded).
         """
         self.conn_string = conn_string
         self.queue_name = queue_name
         self.task_class = task_class
         self.backend_class = backend_class
+        self.serializer = get_serializer(serializer)
+        self.compressor = get_compressor(compressor)
+        self.compress_threshold = compress_threshold
+        self.blob_store = blob_store
+        self.blob_threshold = blob_threshold
+        self.lease_time = lease_time
+        self.reaped_at = 0
+        self.dead_letter_queue = dead_letter_queue
+        self.result_store = result_store
 
         if not backend_class:
             self.backend = self.build_backend(self.conn_string)
@@ -67,6 +156,28 @@ class Gator(object):
         client_class = import_attr(backend_path, "Client")
         return client_class(conn_string)
 
+    def for_queue(self, queue_name):
+        """
+        Returns a copy of the ``Gator`` for a different queue, sharing the
+        same backend connection & configuration.
+
+        Ex::
+
+            gator = Gator('redis://localhost:6379/0')
+            urgent = gator.for_queue('urgent')
+            urgent.task(send_password_reset, user.pk)
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Returns:
+            Gator: The new ``Gator`` (or ``AsyncGator``)
+        """
+        gator = copy.copy(self)
+        gator.queue_name = queue_name
+        gator.reaped_at = 0
+        return gator
+
     def len(self):
         """
         Returns the number of remaining queued tasks.
@@ -76,6 +187,197 @@ class Gator(object):
         """
         return self.backend.len(self.queue_name)
 
+    def serialize(self, task):
+        """
+        Serializes a task for storing in the queue, using the configured
+        serializer & compressor.
+
+        If the result is larger than ``Gator.blob_threshold`` & there's a
+        ``Gator.blob_store``, the task is stored there instead & a claim
+        check is returned in its place.
+
+        Args:
+            task (Task): The task to serialize
+
+        Returns:
+            str|bytes: The serialized task
+        """
+        if self.serializer is None and self.compressor is None:
+            # Keeps custom task classes with the older ``serialize()``
+            # signature working.
+            data = task.serialize()
+        else:
+            data = task.serialize(
+                serializer=self.serializer,
+                compressor=self.compressor,
+                compress_threshold=self.compress_threshold,
+            )
+
+        if self.blob_store is None or len(data) < self.blob_threshold:
+            return data
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        key = self.blob_store.put(data)
+        return serializers.claim_check(key, data)
+
+    def deserialize(self, data):
+        """
+        Deserializes a task from the queue, fetching it from the
+        ``Gator.blob_store`` if needed.
+
+        Args:
+            data (str|bytes): The raw task data
+
+        Returns:
+            Task: The ``Task`` instance
+        """
+        if self.blob_store is None:
+            return self.task_class.deserialize(data)
+
+        return self.task_class.deserialize(data, blob_store=self.blob_store)
+
+    def release(self, data):
+        """
+        Deletes the stored task from the ``Gator.blob_store``, if ``data``
+        is a claim check.
+
+        Args:
+            data (str|bytes): The raw task data
+        """
+        key = serializers.blob_key(data)
+
+        if key is not None and self.blob_store is not None:
+            self.blob_store.delete(key)
+
+    def load(self, data):
+        """
+        Deserializes a task from the queue (see ``Gator.deserialize``),
+        moving the data to the ``Gator.dead_letter_queue`` if it can't be
+        deserialized (for instance, if the callable no longer exists).
+
+        Args:
+            data (str|bytes): The raw task data
+
+        Returns:
+            Task: The ``Task`` instance
+        """
+        try:
+            return self.deserialize(data)
+        except Exception as err:
+            self.dead_letter(data, err)
+            raise
+
+    def dead_letter(self, data, err, task=None):
+        """
+        Moves a task that can't be processed to the
+        ``Gator.dead_letter_queue``, along with the error, the number of
+        attempts & when it failed.
+
+        Called for tasks that have run out of retries & for data that
+        can't be deserialized. Does nothing without a
+        ``Gator.dead_letter_queue``.
+
+        Args:
+            data (str|bytes): The raw task data. If `None`, the ``task``
+                is serialized instead.
+            err (Exception): What was raised
+            task (Task): Optional. The failed task, if it could be
+                deserialized. Default is `None`.
+
+        Returns:
+            DeadLetter: The stored dead letter (or `None`)
+        """
+        letter = self._build_dead_letter(data, err, task)
+
+        if letter is not None:
+            self.backend.push(
+                self.dead_letter_queue,
+                letter.dead_letter_id,
+                letter.serialize(),
+            )
+
+        return letter
+
+    def _build_dead_letter(self, data, err, task):
+        # Shared by `AsyncGator.dead_letter`. `None` without a queue.
+        if self.dead_letter_queue is None:
+            return None
+
+        if data is None:
+            data = self.serialize(task)
+
+        return DeadLetter.from_error(
+            data, err, task=task, queue_name=self.queue_name
+        )
+
+    def replay(self, count=None, batch_size=500):
+        """
+        Moves dead letters back onto the queue, to be processed again.
+
+        Tasks that ran out of retries come back with none left, so they're
+        only run once more.
+
+        Ex::
+
+            # Deployed a fix? Give everything another go.
+            gator.replay()
+
+        Args:
+            count (int): Optional. The most dead letters to replay.
+                Defaults to `None` (all of them).
+            batch_size (int): Optional. The most dead letters to move at
+                once. Defaults to `500`.
+
+        Returns:
+            list: The replayed ``DeadLetter`` instances
+        """
+        replayed = []
+        pop_many = getattr(self.backend, "pop_many", None)
+        push_many = getattr(self.backend, "push_many", None)
+
+        while count is None or len(replayed) < count:
+            limit = self._replay_limit(count, len(replayed), batch_size)
+
+            if pop_many is not None:
+                fetched = pop_many(self.dead_letter_queue, limit)
+            else:
+                data = self.backend.pop(self.dead_letter_queue)
+                fetched = [data] if data else []
+
+            if not fetched:
+                break
+
+            letters, items = self._replay_items(fetched)
+
+            if push_many is not None:
+                push_many(self.queue_name, items)
+            else:
+                for task_id, data, delay_until in items:
+                    self.backend.push(self.queue_name, task_id, data)
+
+            replayed.extend(letters)
+
+        return replayed
+
+    def _replay_limit(self, count, replayed, batch_size):
+        # How many dead letters to fetch next.
+        if count is None:
+            return batch_size
+
+        return min(batch_size, count - replayed)
+
+    def _replay_items(self, fetched):
+        # The dead letters & the ``(task_id, data, delay_until)`` items to
+        # push them back onto the queue with.
+        letters = [DeadLetter.deserialize(data) for data in fetched]
+        items = [
+            (letter.task_id or letter.dead_letter_id, letter.payload, None)
+            for letter in letters
+        ]
+        return letters, items
+
     def push(self, task, func, *args, **kwargs):
         """
         Pushes a configured task onto the queue.
@@ -88,6 +390,15 @@ class Gator(object):
         run immediately (in-process). This is useful for development and
         in testing.
 
+        If the ``Task`` has ``depends_on`` set & the backend can park tasks
+        (via a ``park`` method on the backend ``Client``), it's held out of
+        the queue until all of its dependencies have completed. Backends
+        that can't park tasks ignore ``depends_on``.
+
+        A non-zero ``Task.priority`` is passed along to the backend (as a
+        ``priority`` keyword argument), which pops higher priority tasks
+        first.
+
         Ex::
 
             task = Task(is_async=False, retries=3)
@@ -103,20 +414,153 @@ class Gator(object):
             Task: The fleshed-out ``Task`` instance
         """
         task.to_call(func, *args, **kwargs)
-        data = task.serialize()
+        task.result_store = self.result_store
+        data = self.serialize(task)
 
         if task.is_async:
-            task.task_id = self.backend.push(
-                self.queue_name,
-                task.task_id,
-                data,
-                delay_until=task.delay_until,
-            )
+            enqueue, call_args, call_kwargs = self._enqueue_call(task, data)
+            task.task_id = enqueue(*call_args, **call_kwargs)
         else:
             self.execute(task)
 
         return task
 
+    def _enqueue_call(self, task, data):
+        # The backend method (``park`` or ``push``) to queue an async task
+        # with, along with its arguments. Shared with `AsyncGator`, which
+        # awaits the call.
+        kwargs = dict(
+            delay_until=task.delay_until, **_priority_kwargs(task.priority)
+        )
+
+        if self.can_park(task):
+            args = (self.queue_name, task.task_id, data, task.depends_on)
+            return self.backend.park, args, kwargs
+
+        return self.backend.push, (self.queue_name, task.task_id, data), kwargs
+
+    def push_many(self, func, iterable_of_args, batch_size=500, **kwargs):
+        """
+        Pushes many tasks for the same callable onto the queue at once.
+
+        Rather than serializing & sending each task in its own round trip,
+        tasks are built in batches of ``batch_size`` & handed to the
+        backend together. If the backend ``Client`` provides a
+        ``push_many`` method, it's used to store the whole batch in as few
+        round trips as possible. Otherwise, this falls back to calling
+        ``push`` for each task.
+
+        Each item in ``iterable_of_args`` describes one task's arguments.
+        A ``list`` or ``tuple`` is used as the positional arguments, a
+        ``dict`` as the keyword arguments & anything else as a single
+        positional argument.
+
+        Ex::
+
+            tasks = gator.push_many(send_welcome_email, user_ids)
+            # ...or...
+            tasks = gator.push_many(add, [(1, 2), (3, 4), (5, 6)], retries=3)
+
+        Args:
+            func (callable): The callable with business logic to execute
+            iterable_of_args (iterable): The arguments for each task
+            batch_size (int): Optional. The maximum number of tasks to send
+                to the backend at once. Defaults to `500`.
+            kwargs (dict): Keyword arguments used to instantiate each
+                ``Task`` (such as ``retries`` or ``delay_by``)
+
+        Returns:
+            list: The fleshed-out ``Task`` instances
+        """
+        tasks = []
+        batch = []
+
+        for task_args in iterable_of_args:
+            task = self._build_task(func, task_args, kwargs)
+            tasks.append(task)
+
+            if not task.is_async:
+                self.execute(task)
+                continue
+
+            batch.append(task)
+
+            if len(batch) >= batch_size:
+                self._push_batch(batch)
+                batch = []
+
+        if batch:
+            self._push_batch(batch)
+
+        return tasks
+
+    def _build_task(self, func, task_args, kwargs):
+        # Builds one of the tasks for `push_many`.
+        task = self.task_class(**kwargs)
+
+        if isinstance(task_args, dict):
+            task.to_call(func, **task_args)
+        elif isinstance(task_args, (list, tuple)):
+            task.to_call(func, *task_args)
+        else:
+            task.to_call(func, task_args)
+
+        task.result_store = self.result_store
+        return task
+
+    def _split_batch(self, tasks):
+        # Splits a batch into the tasks to park (one at a time) & the rest,
+        # as ``(tasks, items, options)`` per priority, since backends take a
+        # single priority per batch.
+        parked = []
+        by_priority = {}
+
+        for task in tasks:
+            if self.can_park(task):
+                parked.append(task)
+            else:
+                by_priority.setdefault(task.priority, []).append(task)
+
+        batches = [
+            (
+                prioritized,
+                [
+                    (task.task_id, self.serialize(task), task.delay_until)
+                    for task in prioritized
+                ],
+                _priority_kwargs(priority),
+            )
+            for priority, prioritized in by_priority.items()
+        ]
+        return parked, batches
+
+    def _push_batch(self, tasks):
+        parked, batches = self._split_batch(tasks)
+
+        for task in parked:
+            park, args, kwargs = self._enqueue_call(task, self.serialize(task))
+            task.task_id = park(*args, **kwargs)
+
+        push_many = getattr(self.backend, "push_many", None)
+
+        for prioritized, items, options in batches:
+            if push_many is not None:
+                task_ids = push_many(self.queue_name, items, **options)
+            else:
+                task_ids = [
+                    self.backend.push(
+                        self.queue_name,
+                        task_id,
+                        data,
+                        delay_until=delay_until,
+                        **options
+                    )
+                    for task_id, data, delay_until in items
+                ]
+
+            for task, task_id in zip(prioritized, task_ids):
+                task.task_id = task_id
+
     def pop(self):
         """
         Pops a task off the front of the queue & runs it.
@@ -134,187 +578,561 @@ class Gator(object):
         Returns:
             Task: The completed ``Task`` instance
         """
+        if self.can_reserve():
+            reserved = self.reserve()
+
+            if reserved:
+                return self.process(reserved[0])
+
+            return None
+
         data = self.backend.pop(self.queue_name)
 
         if data:
-            task = self.task_class.deserialize(data)
-            return self.execute(task)
+            return self.process(data)
 
-    def get(self, task_id):
+    def fetch(self, count=1, timeout=None):
         """
-        Gets a specific task, by ``task_id`` off the queue & runs it.
+        Pulls up to ``count`` tasks off the front of the queue *without*
+        running them.
 
-        Using this is not as performant (because it has to search the queue),
-        but can be useful if you need to specifically handle a task
-        *right now*.
+        If the backend ``Client`` provides a ``pop_many`` method, all the
+        tasks are fetched in a single round trip. Otherwise, this falls
+        back to calling ``pop`` repeatedly until the queue runs dry.
+
+        If a ``timeout`` is provided & the backend ``Client`` provides a
+        ``pop_blocking`` method, this will wait up to ``timeout`` seconds
+        for a task to arrive. Otherwise, it returns immediately.
+
+        Useful for workers that want to buffer tasks locally. Each
+        returned item should later be handed to ``Gator.process``.
+
+        With a ``Gator.lease_time``, tasks are reserved instead (see
+        ``Gator.reserve``) & this never waits.
 
         Ex::
 
-            # Tasks were previously added, maybe by a different process or
-            # machine...
-            finished_task = gator.get('a-specific-uuid-here')
+            for data in gator.fetch(10):
+                finished_task = gator.process(data)
 
         Args:
-            task_id (str): The identifier of the task to process
+            count (int): Optional. The maximum number of tasks to fetch.
+                Defaults to `1`.
+            timeout (float): Optional. The maximum number of seconds to
+                wait for a task. Defaults to `None` (don't wait).
 
         Returns:
-            Task: The completed ``Task`` instance
+            list: The raw task data (or ``Reservation`` instances)
         """
-        data = self.backend.get(self.queue_name, task_id)
+        if self.can_reserve():
+            return self.reserve(count)
 
-        if data:
-            task = self.task_class.deserialize(data)
-            return self.execute(task)
+        if timeout and self.can_block():
+            return self.backend.pop_blocking(
+                self.queue_name, timeout, count=count
+            )
 
-    def cancel(self, task_id):
-        """
-        Takes an existing task & cancels it before it is processed.
+        pop_many = getattr(self.backend, "pop_many", None)
 
-        Returns the canceled task, as that could be useful in creating a new
-        task.
+        if count > 1 and pop_many is not None:
+            return pop_many(self.queue_name, count)
 
-        Ex::
+        fetched = []
 
-            task = gator.task(add, 18, 9)
+        while len(fetched) < count:
+            data = self.backend.pop(self.queue_name)
 
-            # Whoops, didn't mean to do that.
-            gator.cancel(task.task_id)
+            if not data:
+                break
 
-        Args:
-            task_id (str): The identifier of the task to process
+            fetched.append(data)
+
+        return fetched
+
+    def can_block(self):
+        """
+        Returns whether the backend supports waiting for tasks to arrive
+        (see ``Gator.fetch``).
 
         Returns:
-            Task: The canceled ``Task`` instance
+            bool: `True` if the backend has a ``pop_blocking`` method (&
+                tasks aren't being reserved)
         """
-        data = self.backend.get(self.queue_name, task_id)
+        if self.can_reserve():
+            return False
 
-        if data:
-            task = self.task_class.deserialize(data)
-            task.to_canceled()
-            return task
+        return getattr(self.backend, "pop_blocking", None) is not None
 
-    def execute(self, task):
+    def can_reserve(self):
         """
-        Given a task instance, this runs it.
+        Returns whether tasks are reserved (& acknowledged once run) rather
+        than popped.
 
-        This includes handling retries & re-raising exceptions.
+        Returns:
+            bool: `True` if there's a ``Gator.lease_time`` & the backend has
+                a ``reserve`` method
+        """
+        if self.lease_time is None:
+            return False
 
-        Ex::
+        return getattr(self.backend, "reserve", None) is not None
 
-            task = Task(is_async=False, retries=5)
-            task.to_call(add, 101, 35)
-            finished_task = gator.execute(task)
+    def can_park(self, task):
+        """
+        Returns whether a task should be parked until its dependencies have
+        completed, rather than pushed onto the queue.
 
         Args:
-            task_id (str): The identifier of the task to process
+            task (Task): The task being pushed
 
         Returns:
-            Task: The completed ``Task`` instance
+            bool: `True` if the task has ``depends_on`` & the backend has a
+                ``park`` method
         """
-        try:
-            return task.run()
-        except Exception:
-            if task.retries > 0:
-                task.retries -= 1
-                task.to_retrying()
+        if not task.depends_on:
+            return False
 
-                if task.is_async:
-                    # Place it back on the queue.
-                    data = task.serialize()
-                    task.task_id = self.backend.push(
-                        self.queue_name, task.task_id, data
-                    )
-                else:
-                    return self.execute(task)
-            else:
-                raise
+        return getattr(self.backend, "park", None) is not None
 
-    def task(self, func, *args, **kwargs):
+    def reserve(self, count=1):
         """
-        Pushes a task onto the queue.
-
-        This will instantiate a ``Gator.task_class`` instance, configure
-        the callable & its arguments, then push it onto the queue.
-
-        You'll typically want to use either this method or the
-        ``Gator.options`` context manager (if you need to configure the
-        ``Task`` arguments, such as retries, is_async, task_id, etc.)
+        Reserves up to ``count`` tasks off the front of the queue *without*
+        running them.
 
-        Ex::
+        Reserved tasks stay with the backend until acknowledged (see
+        ``Gator.ack``), which ``Gator.process`` does once the task has run.
+        Any not acknowledged within ``Gator.lease_time`` seconds go back on
+        the queue. Expired leases are checked for (see ``Gator.reap``) at
+        most once per ``Gator.lease_time``.
 
-            on_queue = gator.task(increment, incr_by=2)
+        Requires a backend with ``reserve``/``ack``/``nack``/``reap``
+        methods.
 
         Args:
-            func (callable): The callable with business logic to execute
-            args (list): Positional arguments to pass to the callable task
-            kwargs (dict): Keyword arguments to pass to the callable task
+            count (int): Optional. The maximum number of tasks to reserve.
+                Defaults to `1`.
 
         Returns:
-            Task: The ``Task`` instance
-        """
-        task = self.task_class()
-        return self.push(task, func, *args, **kwargs)
-
-    def options(self, **kwargs):
+            list: ``Reservation`` instances
         """
-        Allows specifying advanced ``Task`` options to control how the task
-        runs.
+        if time.time() - self.reaped_at >= self.lease_time:
+            self.reap()
 
-        This returns a context manager which will create ``Task`` instances
-        with the supplied options. See ``Task.__init__`` for the available
-        arguments.
+        reserved = self.backend.reserve(
+            self.queue_name, count, self.lease_time
+        )
+        return [Reservation(receipt, data) for receipt, data in reserved]
 
-        Ex::
+    def ack(self, reservation):
+        """
+        Acknowledges a reserved task is done with, removing it for good.
 
-            def party_time(task, result):
-                # Throw a party in honor of this task completing.
-                # ...
+        Args:
+            reservation (Reservation): The reserved task
+        """
+        self.backend.ack(self.queue_name, reservation.receipt)
 
-            with gator.options(retries=2, on_success=party_time) as opts:
-                opts.task(increment, incr_by=2678)
+    def nack(self, reservation):
+        """
+        Places a reserved task straight back on the queue.
 
         Args:
-            kwargs (dict): Keyword arguments to control the task execution
+            reservation (Reservation): The reserved task
+        """
+        self.backend.nack(self.queue_name, reservation.receipt)
+
+    def reap(self):
+        """
+        Places any reserved tasks whose lease has run out (for instance,
+        because the worker died) back on the queue.
 
         Returns:
-            Options: An ``Options`` context manager instance
+            int: The number of tasks placed back on the queue
         """
-        return Options(self, **kwargs)
+        self.reaped_at = time.time()
+        reap = getattr(self.backend, "reap", None)
 
+        if reap is None:
+            return 0
 
-class Options(object):
-    def __init__(self, gator, **kwargs):
+        return reap(self.queue_name)
+
+    def save_result(self, task, err=None):
         """
-        A context manager for specifying task execution options.
+        Stores the outcome of a finished task in the ``Gator.result_store``
+        (if there is one).
 
-        Typically, you'd use ``Gator.options``, which creates this context
-        manager for you. You probably don't want to directly use this.
+        Called by ``Gator.execute`` once an async task has succeeded (or
+        failed for good).
 
         Args:
-            gator (Gator): A configured ``Gator`` instance.
-            **kwargs (dict): Keyword arguments to control the task execution
+            task (Task): The finished task
+            err (Exception): Optional. What the task raised, if it failed.
+                Default is `None`.
         """
-        self.gator = gator
-        self.task_kwargs = kwargs
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, type, value, traceback):
-        pass
+        if self.result_store is not None:
+            self.result_store.save(Result.from_task(task, err))
 
-    def task(self, func, *args, **kwargs):
+    def get_results(self, task_ids):
         """
-        Pushes a task onto the queue (with the specified options).
+        Fetches the results of many tasks at once (in a single round trip,
+        for the Redis & SQLite stores).
 
-        This will instantiate a ``Gator.task_class`` instance, configure the
-        task execution options, configure the callable & its arguments, then
-        push it onto the queue.
+        Ex::
 
-        You'll typically call this method when specifying advanced options.
+            tasks = gator.push_many(resize_image, image_ids)
+            results = gator.get_results(tasks)
+            done = [result.get() for result in results.values()]
 
         Args:
-            func (callable): The callable with business logic to execute
+            task_ids (list): The tasks (or their IDs)
+
+        Returns:
+            dict: ``{task_id: Result}``, for only the tasks that have
+                finished
+        """
+        if self.result_store is None:
+            raise NoResultStoreError("This Gator has no result store.")
+
+        return self.result_store.get_results(
+            [getattr(task_id, "task_id", task_id) for task_id in task_ids]
+        )
+
+    def complete(self, task):
+        """
+        Tells the backend a task has completed successfully, releasing any
+        parked tasks that were only waiting on it.
+
+        Called by ``Gator.execute`` (or ``Gator.process``, once a reserved
+        task is acknowledged). Does nothing for backends that can't park
+        tasks.
+
+        Args:
+            task (Task): The completed task
+
+        Returns:
+            int: The number of tasks released onto the queue
+        """
+        mark_complete = getattr(self.backend, "mark_complete", None)
+
+        if mark_complete is None:
+            return 0
+
+        return mark_complete(self.queue_name, task.task_id)
+
+    def flush(self):
+        """
+        Writes out any pushes the backend has buffered (for instance, the
+        SQLite backend with ``durability=batch``).
+
+        Does nothing for backends that don't buffer.
+        """
+        flush = getattr(self.backend, "flush", None)
+
+        if flush is not None:
+            flush()
+
+    def process(self, data):
+        """
+        Given the raw data for a task (as stored in the queue), deserializes
+        & runs it.
+
+        If the task was kept in the ``Gator.blob_store``, it's deleted from
+        there once the task has run (or been placed back on the queue for a
+        retry), unless it was moved to the ``Gator.dead_letter_queue``.
+
+        Tasks that can't be deserialized or have run out of retries are
+        moved to the ``Gator.dead_letter_queue`` as they were stored.
+
+        A ``Reservation`` is acknowledged once the task has run (even if
+        it failed, as ``Gator.execute`` has handled any retries by then).
+        If the worker is interrupted instead, it's placed straight back on
+        the queue.
+
+        Ex::
+
+            data = gator.fetch()[0]
+            finished_task = gator.process(data)
+
+        Args:
+            data (str|Reservation): The raw task data
+
+        Returns:
+            Task: The completed ``Task`` instance
+        """
+        reservation, data = _unwrap_reservation(data)
+
+        # Dead letters keep the data as it was stored, claim check & all,
+        # so the blob is only released if there isn't one.
+        release = True
+
+        try:
+            try:
+                task = self.load(data)
+            except Exception:
+                release = self.dead_letter_queue is None
+                raise
+
+            try:
+                task = self._execute(task)
+            except Exception as err:
+                if _failed_for_good(task):
+                    letter = self.dead_letter(data, err, task=task)
+                    release = letter is None
+
+                raise
+        except Exception:
+            if reservation is not None:
+                self.ack(reservation)
+
+            raise
+        except BaseException:
+            if reservation is not None:
+                # Back on the queue, so it still needs its blob.
+                release = False
+                self.nack(reservation)
+
+            raise
+        finally:
+            if release:
+                self.release(data)
+
+        if reservation is not None:
+            self.ack(reservation)
+
+        # Only once acknowledged, so tasks parked on this one meanwhile
+        # don't find it still reserved (& wait on it forever).
+        if task is not None:
+            self.complete(task)
+
+        return task
+
+    def get(self, task_id):
+        """
+        Gets a specific task, by ``task_id`` off the queue & runs it.
+
+        Using this is not as performant (because it has to search the queue),
+        but can be useful if you need to specifically handle a task
+        *right now*.
+
+        Ex::
+
+            # Tasks were previously added, maybe by a different process or
+            # machine...
+            finished_task = gator.get('a-specific-uuid-here')
+
+        Args:
+            task_id (str): The identifier of the task to process
+
+        Returns:
+            Task: The completed ``Task`` instance
+        """
+        data = self.backend.get(self.queue_name, task_id)
+
+        if data:
+            return self.process(data)
+
+    def cancel(self, task_id):
+        """
+        Takes an existing task & cancels it before it is processed.
+
+        Returns the canceled task, as that could be useful in creating a new
+        task.
+
+        Ex::
+
+            task = gator.task(add, 18, 9)
+
+            # Whoops, didn't mean to do that.
+            gator.cancel(task.task_id)
+
+        Args:
+            task_id (str): The identifier of the task to process
+
+        Returns:
+            Task: The canceled ``Task`` instance
+        """
+        data = self.backend.get(self.queue_name, task_id)
+
+        if data:
+            task = self.deserialize(data)
+            task.to_canceled()
+            self.release(data)
+            return task
+
+    def execute(self, task):
+        """
+        Given a task instance, this runs it.
+
+        This includes handling retries & re-raising exceptions. Async
+        tasks are placed back on the queue to be retried, delayed as their
+        ``Task.retry_policy`` decides.
+
+        Ex::
+
+            task = Task(is_async=False, retries=5)
+            task.to_call(add, 101, 35)
+            finished_task = gator.execute(task)
+
+        Args:
+            task_id (str): The identifier of the task to process
+
+        Returns:
+            Task: The completed ``Task`` instance
+        """
+        task = self._execute(task)
+
+        if task is not None:
+            self.complete(task)
+
+        return task
+
+    def _execute(self, task):
+        # Everything `Gator.execute` does, short of marking it complete.
+        try:
+            task.run()
+        except Exception as err:
+            if self._should_retry(task, err):
+                if task.is_async:
+                    push, args, kwargs = self._retry_call(task)
+                    task.task_id = push(*args, **kwargs)
+                    return
+                else:
+                    return self._execute(task)
+            else:
+                if task.is_async:
+                    self.save_result(task, err)
+
+                raise
+
+        if task.is_async:
+            self.save_result(task)
+
+        return task
+
+    def _should_retry(self, task, err):
+        # Counts the failed attempt & decides whether to run it again.
+        task.attempts += 1
+
+        if not task.should_retry(err):
+            return False
+
+        task.retries -= 1
+        task.to_retrying()
+        return True
+
+    def _retry_call(self, task):
+        # The backend ``push`` to place an async task back on the queue
+        # with (after any backoff), along with its arguments.
+        delay_until = task.schedule_retry()
+        args = (self.queue_name, task.task_id, self.serialize(task))
+        kwargs = dict(
+            delay_until=delay_until, **_priority_kwargs(task.priority)
+        )
+        return self.backend.push, args, kwargs
+
+    def task(self, func, *args, **kwargs):
+        """
+        Pushes a task onto the queue.
+
+        This will instantiate a ``Gator.task_class`` instance, configure
+        the callable & its arguments, then push it onto the queue.
+
+        You'll typically want to use either this method or the
+        ``Gator.options`` context manager (if you need to configure the
+        ``Task`` arguments, such as retries, is_async, task_id, etc.)
+
+        Ex::
+
+            on_queue = gator.task(increment, incr_by=2)
+
+        Args:
+            func (callable): The callable with business logic to execute
+            args (list): Positional arguments to pass to the callable task
+            kwargs (dict): Keyword arguments to pass to the callable task
+
+        Returns:
+            Task: The ``Task`` instance
+        """
+        task = self.task_class()
+        return self.push(task, func, *args, **kwargs)
+
+    def options(self, **kwargs):
+        """
+        Allows specifying advanced ``Task`` options to control how the task
+        runs.
+
+        This returns a context manager which will create ``Task`` instances
+        with the supplied options. See ``Task.__init__`` for the available
+        arguments.
+
+        Ex::
+
+            def party_time(task, result):
+                # Throw a party in honor of this task completing.
+                # ...
+
+            with gator.options(retries=2, on_success=party_time) as opts:
+                opts.task(increment, incr_by=2678)
+
+        Args:
+            kwargs (dict): Keyword arguments to control the task execution
+
+        Returns:
+            Options: An ``Options`` context manager instance
+        """
+        return Options(self, **kwargs)
+
+
+class Reservation(object):
+    def __init__(self, receipt, data):
+        """
+        A task reserved from the queue (see ``Gator.reserve``).
+
+        Args:
+            receipt (str): The backend's handle for acknowledging the task
+            data (str|bytes): The raw task data
+        """
+        self.receipt = receipt
+        self.data = data
+
+    def __repr__(self):
+        return "<Reservation: {}>".format(self.receipt)
+
+
+class Options(object):
+    def __init__(self, gator, **kwargs):
+        """
+        A context manager for specifying task execution options.
+
+        Typically, you'd use ``Gator.options``, which creates this context
+        manager for you. You probably don't want to directly use this.
+
+        Args:
+            gator (Gator): A configured ``Gator`` instance.
+            **kwargs (dict): Keyword arguments to control the task execution
+        """
+        self.gator = gator
+        self.task_kwargs = kwargs
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        pass
+
+    def task(self, func, *args, **kwargs):
+        """
+        Pushes a task onto the queue (with the specified options).
+
+        This will instantiate a ``Gator.task_class`` instance, configure the
+        task execution options, configure the callable & its arguments, then
+        push it onto the queue.
+
+        You'll typically call this method when specifying advanced options.
+
+        Args:
+            func (callable): The callable with business logic to execute
             args (list): Positional arguments to pass to the callable task
             kwargs (dict): Keyword arguments to pass to the callable task
 
@@ -323,3 +1141,600 @@ class Options(object):
         """
         task = self.gator.task_class(**self.task_kwargs)
         return self.gator.push(task, func, *args, **kwargs)
+
+    def task_many(self, func, iterable_of_args, batch_size=500):
+        """
+        Pushes many tasks for the same callable onto the queue (with the
+        specified options).
+
+        See ``Gator.push_many`` for how ``iterable_of_args`` is handled.
+
+        Ex::
+
+            with gator.options(retries=3) as opts:
+                opts.task_many(send_welcome_email, user_ids)
+
+        Args:
+            func (callable): The callable with business logic to execute
+            iterable_of_args (iterable): The arguments for each task
+            batch_size (int): Optional. The maximum number of tasks to send
+                to the backend at once. Defaults to `500`.
+
+        Returns:
+            list: The ``Task`` instances
+        """
+        return self.gator.push_many(
+            func, iterable_of_args, batch_size=batch_size, **self.task_kwargs
+        )
+
+
+class AsyncGator(Gator):
+    """
+    An ``asyncio``-native version of `Gator`.
+
+    All the methods that talk to the backend are coroutines, so enqueuing
+    tasks never blocks the event loop. The backend is an ``AsyncClient``
+    from the backend's module (rather than the blocking ``Client``).
+
+    Ex::
+
+        from alligator.gator import AsyncGator
+
+        gator = AsyncGator('redis://localhost:6379/0')
+
+        async def signup(request):
+            # ...
+            await gator.task(send_welcome_email, user.pk)
+
+            with gator.options(retries=3) as opts:
+                await opts.task(update_search_index, user.pk)
+
+    Tasks run by an ``AsyncGator`` may be ``async def`` functions, which
+    are awaited (see `Task.run_async`).
+    """
+
+    def build_backend(self, conn_string):
+        """
+        Given a DSN, returns an instantiated async backend class.
+
+        Args:
+            conn_string (str): A DSN for connecting to the queue. Passed along
+                to the backend.
+
+        Returns:
+            AsyncClient: A backend ``AsyncClient`` instance
+        """
+        backend_name, _ = conn_string.split(":", 1)
+        backend_path = "alligator.backends.{}_backend".format(backend_name)
+        client_class = import_attr(backend_path, "AsyncClient")
+        return client_class(conn_string)
+
+    async def len(self):
+        """
+        Returns the number of remaining queued tasks.
+
+        Returns:
+            int: A count of the remaining tasks
+        """
+        return await self.backend.len(self.queue_name)
+
+    async def push(self, task, func, *args, **kwargs):
+        """
+        Pushes a configured task onto the queue.
+
+        See `Gator.push`.
+
+        Args:
+            task (Task): A mostly-configured task
+            func (callable): The callable with business logic to execute
+            args (list): Positional arguments to pass to the callable task
+            kwargs (dict): Keyword arguments to pass to the callable task
+
+        Returns:
+            Task: The fleshed-out ``Task`` instance
+        """
+        task.to_call(func, *args, **kwargs)
+        task.result_store = self.result_store
+        data = self.serialize(task)
+
+        if task.is_async:
+            enqueue, call_args, call_kwargs = self._enqueue_call(task, data)
+            task.task_id = await enqueue(*call_args, **call_kwargs)
+        else:
+            await self.execute(task)
+
+        return task
+
+    async def push_many(
+        self, func, iterable_of_args, batch_size=500, **kwargs
+    ):
+        """
+        Pushes many tasks for the same callable onto the queue at once.
+
+        See `Gator.push_many`.
+
+        Args:
+            func (callable): The callable with business logic to execute
+            iterable_of_args (iterable): The arguments for each task
+            batch_size (int): Optional. The maximum number of tasks to send
+                to the backend at once. Defaults to `500`.
+            kwargs (dict): Keyword arguments used to instantiate each
+                ``Task`` (such as ``retries`` or ``delay_by``)
+
+        Returns:
+            list: The fleshed-out ``Task`` instances
+        """
+        tasks = []
+        batch = []
+
+        for task_args in iterable_of_args:
+            task = self._build_task(func, task_args, kwargs)
+            tasks.append(task)
+
+            if not task.is_async:
+                await self.execute(task)
+                continue
+
+            batch.append(task)
+
+            if len(batch) >= batch_size:
+                await self._push_batch(batch)
+                batch = []
+
+        if batch:
+            await self._push_batch(batch)
+
+        return tasks
+
+    async def _push_batch(self, tasks):
+        parked, batches = self._split_batch(tasks)
+
+        for task in parked:
+            park, args, kwargs = self._enqueue_call(task, self.serialize(task))
+            task.task_id = await park(*args, **kwargs)
+
+        push_many = getattr(self.backend, "push_many", None)
+
+        for prioritized, items, options in batches:
+            if push_many is not None:
+                task_ids = await push_many(self.queue_name, items, **options)
+            else:
+                task_ids = [
+                    await self.backend.push(
+                        self.queue_name,
+                        task_id,
+                        data,
+                        delay_until=delay_until,
+                        **options
+                    )
+                    for task_id, data, delay_until in items
+                ]
+
+            for task, task_id in zip(prioritized, task_ids):
+                task.task_id = task_id
+
+    async def pop(self):
+        """
+        Pops a task off the front of the queue & runs it.
+
+        Returns:
+            Task: The completed ``Task`` instance
+        """
+        if self.can_reserve():
+            reserved = await self.reserve()
+
+            if reserved:
+                return await self.process(reserved[0])
+
+            return None
+
+        data = await self.backend.pop(self.queue_name)
+
+        if data:
+            return await self.process(data)
+
+    async def fetch(self, count=1, timeout=None):
+        """
+        Pulls up to ``count`` tasks off the front of the queue *without*
+        running them.
+
+        See `Gator.fetch`.
+
+        Args:
+            count (int): Optional. The maximum number of tasks to fetch.
+                Defaults to `1`.
+            timeout (float): Optional. The maximum number of seconds to
+                wait for a task. Defaults to `None` (don't wait).
+
+        Returns:
+            list: The raw task data (or ``Reservation`` instances)
+        """
+        if self.can_reserve():
+            return await self.reserve(count)
+
+        if timeout and self.can_block():
+            return await self.backend.pop_blocking(
+                self.queue_name, timeout, count=count
+            )
+
+        pop_many = getattr(self.backend, "pop_many", None)
+
+        if count > 1 and pop_many is not None:
+            return await pop_many(self.queue_name, count)
+
+        fetched = []
+
+        while len(fetched) < count:
+            data = await self.backend.pop(self.queue_name)
+
+            if not data:
+                break
+
+            fetched.append(data)
+
+        return fetched
+
+    async def save_result(self, task, err=None):
+        """
+        Stores the outcome of a finished task in the ``Gator.result_store``
+        (if there is one).
+
+        See `Gator.save_result`. The store is called in the loop's default
+        executor.
+
+        Args:
+            task (Task): The finished task
+            err (Exception): Optional. What the task raised, if it failed.
+                Default is `None`.
+        """
+        if self.result_store is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self.result_store.save, Result.from_task(task, err)
+                ),
+            )
+
+    async def get_results(self, task_ids):
+        """
+        Fetches the results of many tasks at once.
+
+        See `Gator.get_results`.
+
+        Args:
+            task_ids (list): The tasks (or their IDs)
+
+        Returns:
+            dict: ``{task_id: Result}``, for only the tasks that have
+                finished
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(super(AsyncGator, self).get_results, task_ids),
+        )
+
+    async def complete(self, task):
+        """
+        Tells the backend a task has completed successfully.
+
+        See `Gator.complete`.
+
+        Args:
+            task (Task): The completed task
+
+        Returns:
+            int: The number of tasks released onto the queue
+        """
+        mark_complete = getattr(self.backend, "mark_complete", None)
+
+        if mark_complete is None:
+            return 0
+
+        return await mark_complete(self.queue_name, task.task_id)
+
+    async def flush(self):
+        """
+        Writes out any pushes the backend has buffered.
+
+        Does nothing for backends that don't buffer.
+        """
+        flush = getattr(self.backend, "flush", None)
+
+        if flush is not None:
+            await flush()
+
+    async def reserve(self, count=1):
+        """
+        Reserves up to ``count`` tasks off the front of the queue *without*
+        running them.
+
+        See `Gator.reserve`.
+
+        Args:
+            count (int): Optional. The maximum number of tasks to reserve.
+                Defaults to `1`.
+
+        Returns:
+            list: ``Reservation`` instances
+        """
+        if time.time() - self.reaped_at >= self.lease_time:
+            await self.reap()
+
+        reserved = await self.backend.reserve(
+            self.queue_name, count, self.lease_time
+        )
+        return [Reservation(receipt, data) for receipt, data in reserved]
+
+    async def ack(self, reservation):
+        """
+        Acknowledges a reserved task is done with, removing it for good.
+
+        Args:
+            reservation (Reservation): The reserved task
+        """
+        await self.backend.ack(self.queue_name, reservation.receipt)
+
+    async def nack(self, reservation):
+        """
+        Places a reserved task straight back on the queue.
+
+        Args:
+            reservation (Reservation): The reserved task
+        """
+        await self.backend.nack(self.queue_name, reservation.receipt)
+
+    async def reap(self):
+        """
+        Places any reserved tasks whose lease has run out back on the
+        queue.
+
+        Returns:
+            int: The number of tasks placed back on the queue
+        """
+        self.reaped_at = time.time()
+        reap = getattr(self.backend, "reap", None)
+
+        if reap is None:
+            return 0
+
+        return await reap(self.queue_name)
+
+    async def load(self, data):
+        """
+        Deserializes a task from the queue, moving the data to the
+        ``Gator.dead_letter_queue`` if it can't be deserialized.
+
+        See `Gator.load`.
+
+        Args:
+            data (str|bytes): The raw task data
+
+        Returns:
+            Task: The ``Task`` instance
+        """
+        try:
+            return self.deserialize(data)
+        except Exception as err:
+            await self.dead_letter(data, err)
+            raise
+
+    async def dead_letter(self, data, err, task=None):
+        """
+        Moves a task that can't be processed to the
+        ``Gator.dead_letter_queue``.
+
+        See `Gator.dead_letter`.
+
+        Args:
+            data (str|bytes): The raw task data. If `None`, the ``task``
+                is serialized instead.
+            err (Exception): What was raised
+            task (Task): Optional. The failed task. Default is `None`.
+
+        Returns:
+            DeadLetter: The stored dead letter (or `None`)
+        """
+        letter = self._build_dead_letter(data, err, task)
+
+        if letter is not None:
+            await self.backend.push(
+                self.dead_letter_queue,
+                letter.dead_letter_id,
+                letter.serialize(),
+            )
+
+        return letter
+
+    async def replay(self, count=None, batch_size=500):
+        """
+        Moves dead letters back onto the queue, to be processed again.
+
+        See `Gator.replay`.
+
+        Args:
+            count (int): Optional. The most dead letters to replay.
+                Defaults to `None` (all of them).
+            batch_size (int): Optional. The most dead letters to move at
+                once. Defaults to `500`.
+
+        Returns:
+            list: The replayed ``DeadLetter`` instances
+        """
+        replayed = []
+        pop_many = getattr(self.backend, "pop_many", None)
+        push_many = getattr(self.backend, "push_many", None)
+
+        while count is None or len(replayed) < count:
+            limit = self._replay_limit(count, len(replayed), batch_size)
+
+            if pop_many is not None:
+                fetched = await pop_many(self.dead_letter_queue, limit)
+            else:
+                data = await self.backend.pop(self.dead_letter_queue)
+                fetched = [data] if data else []
+
+            if not fetched:
+                break
+
+            letters, items = self._replay_items(fetched)
+
+            if push_many is not None:
+                await push_many(self.queue_name, items)
+            else:
+                for task_id, data, delay_until in items:
+                    await self.backend.push(self.queue_name, task_id, data)
+
+            replayed.extend(letters)
+
+        return replayed
+
+    async def process(self, data):
+        """
+        Given the raw data for a task (as stored in the queue), deserializes
+        & runs it.
+
+        See `Gator.process`.
+
+        Args:
+            data (str|Reservation): The raw task data
+
+        Returns:
+            Task: The completed ``Task`` instance
+        """
+        reservation, data = _unwrap_reservation(data)
+
+        release = True
+
+        try:
+            try:
+                task = await self.load(data)
+            except Exception:
+                release = self.dead_letter_queue is None
+                raise
+
+            try:
+                task = await self._execute(task)
+            except Exception as err:
+                if _failed_for_good(task):
+                    letter = await self.dead_letter(data, err, task=task)
+                    release = letter is None
+
+                raise
+        except Exception:
+            if reservation is not None:
+                await self.ack(reservation)
+
+            raise
+        except BaseException:
+            if reservation is not None:
+                release = False
+                await self.nack(reservation)
+
+            raise
+        finally:
+            if release:
+                self.release(data)
+
+        if reservation is not None:
+            await self.ack(reservation)
+
+        # Only once acknowledged, so tasks parked on this one meanwhile
+        # don't find it still reserved (& wait on it forever).
+        if task is not None:
+            await self.complete(task)
+
+        return task
+
+    async def get(self, task_id):
+        """
+        Gets a specific task, by ``task_id`` off the queue & runs it.
+
+        Args:
+            task_id (str): The identifier of the task to process
+
+        Returns:
+            Task: The completed ``Task`` instance
+        """
+        data = await self.backend.get(self.queue_name, task_id)
+
+        if data:
+            return await self.process(data)
+
+    async def cancel(self, task_id):
+        """
+        Takes an existing task & cancels it before it is processed.
+
+        Args:
+            task_id (str): The identifier of the task to process
+
+        Returns:
+            Task: The canceled ``Task`` instance
+        """
+        data = await self.backend.get(self.queue_name, task_id)
+
+        if data:
+            task = self.deserialize(data)
+            task.to_canceled()
+            self.release(data)
+            return task
+
+    async def execute(self, task):
+        """
+        Given a task instance, this runs it (via `Task.run_async`).
+
+        This includes handling retries & re-raising exceptions.
+
+        Args:
+            task (Task): The task to run
+
+        Returns:
+            Task: The completed ``Task`` instance
+        """
+        task = await self._execute(task)
+
+        if task is not None:
+            await self.complete(task)
+
+        return task
+
+    async def _execute(self, task):
+        # Everything `AsyncGator.execute` does, short of marking it complete.
+        try:
+            await task.run_async()
+        except Exception as err:
+            if self._should_retry(task, err):
+                if task.is_async:
+                    push, args, kwargs = self._retry_call(task)
+                    task.task_id = await push(*args, **kwargs)
+                    return
+                else:
+                    return await self._execute(task)
+            else:
+                if task.is_async:
+                    await self.save_result(task, err)
+
+                raise
+
+        if task.is_async:
+            await self.save_result(task)
+
+        return task
+
+    async def task(self, func, *args, **kwargs):
+        """
+        Pushes a task onto the queue.
+
+        See `Gator.task`.
+
+        Args:
+            func (callable): The callable with business logic to execute
+            args (list): Positional arguments to pass to the callable task
+            kwargs (dict): Keyword arguments to pass to the callable task
+
+        Returns:
+            Task: The ``Task`` instance
+        """
+        task = self.task_class()
+        return await self.push(task, func, *args, **kwargs)
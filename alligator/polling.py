@@ -0,0 +1,108 @@
+import random
+
+
+class FixedPolling(object):
+    def __init__(self, nap_time=0.1):
+        """
+        A polling strategy that always naps for the same amount of time when
+        the queue is empty.
+
+        Ex::
+
+            from alligator import Gator, Worker
+            from alligator.polling import FixedPolling
+
+            gator = Gator('sqlite:///tmp/queue.db')
+            worker = Worker(gator, poll_strategy=FixedPolling(0.5))
+
+        Args:
+            nap_time (float): Optional. The number of seconds to sleep when
+                no task was found. Defaults to `0.1`.
+        """
+        self.nap_time = nap_time
+
+    def reset(self):
+        """
+        Resets the strategy to its initial state.
+        """
+        pass
+
+    def next_nap(self, found):
+        """
+        Returns how long the worker should sleep before polling again.
+
+        Args:
+            found (bool): Whether the last poll found a task.
+
+        Returns:
+            float: The number of seconds to sleep.
+        """
+        if found:
+            return 0
+
+        return max(self.nap_time, 0)
+
+
+class BackoffPolling(object):
+    def __init__(self, initial=0.01, maximum=5.0, factor=2, jitter=True):
+        """
+        A polling strategy that backs off exponentially while the queue is
+        idle.
+
+        While tasks are flowing, the worker never sleeps. Each empty poll in
+        a row doubles (by default) the nap, up to ``maximum``. As soon as a
+        task is found, it resets. This lets many idle workers share a
+        backend without swamping it, while busy workers run at full speed.
+
+        Ex::
+
+            from alligator import Gator, Worker
+            from alligator.polling import BackoffPolling
+
+            gator = Gator('sqlite:///tmp/queue.db')
+            worker = Worker(gator, poll_strategy=BackoffPolling(maximum=2))
+
+        Args:
+            initial (float): Optional. The number of seconds to sleep after
+                the first empty poll. Defaults to `0.01`.
+            maximum (float): Optional. The most seconds to ever sleep.
+                Defaults to `5.0`.
+            factor (float): Optional. What to multiply the nap by after
+                each empty poll. Defaults to `2`.
+            jitter (bool): Optional. Whether to randomize each nap (between
+                half & all of it), so idle workers don't poll in lockstep.
+                Defaults to `True`.
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.current = self.initial
+
+    def reset(self):
+        """
+        Resets the nap back to ``initial``.
+        """
+        self.current = self.initial
+
+    def next_nap(self, found):
+        """
+        Returns how long the worker should sleep before polling again.
+
+        Args:
+            found (bool): Whether the last poll found a task.
+
+        Returns:
+            float: The number of seconds to sleep.
+        """
+        if found:
+            self.reset()
+            return 0
+
+        nap = self.current
+        self.current = min(self.current * self.factor, self.maximum)
+
+        if self.jitter:
+            nap = random.uniform(nap / 2, nap)
+
+        return nap
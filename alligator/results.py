@@ -0,0 +1,533 @@
+import collections
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from .constants import FAILED
+from .exceptions import ResultTooLargeError, TaskFailed
+from .polling import BackoffPolling
+from .utils import determine_module, determine_name
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+# How long (in seconds) results are kept.
+RESULT_TTL = 24 * 60 * 60
+# Serialized results larger than this (in bytes) are stored without their
+# value.
+MAX_RESULT_SIZE = 1024 * 1024
+# The most results the in-memory store keeps.
+MAX_RESULTS = 10000
+
+
+class Result(object):
+    def __init__(
+        self,
+        task_id,
+        status,
+        result=None,
+        error_class=None,
+        error=None,
+        finished_at=None,
+        too_large=False,
+    ):
+        """
+        The outcome of a finished task.
+
+        Args:
+            task_id (str): The task's ID
+            status (int): The task's final status (``SUCCESS`` or
+                ``FAILED``)
+            result: Optional. What the task returned. Default is `None`.
+            error_class (str): Optional. The dotted path of the exception
+                class raised, if the task failed. Default is `None`.
+            error (str): Optional. The exception's message. Default is
+                `None`.
+            finished_at (float): Optional. The Unix timestamp the task
+                finished at. Default is `None` (now).
+            too_large (bool): Optional. Whether the result was dropped for
+                being larger than the store's ``max_size``. Default is
+                `False`.
+        """
+        self.task_id = task_id
+        self.status = status
+        self.result = result
+        self.error_class = error_class
+        self.error = error
+        self.finished_at = finished_at
+        self.too_large = too_large
+
+        if self.finished_at is None:
+            self.finished_at = time.time()
+
+    def __repr__(self):
+        return "<Result: {} ({})>".format(self.task_id, self.status)
+
+    @classmethod
+    def from_task(cls, task, err=None):
+        """
+        Creates a result from a finished task.
+
+        Args:
+            task (Task): The task
+            err (Exception): Optional. What the task raised, if it failed.
+                Default is `None`.
+
+        Returns:
+            Result: The result
+        """
+        if err is None:
+            return cls(task.task_id, task.status, result=task.result)
+
+        error_class = type(err)
+        return cls(
+            task.task_id,
+            FAILED,
+            error_class="{}.{}".format(
+                determine_module(error_class), determine_name(error_class)
+            ),
+            error=str(err),
+        )
+
+    def get(self):
+        """
+        Returns what the task returned.
+
+        Raises ``TaskFailed`` if the task failed, or
+        ``ResultTooLargeError`` if the result was too large to store.
+
+        Returns:
+            The task's result
+        """
+        if self.status == FAILED:
+            raise TaskFailed(
+                "Task '{}' failed: {}: {}".format(
+                    self.task_id, self.error_class, self.error
+                )
+            )
+
+        if self.too_large:
+            raise ResultTooLargeError(
+                "The result of task '{}' was too large to store.".format(
+                    self.task_id
+                )
+            )
+
+        return self.result
+
+    def to_dict(self):
+        """
+        Returns the result as a dictionary, ready for serialization.
+
+        Returns:
+            dict: The result data
+        """
+        return {
+            "task_id": self.task_id,
+            "status": self.status,
+            "result": self.result,
+            "error_class": self.error_class,
+            "error": self.error,
+            "finished_at": self.finished_at,
+            "too_large": self.too_large,
+        }
+
+
+class ResultStore(object):
+    """
+    A base class for keeping the results of finished tasks, so whatever
+    pushed them can find out how they went (see `Task.wait`).
+
+    Results are stored as JSON, so task return values must be
+    JSON-serializable.
+
+    Subclasses need ``put``, ``get_many`` & ``wait`` methods.
+    """
+
+    def __init__(self, ttl=RESULT_TTL, max_size=MAX_RESULT_SIZE):
+        """
+        Args:
+            ttl (float): Optional. How long (in seconds) to keep each
+                result. Defaults to a day.
+            max_size (int): Optional. The largest (serialized, in bytes)
+                result to store. Larger ones are stored without their
+                value, so waiting on them raises ``ResultTooLargeError``.
+                Defaults to 1Mb.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+
+    def put(self, task_id, data):
+        """
+        Stores a serialized result.
+
+        Args:
+            task_id (str): The task's ID
+            data (bytes): The serialized result
+        """
+        raise NotImplementedError()
+
+    def get_many(self, task_ids):
+        """
+        Fetches many serialized results at once.
+
+        Args:
+            task_ids (list): The tasks' IDs
+
+        Returns:
+            dict: ``{task_id: data}``, for only the results found
+        """
+        raise NotImplementedError()
+
+    def wait(self, task_id, timeout=None):
+        """
+        Waits for a serialized result to arrive.
+
+        Args:
+            task_id (str): The task's ID
+            timeout (float): Optional. The most seconds to wait. Default is
+                `None` (wait forever).
+
+        Returns:
+            bytes: The serialized result, or `None` if it didn't arrive in
+                time
+        """
+        raise NotImplementedError()
+
+    def save(self, result):
+        """
+        Serializes & stores a result.
+
+        Args:
+            result (Result): The result
+        """
+        data = json.dumps(result.to_dict()).encode("utf-8")
+
+        if len(data) > self.max_size:
+            result = Result(
+                result.task_id,
+                result.status,
+                finished_at=result.finished_at,
+                too_large=True,
+            )
+            data = json.dumps(result.to_dict()).encode("utf-8")
+
+        self.put(result.task_id, data)
+
+    def load(self, data):
+        """
+        Rebuilds a result from its serialized form.
+
+        Args:
+            data (str|bytes): The serialized result
+
+        Returns:
+            Result: The result
+        """
+        return Result(**json.loads(data))
+
+    def get_results(self, task_ids):
+        """
+        Fetches many results at once.
+
+        Args:
+            task_ids (list): The tasks' IDs
+
+        Returns:
+            dict: ``{task_id: Result}``, for only the tasks that have
+                finished
+        """
+        found = self.get_many(list(task_ids))
+        return {task_id: self.load(data) for task_id, data in found.items()}
+
+    def wait_for(self, task_id, timeout=None):
+        """
+        Waits for a task's result.
+
+        Args:
+            task_id (str): The task's ID
+            timeout (float): Optional. The most seconds to wait. Default is
+                `None` (wait forever).
+
+        Returns:
+            Result: The result, or `None` if it didn't arrive in time
+        """
+        data = self.wait(task_id, timeout=timeout)
+
+        if data is not None:
+            return self.load(data)
+
+
+class LocmemResultStore(ResultStore):
+    # Results, oldest first, as ``{task_id: (expires_at, data)}``.
+    results = collections.OrderedDict()
+    # Guards the results & wakes up anything waiting on them.
+    condition = threading.Condition()
+
+    def __init__(self, max_results=MAX_RESULTS, **kwargs):
+        """
+        An in-memory ``ResultStore``. Useful for development & testing.
+
+        All instances share the same storage. Waiting is woken up as soon
+        as a result is saved.
+
+        Args:
+            max_results (int): Optional. The most results to keep. The
+                oldest are dropped first. Defaults to `10000`.
+            kwargs (dict): Optional. Any of the `ResultStore` arguments.
+        """
+        super(LocmemResultStore, self).__init__(**kwargs)
+        self.max_results = max_results
+
+    def put(self, task_id, data):
+        cls = self.__class__
+        now = time.time()
+
+        with cls.condition:
+            results = cls.results
+            results.pop(task_id, None)
+            results[task_id] = (now + self.ttl, data)
+
+            while results and (
+                len(results) > self.max_results
+                or next(iter(results.values()))[0] <= now
+            ):
+                results.popitem(last=False)
+
+            cls.condition.notify_all()
+
+    def _get(self, task_id, now):
+        stored = self.__class__.results.get(task_id)
+
+        if stored is not None and stored[0] > now:
+            return stored[1]
+
+    def get_many(self, task_ids):
+        now = time.time()
+        found = {}
+
+        with self.__class__.condition:
+            for task_id in task_ids:
+                data = self._get(task_id, now)
+
+                if data is not None:
+                    found[task_id] = data
+
+        return found
+
+    def wait(self, task_id, timeout=None):
+        with self.__class__.condition:
+            self.__class__.condition.wait_for(
+                lambda: self._get(task_id, time.time()) is not None,
+                timeout=timeout,
+            )
+            return self._get(task_id, time.time())
+
+
+class RedisResultStore(ResultStore):
+    def __init__(self, conn_string, **kwargs):
+        """
+        A Redis-based ``ResultStore``.
+
+        Each result expires after the ``ttl``. Waiting subscribes to a
+        channel the result is published on, so it doesn't poll.
+
+        Ex::
+
+            from alligator import Gator
+            from alligator.results import RedisResultStore
+
+            gator = Gator(
+                'redis://localhost:6379/0',
+                result_store=RedisResultStore('redis://localhost:6379/0'),
+            )
+
+        Args:
+            conn_string (str): The DSN. Should be of the format
+                ``redis://host:port/db``
+            kwargs (dict): Optional. Any of the `ResultStore` arguments.
+        """
+        if redis is None:
+            raise ImportError(
+                "The 'RedisResultStore' requires the 'redis' package."
+            )
+
+        super(RedisResultStore, self).__init__(**kwargs)
+        self.conn_string = conn_string
+        bits = urlparse(self.conn_string)
+        self.conn = self.get_connection(
+            host=bits.hostname,
+            port=bits.port,
+            db=bits.path.lstrip("/").split("/")[0],
+        )
+
+    def get_connection(self, host, port, db):
+        """
+        Returns a ``StrictRedis`` connection instance.
+        """
+        return redis.StrictRedis(
+            host=host, port=port, db=db, decode_responses=False
+        )
+
+    def _key(self, task_id):
+        return "result:{}".format(task_id)
+
+    def put(self, task_id, data):
+        key = self._key(task_id)
+        pipe = self.conn.pipeline(transaction=False)
+        pipe.set(key, data, ex=int(max(self.ttl, 1)))
+        pipe.publish(key, 1)
+        pipe.execute()
+
+    def get_many(self, task_ids):
+        if not task_ids:
+            return {}
+
+        values = self.conn.mget([self._key(task_id) for task_id in task_ids])
+        return {
+            task_id: data
+            for task_id, data in zip(task_ids, values)
+            if data is not None
+        }
+
+    def wait(self, task_id, timeout=None):
+        key = self._key(task_id)
+        pubsub = self.conn.pubsub(ignore_subscribe_messages=True)
+
+        try:
+            # Subscribe before checking, so a result saved in between isn't
+            # missed.
+            pubsub.subscribe(key)
+            data = self.conn.get(key)
+            deadline = None if timeout is None else time.time() + timeout
+
+            while data is None:
+                wait_for = 1.0
+
+                if deadline is not None:
+                    wait_for = deadline - time.time()
+
+                    if wait_for <= 0:
+                        break
+
+                if pubsub.get_message(timeout=wait_for) is not None:
+                    data = self.conn.get(key)
+
+            return data
+        finally:
+            pubsub.close()
+
+
+class SQLiteResultStore(ResultStore):
+    def __init__(self, conn_string, **kwargs):
+        """
+        A SQLite-based ``ResultStore``, keeping results in a
+        ``task_results`` table (created if needed).
+
+        SQLite can't notify other processes, so waiting polls (backing
+        off, up to a second between checks). Results saved by the same
+        process wake up waiters right away.
+
+        Args:
+            conn_string (str): The DSN. Should be of the format
+                ``sqlite:///path/to/db/file.db``
+            kwargs (dict): Optional. Any of the `ResultStore` arguments.
+        """
+        super(SQLiteResultStore, self).__init__(**kwargs)
+        self.conn_string = conn_string
+        self.path = self.conn_string.split("://", 1)[1].partition("?")[0]
+        self._local = threading.local()
+        self._condition = threading.Condition()
+        self.setup_tables()
+
+    @property
+    def conn(self):
+        """
+        Returns the ``sqlite3`` connection for the current thread.
+        """
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+
+        return conn
+
+    def setup_tables(self):
+        """
+        Creates the results table (& index), if needed.
+        """
+        with self.conn as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS `task_results` ("
+                "task_id TEXT PRIMARY KEY, "
+                "data BLOB, "
+                "expires_at REAL NOT NULL"
+                ")"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS `task_results_expires_at` "
+                "ON `task_results` (expires_at)"
+            )
+
+    def put(self, task_id, data):
+        now = time.time()
+
+        with self.conn as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO `task_results` "
+                "(task_id, data, expires_at) VALUES (?, ?, ?)",
+                [task_id, data, now + self.ttl],
+            )
+            conn.execute(
+                "DELETE FROM `task_results` WHERE expires_at <= ?", [now]
+            )
+
+        with self._condition:
+            self._condition.notify_all()
+
+    def get_many(self, task_ids):
+        now = time.time()
+        found = {}
+
+        # Stays under SQLite's limit on query parameters.
+        for offset in range(0, len(task_ids), 500):
+            chunk = task_ids[offset : offset + 500]
+            cur = self.conn.execute(
+                "SELECT task_id, data FROM `task_results` "
+                "WHERE expires_at > ? AND task_id IN ({})".format(
+                    ", ".join("?" * len(chunk))
+                ),
+                [now] + chunk,
+            )
+            found.update(cur.fetchall())
+
+        self.conn.commit()
+        return found
+
+    def wait(self, task_id, timeout=None):
+        polling = BackoffPolling(maximum=1.0)
+        deadline = None if timeout is None else time.time() + timeout
+
+        while True:
+            data = self.get_many([task_id]).get(task_id)
+
+            if data is not None:
+                return data
+
+            nap = polling.next_nap(False)
+
+            if deadline is not None:
+                nap = min(nap, deadline - time.time())
+
+                if nap <= 0:
+                    return None
+
+            with self._condition:
+                self._condition.wait(nap)
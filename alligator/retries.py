@@ -0,0 +1,219 @@
+import random
+
+from .exceptions import UnknownRetryPolicyError
+from .utils import determine_module, determine_name, import_attr
+
+
+class RetryPolicy(object):
+    """
+    A base class for deciding when (& whether) a failed task gets retried.
+
+    Subclasses need a unique ``name``, a ``next_delay`` method & to list
+    any extra settings (beyond ``max_delay`` & ``retry_on``) in
+    ``settings``, so the policy can be serialized along with the task.
+    """
+
+    name = None
+    settings = ()
+
+    def __init__(self, max_delay=300, retry_on=None):
+        """
+        Args:
+            max_delay (float): Optional. The most seconds to ever wait
+                before a retry. Defaults to `300`.
+            retry_on (list): Optional. The exception classes worth retrying.
+                Any other exception fails the task right away. Defaults to
+                `None` (retry on any exception).
+        """
+        self.max_delay = max_delay
+        self.retry_on = tuple(retry_on or ())
+
+    def should_retry(self, err):
+        """
+        Returns whether a failure is worth retrying.
+
+        Args:
+            err (Exception): What the task raised
+
+        Returns:
+            bool: `True` if the task should be retried
+        """
+        if not self.retry_on:
+            return True
+
+        return isinstance(err, self.retry_on)
+
+    def next_delay(self, attempts, previous=None):
+        """
+        Returns how long to wait before the next retry.
+
+        Args:
+            attempts (int): How many times the task has failed so far
+                (including this one)
+            previous (float): Optional. The delay before the last retry.
+                Default is `None` (this is the first retry).
+
+        Returns:
+            float: The number of seconds to wait
+        """
+        raise NotImplementedError()
+
+    def to_dict(self):
+        """
+        Returns the policy as a dictionary, ready for serialization.
+
+        Returns:
+            dict: The policy data
+        """
+        data = {
+            "name": self.name,
+            "max_delay": self.max_delay,
+        }
+
+        for setting in self.settings:
+            data[setting] = getattr(self, setting)
+
+        if self.retry_on:
+            data["retry_on"] = [
+                [determine_module(exc_class), determine_name(exc_class)]
+                for exc_class in self.retry_on
+            ]
+
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a policy from `RetryPolicy.to_dict`.
+
+        Args:
+            data (dict): The policy data
+
+        Returns:
+            RetryPolicy: The policy instance
+        """
+        kwargs = dict(data)
+        kwargs.pop("name", None)
+        kwargs["retry_on"] = [
+            import_attr(module, name)
+            for module, name in kwargs.get("retry_on") or []
+        ]
+        return cls(**kwargs)
+
+
+class FixedBackoff(RetryPolicy):
+    name = "fixed"
+    settings = ("delay",)
+
+    def __init__(self, delay=1, **kwargs):
+        """
+        Waits the same amount of time before every retry.
+
+        Ex::
+
+            with gator.options(retries=3, retry_policy=FixedBackoff(5)) as opts:
+                opts.task(fetch_feed, feed.pk)
+
+        Args:
+            delay (float): Optional. The number of seconds to wait. Defaults
+                to `1`.
+            kwargs (dict): Optional. Any of the `RetryPolicy` arguments.
+        """
+        super(FixedBackoff, self).__init__(**kwargs)
+        self.delay = delay
+
+    def next_delay(self, attempts, previous=None):
+        return min(self.delay, self.max_delay)
+
+
+class ExponentialBackoff(RetryPolicy):
+    name = "exponential"
+    settings = ("base", "factor", "jitter")
+
+    def __init__(self, base=1, factor=2, jitter=False, **kwargs):
+        """
+        Multiplies the wait by ``factor`` after each failure, up to
+        ``max_delay``.
+
+        Ex::
+
+            policy = ExponentialBackoff(base=2, max_delay=600)
+
+            with gator.options(retries=8, retry_policy=policy) as opts:
+                opts.task(sync_account, account.pk)
+
+        Args:
+            base (float): Optional. The number of seconds to wait before
+                the first retry. Defaults to `1`.
+            factor (float): Optional. What to multiply the wait by after
+                each failure. Defaults to `2`.
+            jitter (bool): Optional. Whether to randomize each wait
+                (anywhere up to the full wait), so tasks that failed
+                together don't all retry together. Defaults to `False`.
+            kwargs (dict): Optional. Any of the `RetryPolicy` arguments.
+        """
+        super(ExponentialBackoff, self).__init__(**kwargs)
+        self.base = base
+        self.factor = factor
+        self.jitter = jitter
+
+    def next_delay(self, attempts, previous=None):
+        delay = min(
+            self.base * self.factor ** max(attempts - 1, 0), self.max_delay
+        )
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+
+class DecorrelatedJitter(RetryPolicy):
+    name = "decorrelated"
+    settings = ("base",)
+
+    def __init__(self, base=1, **kwargs):
+        """
+        Picks each wait at random, between ``base`` & three times the
+        previous wait (up to ``max_delay``).
+
+        Grows about as quickly as exponential backoff, but spreads retries
+        out, so a failing service isn't hit by waves of them.
+
+        Args:
+            base (float): Optional. The shortest wait, in seconds. Defaults
+                to `1`.
+            kwargs (dict): Optional. Any of the `RetryPolicy` arguments.
+        """
+        super(DecorrelatedJitter, self).__init__(**kwargs)
+        self.base = base
+
+    def next_delay(self, attempts, previous=None):
+        previous = previous or self.base
+        return min(self.max_delay, random.uniform(self.base, previous * 3))
+
+
+POLICIES = [FixedBackoff, ExponentialBackoff, DecorrelatedJitter]
+
+
+def get_retry_policy(data):
+    """
+    Returns a retry policy instance from its serialized form.
+
+    Args:
+        data (dict|RetryPolicy): Data from `RetryPolicy.to_dict` or an
+            already-instantiated policy. `None` is passed through.
+
+    Returns:
+        RetryPolicy: The policy instance
+    """
+    if data is None or isinstance(data, RetryPolicy):
+        return data
+
+    for policy_class in POLICIES:
+        if data.get("name") == policy_class.name:
+            return policy_class.from_dict(data)
+
+    raise UnknownRetryPolicyError(
+        "Unknown retry policy '{}'.".format(data.get("name"))
+    )
@@ -0,0 +1,611 @@
+import datetime
+import heapq
+import itertools
+import logging
+import math
+import os
+import signal
+import socket
+import time
+import uuid
+
+from .utils import determine_module, determine_name
+
+
+# The lock schedulers take, so only one enqueues tasks at a time.
+LOCK_NAME = "alligator:beat"
+# How long (in seconds) the lock is held without being renewed.
+LOCK_TIMEOUT = 30
+# The longest (in seconds) a scheduler sleeps before checking back in.
+MAX_NAP = 1.0
+
+# Shortcuts for common cron expressions.
+CRON_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+# The name & allowed range of each cron field.
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+
+class Interval(object):
+    def __init__(self, seconds, anchor=0):
+        """
+        A schedule that fires every ``seconds``.
+
+        Run times are multiples of ``seconds`` from the ``anchor``, rather
+        than from whenever the last run happened, so they never drift
+        (& every scheduler agrees on them).
+
+        Ex::
+
+            # Every 5 minutes, on the 5 minute mark.
+            Interval(60 * 5)
+
+        Args:
+            seconds (float|timedelta): How often to fire
+            anchor (float): Optional. A Unix timestamp the runs line up
+                with. Defaults to `0` (the epoch).
+        """
+        if isinstance(seconds, datetime.timedelta):
+            seconds = seconds.total_seconds()
+
+        if seconds <= 0:
+            raise ValueError("Intervals must be positive.")
+
+        self.seconds = seconds
+        self.anchor = anchor
+
+    def __repr__(self):
+        return "<Interval: {}s>".format(self.seconds)
+
+    def next_after(self, timestamp):
+        """
+        Returns the first run time after ``timestamp``.
+
+        Args:
+            timestamp (float): A Unix timestamp
+
+        Returns:
+            float: The next run time (a Unix timestamp)
+        """
+        runs = math.floor((timestamp - self.anchor) / self.seconds) + 1
+        return self.anchor + runs * self.seconds
+
+
+class Crontab(object):
+    def __init__(self, expression, utc=False):
+        """
+        A schedule that fires at the times matched by a cron expression.
+
+        Supports the usual five fields (minute, hour, day of month, month &
+        day of week), with ``*``, lists (``1,15``), ranges (``1-5``) &
+        steps (``*/10``), as well as ``@hourly``/``@daily``/etc. As with
+        cron, if both the day of month & day of week are restricted, a day
+        matching either fires.
+
+        Ex::
+
+            # 3:30am, Monday through Friday.
+            Crontab("30 3 * * 1-5")
+
+        Args:
+            expression (str): The cron expression
+            utc (bool): Optional. Whether the expression is in UTC, rather
+                than local time. Defaults to `False`.
+        """
+        self.expression = expression
+        self.utc = utc
+        fields = CRON_ALIASES.get(expression.strip(), expression).split()
+
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(
+                "Cron expressions need {} fields, got '{}'.".format(
+                    len(CRON_FIELDS), expression
+                )
+            )
+
+        parsed = [
+            self.parse_field(field, low, high)
+            for field, (_, low, high) in zip(fields, CRON_FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Both ``0`` & ``7`` are Sunday.
+        self.weekdays = set(day % 7 for day in weekdays)
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def __repr__(self):
+        return "<Crontab: {}>".format(self.expression)
+
+    @staticmethod
+    def parse_field(field, low, high):
+        """
+        Returns the set of values a cron field matches.
+
+        Args:
+            field (str): The field (ex. ``*/15`` or ``1-5``)
+            low (int): The smallest allowed value
+            high (int): The largest allowed value
+
+        Returns:
+            set: The matching values
+        """
+        values = set()
+
+        for part in field.split(","):
+            part, _, step_text = part.partition("/")
+            step = int(step_text) if step_text else 1
+
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = [int(bit) for bit in part.split("-", 1)]
+            else:
+                start = int(part)
+                # ``5/10`` means every 10, starting at 5.
+                end = high if step_text else start
+
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(
+                    "Invalid cron field '{}' (values must be {}-{}).".format(
+                        field, low, high
+                    )
+                )
+
+            values.update(range(start, end + 1, step))
+
+        return values
+
+    def matches_day(self, when):
+        """
+        Returns whether a date matches the day of month & day of week.
+
+        Args:
+            when (datetime): The date
+
+        Returns:
+            bool: `True` if it matches
+        """
+        day = when.day in self.days
+        # ``isoweekday`` has Sunday as ``7``.
+        weekday = when.isoweekday() % 7 in self.weekdays
+
+        if self.any_day:
+            return weekday
+
+        if self.any_weekday:
+            return day
+
+        return day or weekday
+
+    def next_after(self, timestamp):
+        """
+        Returns the first run time after ``timestamp``.
+
+        Args:
+            timestamp (float): A Unix timestamp
+
+        Returns:
+            float: The next run time (a Unix timestamp)
+        """
+        if self.utc:
+            when = datetime.datetime.fromtimestamp(
+                timestamp, datetime.timezone.utc
+            ).replace(tzinfo=None)
+        else:
+            when = datetime.datetime.fromtimestamp(timestamp)
+
+        when = when.replace(second=0, microsecond=0)
+        when += datetime.timedelta(minutes=1)
+
+        # Skips ahead a month/day/hour at a time where they can't match, so
+        # this takes at most a few thousand steps.
+        for _ in range(10000):
+            if when.month not in self.months:
+                year, month = divmod(when.month, 12)
+                when = when.replace(
+                    year=when.year + year,
+                    month=month + 1,
+                    day=1,
+                    hour=0,
+                    minute=0,
+                )
+            elif not self.matches_day(when):
+                when = when.replace(hour=0, minute=0)
+                when += datetime.timedelta(days=1)
+            elif when.hour not in self.hours:
+                when = when.replace(minute=0)
+                when += datetime.timedelta(hours=1)
+            elif when.minute not in self.minutes:
+                when += datetime.timedelta(minutes=1)
+            elif self.utc:
+                return float(
+                    (when - datetime.datetime(1970, 1, 1)).total_seconds()
+                )
+            else:
+                return time.mktime(when.timetuple())
+
+        raise ValueError(
+            "The cron expression '{}' never fires.".format(self.expression)
+        )
+
+
+class Periodic(object):
+    def __init__(self, schedule, func, args=None, kwargs=None, options=None):
+        """
+        A task the `Scheduler` pushes on a schedule.
+
+        Args:
+            schedule (Interval|Crontab): When to push the task. Anything
+                with a ``next_after(timestamp)`` method works.
+            func (callable): The callable with business logic to execute
+            args (list): Optional. Positional arguments to pass to the
+                callable. Default is `None`.
+            kwargs (dict): Optional. Keyword arguments to pass to the
+                callable. Default is `None`.
+            options (dict): Optional. Keyword arguments used to instantiate
+                each ``Task`` (such as ``retries``). Default is `None`.
+        """
+        self.schedule = schedule
+        self.func = func
+        self.args = args or ()
+        self.kwargs = kwargs or {}
+        self.options = options or {}
+        self.name = "{}.{}".format(
+            determine_module(func), determine_name(func)
+        )
+
+    def __repr__(self):
+        return "<Periodic: {} ({!r})>".format(self.name, self.schedule)
+
+
+# Periodic tasks added via the `periodic` decorator.
+registry = []
+
+
+def periodic(schedule, **options):
+    """
+    A decorator that adds a function to the periodic tasks every
+    `Scheduler` runs.
+
+    Ex::
+
+        from alligator.schedules import Crontab, periodic
+
+        @periodic(Crontab("0 3 * * *"), retries=2)
+        def clear_expired_sessions():
+            # ...
+
+    Args:
+        schedule (Interval|Crontab): When to push the task
+        options (dict): Keyword arguments used to instantiate each ``Task``
+            (such as ``retries``)
+
+    Returns:
+        callable: The decorator
+    """
+
+    def decorator(func):
+        registry.append(Periodic(schedule, func, options=options))
+        return func
+
+    return decorator
+
+
+class Scheduler(object):
+    def __init__(
+        self,
+        gator,
+        entries=None,
+        lock_name=LOCK_NAME,
+        lock_timeout=LOCK_TIMEOUT,
+        log_level=logging.INFO,
+    ):
+        """
+        Pushes tasks on a schedule (like ``cron``), via `Gator.push`.
+
+        Upcoming runs are kept in a heap, so the scheduler only wakes up
+        when something's due. Run times come from the schedule itself (not
+        from when the last run happened), so small delays never add up. If
+        it falls behind (say, after a pause), missed runs are pushed once
+        rather than all at once.
+
+        To run a standby scheduler (or several), every scheduler takes a
+        lock in the backend & only the one holding it pushes tasks. The
+        others keep their schedules up to date, so can take over right
+        away if the lock isn't renewed within ``lock_timeout``. Backends
+        without locks (SQS) always push, so only run one scheduler there.
+
+        Ex::
+
+            from alligator import Gator
+            from alligator.schedules import Crontab, Interval, Scheduler
+
+            gator = Gator('redis://localhost:6379/0')
+            scheduler = Scheduler(gator)
+            scheduler.add(Interval(60), check_feeds)
+            scheduler.add(Crontab("0 3 * * *"), send_digest, args=["daily"])
+            scheduler.run_forever()
+
+        Args:
+            gator (Gator): A configured `Gator` object
+            entries (list): Optional. `Periodic` tasks to run. Defaults to
+                `None` (those added via the `periodic` decorator).
+            lock_name (str): Optional. The name of the leader lock. Defaults
+                to ``alligator:beat``.
+            lock_timeout (float): Optional. How long (in seconds) the lock is
+                held without being renewed. Defaults to `30`.
+            log_level (int): Optional. The logging level you'd like for
+                output. Default is `logging.INFO`.
+        """
+        self.gator = gator
+        self.lock_name = lock_name
+        self.lock_timeout = lock_timeout
+        self.owner = "{}:{}:{}".format(
+            socket.gethostname(), os.getpid(), uuid.uuid4().hex[:8]
+        )
+        self.is_leader = False
+        self.locked_at = 0
+        self.keep_running = False
+        self.log_level = log_level
+        self.log = self.get_log(self.log_level)
+        self.heap = []
+        self.counter = itertools.count()
+
+        if entries is None:
+            entries = registry
+
+        for entry in entries:
+            self.schedule(entry)
+
+    def get_log(self, log_level=logging.INFO):
+        """
+        Sets up logging for the instance.
+
+        Args:
+            log_level (int): Optional. The logging level you'd like for
+                output. Default is `logging.INFO`.
+
+        Returns:
+            logging.Logger: The log instance.
+        """
+        log = logging.getLogger(__name__)
+        default_format = logging.Formatter(
+            "%(asctime)s %(name)s %(levelname)s %(message)s"
+        )
+        stdout_handler = logging.StreamHandler()
+        stdout_handler.setFormatter(default_format)
+        log.addHandler(stdout_handler)
+        log.setLevel(log_level)
+        return log
+
+    def ident(self):
+        """
+        Returns a string identifier for the scheduler.
+
+        Used in the printed messages & includes the process ID.
+        """
+        return "Alligator Scheduler (#{})".format(os.getpid())
+
+    def add(self, schedule, func, args=None, kwargs=None, **options):
+        """
+        Adds a periodic task.
+
+        Args:
+            schedule (Interval|Crontab): When to push the task
+            func (callable): The callable with business logic to execute
+            args (list): Optional. Positional arguments to pass to the
+                callable. Default is `None`.
+            kwargs (dict): Optional. Keyword arguments to pass to the
+                callable. Default is `None`.
+            options (dict): Optional. Keyword arguments used to instantiate
+                each ``Task`` (such as ``retries``)
+
+        Returns:
+            Periodic: The periodic task
+        """
+        entry = Periodic(
+            schedule, func, args=args, kwargs=kwargs, options=options
+        )
+        self.schedule(entry)
+        return entry
+
+    def schedule(self, entry, after=None):
+        """
+        Places a periodic task in the heap, at its next run time.
+
+        Args:
+            entry (Periodic): The periodic task
+            after (float): Optional. The Unix timestamp to find the next run
+                after. Default is `None` (now).
+        """
+        if after is None:
+            after = time.time()
+
+        run_at = entry.schedule.next_after(after)
+        # The counter breaks ties, keeping the heap stable.
+        heapq.heappush(self.heap, (run_at, next(self.counter), entry))
+
+    def next_run(self):
+        """
+        Returns when the next periodic task is due.
+
+        Returns:
+            float: The Unix timestamp, or `None` if there's nothing scheduled
+        """
+        if self.heap:
+            return self.heap[0][0]
+
+    def acquire_lock(self):
+        """
+        Takes (or renews) the leader lock in the backend.
+
+        Returns:
+            bool: `True` if this scheduler should push tasks
+        """
+        acquire_lock = getattr(self.gator.backend, "acquire_lock", None)
+
+        if acquire_lock is None:
+            return True
+
+        is_leader = acquire_lock(self.lock_name, self.owner, self.lock_timeout)
+
+        if is_leader != self.is_leader:
+            self.log.info(
+                "{} {} the lock.".format(
+                    self.ident(), "took" if is_leader else "lost"
+                )
+            )
+
+        return is_leader
+
+    def release_lock(self):
+        """
+        Gives up the leader lock, so a standby can take over right away.
+        """
+        release_lock = getattr(self.gator.backend, "release_lock", None)
+
+        if release_lock is not None and self.is_leader:
+            release_lock(self.lock_name, self.owner)
+
+        self.is_leader = False
+
+    def push(self, entry):
+        """
+        Pushes a periodic task onto the queue.
+
+        Args:
+            entry (Periodic): The periodic task
+
+        Returns:
+            Task: The pushed ``Task`` instance
+        """
+        task = self.gator.task_class(**entry.options)
+        return self.gator.push(task, entry.func, *entry.args, **entry.kwargs)
+
+    def tick(self, now=None):
+        """
+        Pushes any periodic tasks that are due & schedules their next runs.
+
+        Only the scheduler holding the lock pushes tasks. The lock is
+        renewed (or taken) every third of the ``lock_timeout``.
+
+        Args:
+            now (float): Optional. The current Unix timestamp. Default is
+                `None` (look it up).
+
+        Returns:
+            int: The number of tasks pushed
+        """
+        if now is None:
+            now = time.time()
+
+        if now - self.locked_at >= self.lock_timeout / 3:
+            self.is_leader = self.acquire_lock()
+            self.locked_at = now
+
+        pushed = 0
+
+        while self.heap and self.heap[0][0] <= now:
+            run_at, _, entry = heapq.heappop(self.heap)
+
+            if self.is_leader:
+                try:
+                    task = self.push(entry)
+                    pushed += 1
+                    self.log.info(
+                        "{} pushed {} ({}).".format(
+                            self.ident(), entry.name, task.task_id
+                        )
+                    )
+                except Exception as err:
+                    self.log.exception(err)
+
+            # Any other runs missed by now are skipped.
+            self.schedule(entry, after=now)
+
+        return pushed
+
+    def next_nap(self, now=None):
+        """
+        Returns how long to sleep before the next tick.
+
+        Args:
+            now (float): Optional. The current Unix timestamp. Default is
+                `None` (look it up).
+
+        Returns:
+            float: The number of seconds to sleep
+        """
+        if now is None:
+            now = time.time()
+
+        nap = min(MAX_NAP, self.lock_timeout / 3)
+
+        if self.heap:
+            nap = min(nap, self.heap[0][0] - now)
+
+        return max(nap, 0)
+
+    def starting(self):
+        """
+        Prints a startup message to stdout.
+        """
+        self.keep_running = True
+        self.log.info(
+            "{} starting with {} periodic tasks.".format(
+                self.ident(), len(self.heap)
+            )
+        )
+
+    def interrupt(self):
+        """
+        Prints an interrupt message to stdout.
+        """
+        self.keep_running = False
+        self.log.info("{} saw interrupt.".format(self.ident()))
+
+    def stopping(self):
+        """
+        Gives up the lock & prints a shutdown message to stdout.
+        """
+        self.keep_running = False
+        self.release_lock()
+        self.log.info("{} shutting down.".format(self.ident()))
+
+    def run_forever(self):
+        """
+        Pushes periodic tasks until interrupted.
+
+        Both `SIGINT` & `SIGTERM` stop the scheduler.
+        """
+        self.starting()
+
+        def handle(signum, frame):
+            self.interrupt()
+
+        signal.signal(signal.SIGINT, handle)
+        signal.signal(signal.SIGTERM, handle)
+
+        while self.keep_running:
+            try:
+                self.tick()
+            except Exception as err:
+                self.log.exception(err)
+
+            time.sleep(self.next_nap())
+
+        self.stopping()
+        return 0
@@ -0,0 +1,395 @@
+import json
+import marshal
+
+from .compressors import COMPRESS_THRESHOLD, get_compressor
+from .exceptions import MissingBlobError, UnknownSerializerError
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Starts every payload with a header. A JSON document never begins with
+# this byte, so older (headerless) JSON payloads can still be read.
+MAGIC = b"\xa7"
+# The magic byte, the serializer's format byte & a byte of flags.
+HEADER_SIZE = 3
+# The low bits of the flags hold the compressor's flag (if compressed).
+COMPRESSION_MASK = 0x0F
+# Flags a claim check, whose body is the key of a payload in a blob store.
+BLOB_FLAG = 0x10
+# Flags a split payload, whose head (everything but `BODY_FIELDS`) is
+# serialized separately, ahead of the body, so it can be decoded alone.
+SPLIT_FLAG = 0x20
+# The size of the (big-endian) length written before a split payload's head.
+HEAD_LENGTH_SIZE = 4
+
+# The fields of a task, in the order they're packed by compact serializers.
+FIELDS = (
+    "task_id",
+    "retries",
+    "is_async",
+    "module",
+    "callable",
+    "args",
+    "kwargs",
+    "options",
+)
+# The fields kept out of a split payload's head.
+BODY_FIELDS = ("args", "kwargs")
+HOOKS = ("on_start", "on_success", "on_error")
+
+
+class Serializer(object):
+    """
+    A base class for turning task data into bytes (& back).
+
+    Subclasses need a unique ``name`` & ``format_id`` (a single byte,
+    written to the payload header), as well as ``dumps`` & ``loads``
+    methods.
+    """
+
+    name = None
+    format_id = None
+
+    def dumps(self, data):
+        """
+        Serializes the task data.
+
+        Args:
+            data (dict): The task data (see `Task.to_dict`)
+
+        Returns:
+            bytes: The serialized data
+        """
+        raise NotImplementedError()
+
+    def loads(self, raw):
+        """
+        Deserializes the task data.
+
+        Args:
+            raw (bytes): The serialized data
+
+        Returns:
+            dict: The task data
+        """
+        raise NotImplementedError()
+
+    def compact(self, data):
+        """
+        Converts the task data into a list, in `FIELDS` order, so the keys
+        aren't repeated in every payload.
+
+        Args:
+            data (dict): The task data
+
+        Returns:
+            list: The task values
+        """
+        options = dict(data.get("options", {}))
+
+        for hook in HOOKS:
+            if options.get(hook):
+                options[hook] = [
+                    options[hook]["module"],
+                    options[hook]["callable"],
+                ]
+
+        values = [data.get(field) for field in FIELDS]
+        values[-1] = options
+        return values
+
+    def expand(self, values):
+        """
+        Converts a list from `Serializer.compact` back into the task data.
+
+        Args:
+            values (list): The task values
+
+        Returns:
+            dict: The task data
+        """
+        data = dict(zip(FIELDS, values))
+        options = data.get("options") or {}
+
+        for hook in HOOKS:
+            if options.get(hook):
+                module, name = options[hook]
+                options[hook] = {"module": module, "callable": name}
+
+        data["options"] = options
+        return data
+
+
+class JSONSerializer(Serializer):
+    """
+    Serializes tasks as (UTF-8 encoded) JSON.
+
+    Larger than the binary formats, but human-readable.
+    """
+
+    name = "json"
+    format_id = 1
+
+    def dumps(self, data):
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, raw):
+        return json.loads(raw)
+
+
+class MarshalSerializer(Serializer):
+    """
+    Serializes tasks with the (stdlib) ``marshal`` module, using a compact
+    layout.
+
+    Fast & needs no dependencies, but all the workers must run the same
+    version of Python. As with ``pickle``, only consume queues you trust.
+    """
+
+    name = "marshal"
+    format_id = 2
+
+    def dumps(self, data):
+        return marshal.dumps(self.compact(data))
+
+    def loads(self, raw):
+        return self.expand(marshal.loads(raw))
+
+
+class MsgpackSerializer(Serializer):
+    """
+    Serializes tasks with MessagePack, using a compact layout.
+
+    Requires the ``msgpack`` package.
+    """
+
+    name = "msgpack"
+    format_id = 3
+
+    def __init__(self):
+        if msgpack is None:
+            raise UnknownSerializerError(
+                "The 'msgpack' serializer requires the 'msgpack' package."
+            )
+
+    def dumps(self, data):
+        return msgpack.packb(self.compact(data), use_bin_type=True)
+
+    def loads(self, raw):
+        return self.expand(msgpack.unpackb(raw, raw=False))
+
+
+SERIALIZERS = [JSONSerializer, MarshalSerializer, MsgpackSerializer]
+
+
+def get_serializer(serializer):
+    """
+    Returns a serializer instance.
+
+    Ex::
+
+        serializer = get_serializer('msgpack')
+
+    Args:
+        serializer (str|int|Serializer): A serializer's name, format byte or
+            an already-instantiated serializer. `None` is passed through.
+
+    Returns:
+        Serializer: The serializer instance
+    """
+    if serializer is None or isinstance(serializer, Serializer):
+        return serializer
+
+    for serializer_class in SERIALIZERS:
+        if serializer in (serializer_class.name, serializer_class.format_id):
+            return serializer_class()
+
+    raise UnknownSerializerError("Unknown serializer '{}'.".format(serializer))
+
+
+def dumps(
+    data,
+    serializer,
+    compressor=None,
+    compress_threshold=COMPRESS_THRESHOLD,
+    flags=0,
+):
+    """
+    Serializes task data, prefixed by a header describing the format.
+
+    The payload is split: the task's ID, retries, callable & options (the
+    head) are serialized on their own, ahead of the arguments (the body),
+    so `loads_head` can read them without decoding (or decompressing) the
+    rest. Only the body is compressed.
+
+    Args:
+        data (dict): The task data (see `Task.to_dict`)
+        serializer (Serializer): The serializer to use
+        compressor (Compressor): Optional. If provided, serialized data of
+            at least ``compress_threshold`` bytes is compressed with it.
+            Default is `None` (no compression).
+        compress_threshold (int): Optional. The size (in bytes) at which to
+            start compressing. Default is `1024`.
+        flags (int): Optional. A bitmask of flags for the header. Default
+            is `0`.
+
+    Returns:
+        bytes: The payload
+    """
+    head = serializer.dumps(
+        {key: value for key, value in data.items() if key not in BODY_FIELDS}
+    )
+    raw = serializer.dumps(
+        {key: data[key] for key in BODY_FIELDS if key in data}
+    )
+
+    if compressor is not None and len(raw) >= compress_threshold:
+        raw = compressor.compress(raw)
+        flags |= compressor.flag
+
+    header = MAGIC + bytes([serializer.format_id, flags | SPLIT_FLAG])
+    return header + len(head).to_bytes(HEAD_LENGTH_SIZE, "big") + head + raw
+
+
+def _head_end(payload):
+    # Where the head of a split payload (or claim check) ends.
+    start = HEADER_SIZE + HEAD_LENGTH_SIZE
+    return start + int.from_bytes(payload[HEADER_SIZE:start], "big")
+
+
+def _is_split(payload):
+    return (
+        not isinstance(payload, str)
+        and payload[:1] == MAGIC
+        and bool(payload[2] & SPLIT_FLAG)
+    )
+
+
+def claim_check(key, payload=None):
+    """
+    Returns a (small) payload referring to a task stored in a blob store.
+
+    If the stored ``payload`` is split (see `dumps`), its head is copied
+    into the claim check, so `loads_head` doesn't need to fetch the blob.
+
+    Args:
+        key (str): The key of the stored task
+        payload (bytes): Optional. The stored payload. Default is `None`.
+
+    Returns:
+        bytes: The payload
+    """
+    if payload is not None and _is_split(payload):
+        header = MAGIC + bytes([payload[1], BLOB_FLAG | SPLIT_FLAG])
+        head = payload[HEADER_SIZE : _head_end(payload)]
+        return header + bytes(head) + key.encode("ascii")
+
+    return MAGIC + bytes([0, BLOB_FLAG]) + key.encode("ascii")
+
+
+def blob_key(payload):
+    """
+    Returns the blob store key from a claim check payload.
+
+    Args:
+        payload (str|bytes): The payload
+
+    Returns:
+        str: The key, or `None` if the payload isn't a claim check
+    """
+    if isinstance(payload, str) or payload[:1] != MAGIC:
+        return None
+
+    if payload[2] & BLOB_FLAG:
+        start = _head_end(payload) if payload[2] & SPLIT_FLAG else HEADER_SIZE
+        return bytes(payload[start:]).decode("ascii")
+
+
+def loads(payload, blob_store=None):
+    """
+    Deserializes (& decompresses, if needed) a payload from `dumps`.
+
+    Headerless payloads (plain JSON strings or bytes) are read as JSON, so
+    tasks queued in older formats can still be processed.
+
+    Args:
+        payload (str|bytes): The payload
+        blob_store (BlobStore): Optional. Where to fetch the task from, if
+            the payload is a claim check. Default is `None`.
+
+    Returns:
+        dict: The task data
+    """
+    if isinstance(payload, str):
+        return json.loads(payload)
+
+    if payload[:1] != MAGIC:
+        return json.loads(payload[:])
+
+    key = blob_key(payload)
+
+    if key is not None:
+        if blob_store is None:
+            raise MissingBlobError(
+                "A blob store is needed to fetch '{}'.".format(key)
+            )
+
+        with blob_store.open(key) as blob:
+            return loads(blob)
+
+    serializer = get_serializer(payload[1])
+
+    if not payload[2] & SPLIT_FLAG:
+        return serializer.loads(_body(payload, HEADER_SIZE))
+
+    head_end = _head_end(payload)
+    data = serializer.loads(payload[HEADER_SIZE + HEAD_LENGTH_SIZE : head_end])
+    body = serializer.loads(_body(payload, head_end))
+
+    for key in BODY_FIELDS:
+        if key in body:
+            data[key] = body[key]
+
+    return data
+
+
+def _body(payload, start):
+    # The (decompressed) bytes of a payload, from ``start`` on.
+    raw = payload[start:]
+    compressed_with = payload[2] & COMPRESSION_MASK
+
+    if compressed_with:
+        raw = get_compressor(compressed_with).decompress(raw)
+
+    return raw
+
+
+def loads_head(payload, blob_store=None):
+    """
+    Deserializes just the head of a payload from `dumps` (the task's ID,
+    retries, callable & options), leaving the arguments for later.
+
+    Only split payloads (& claim checks for them) have a head of their
+    own. Anything else (like a headerless JSON payload) is deserialized
+    in full up front.
+
+    Args:
+        payload (str|bytes): The payload
+        blob_store (BlobStore): Optional. Where to fetch the task from, if
+            the payload is a claim check. Default is `None`.
+
+    Returns:
+        tuple: The head (a dict) & a function (taking no arguments) that
+        returns the full task data
+    """
+    if not _is_split(payload):
+        data = loads(payload, blob_store=blob_store)
+        return data, lambda: data
+
+    head = get_serializer(payload[1]).loads(
+        payload[HEADER_SIZE + HEAD_LENGTH_SIZE : _head_end(payload)]
+    )
+    return head, lambda: loads(payload, blob_store=blob_store)
@@ -0,0 +1,254 @@
+import logging
+import os
+import signal
+import time
+
+from alligator.constants import ALL
+from alligator.gator import Gator
+from alligator.utils import import_module
+from alligator.workers import Worker
+
+
+# If a child dies faster than this (in seconds), wait a bit before
+# restarting it, so a broken worker doesn't fork in a tight loop.
+MIN_CHILD_LIFETIME = 1
+
+
+class Supervisor(object):
+    def __init__(
+        self,
+        conn_string,
+        processes=2,
+        max_tasks=0,
+        queue_name=ALL,
+        imports=None,
+        worker_class=Worker,
+        worker_kwargs=None,
+        gator_kwargs=None,
+        log_level=logging.INFO,
+    ):
+        """
+        A prefork process manager, for running many ``Worker`` processes on
+        a single machine.
+
+        The master process imports any task modules, then forks
+        ``processes`` children, each running a ``Worker``. Children that
+        crash (or exit after ``max_tasks``) are replaced. On ``SIGINT`` or
+        ``SIGTERM``, the signal is forwarded to the children, which finish
+        their in-progress tasks before exiting.
+
+        Ex::
+
+            from alligator.supervisor import Supervisor
+
+            supervisor = Supervisor(
+                'redis://localhost:6379/0',
+                processes=8,
+                max_tasks=1000,
+                imports=['myapp.tasks'],
+            )
+            supervisor.run_forever()
+
+        Args:
+            conn_string (str): A DSN for connecting to the queue. Each child
+                creates its own ``Gator`` (& connection) with it.
+            processes (int): Optional. The number of worker processes to
+                run. Defaults to `2`.
+            max_tasks (int): Optional. The maximum number of tasks each
+                child consumes before being recycled. Defaults to `0`
+                (unlimited tasks).
+            queue_name (str): Optional. The name of the queue to consume
+                from. Defaults to `ALL`.
+            imports (list): Optional. Dotted paths of modules to import
+                *before* forking, so children share their memory
+                (copy-on-write) & start up instantly. Defaults to `None`.
+            worker_class (class): Optional. The class to use for the
+                workers. Defaults to `Worker`.
+            worker_kwargs (dict): Optional. Extra keyword arguments to pass
+                to each worker. Defaults to `None`.
+            gator_kwargs (dict): Optional. Extra keyword arguments to pass
+                to each child's ``Gator`` (such as a ``blob_store``).
+                Defaults to `None`.
+            log_level (int): Optional. The logging level you'd like for
+                output. Default is `logging.INFO`.
+        """
+        self.conn_string = conn_string
+        self.processes = max(1, int(processes))
+        self.max_tasks = int(max_tasks)
+        self.queue_name = queue_name
+        self.imports = imports or []
+        self.worker_class = worker_class
+        self.worker_kwargs = worker_kwargs or {}
+        self.gator_kwargs = gator_kwargs or {}
+        self.children = {}
+        self.keep_running = False
+        self.log_level = log_level
+        self.log = self.get_log(self.log_level)
+
+    def get_log(self, log_level=logging.INFO):
+        """
+        Sets up logging for the instance.
+
+        Args:
+            log_level (int): Optional. The logging level you'd like for
+                output. Default is `logging.INFO`.
+
+        Returns:
+            logging.Logger: The log instance.
+        """
+        log = logging.getLogger(__name__)
+        default_format = logging.Formatter(
+            "%(asctime)s %(name)s %(levelname)s %(message)s"
+        )
+        stdout_handler = logging.StreamHandler()
+        stdout_handler.setFormatter(default_format)
+        log.addHandler(stdout_handler)
+        log.setLevel(log_level)
+        return log
+
+    def ident(self):
+        """
+        Returns a string identifier for the supervisor.
+
+        Used in the printed messages & includes the process ID.
+        """
+        return "Alligator Supervisor (#{})".format(os.getpid())
+
+    def import_modules(self):
+        """
+        Imports all the task modules, prior to any forking.
+        """
+        for module_name in self.imports:
+            import_module(module_name)
+
+    def build_worker(self):
+        """
+        Creates the ``Worker`` a child process runs.
+
+        Called *after* the fork, so that each child gets its own connection
+        to the backend.
+
+        Returns:
+            Worker: A configured worker instance.
+        """
+        gator = Gator(
+            self.conn_string, queue_name=self.queue_name, **self.gator_kwargs
+        )
+        return self.worker_class(
+            gator,
+            max_tasks=self.max_tasks,
+            to_consume=self.queue_name,
+            **self.worker_kwargs
+        )
+
+    def spawn(self):
+        """
+        Forks a new child process, which runs a ``Worker`` until it's
+        interrupted or reaches ``max_tasks``.
+
+        Returns:
+            int: The child's process ID.
+        """
+        # Hold off on any signals until both sides are set up, so that an
+        # early interrupt can't leave the child running the master's code.
+        signals = {signal.SIGINT, signal.SIGTERM}
+        signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+        pid = os.fork()
+
+        if pid:
+            self.children[pid] = time.time()
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, signals)
+            return pid
+
+        # In the child.
+        code = 1
+
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, signals)
+            code = self.build_worker().run_forever()
+        except Exception as err:
+            self.log.exception(err)
+        finally:
+            os._exit(code)
+
+    def interrupt(self):
+        """
+        Stops restarting children & forwards the interrupt to them.
+        """
+        self.keep_running = False
+        self.log.info(
+            "{} saw interrupt. Stopping {} workers.".format(
+                self.ident(), len(self.children)
+            )
+        )
+
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGINT)
+            except OSError:
+                pass
+
+    def reap(self):
+        """
+        Waits for a child process to exit & restarts it if needed.
+
+        Returns:
+            int: The exited child's process ID.
+        """
+        pid, status = os.wait()
+        started = self.children.pop(pid, None)
+
+        if not self.keep_running:
+            return pid
+
+        if os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0:
+            self.log.info("{} recycling worker #{}.".format(self.ident(), pid))
+        else:
+            self.log.warning(
+                "{} worker #{} died unexpectedly. Restarting.".format(
+                    self.ident(), pid
+                )
+            )
+
+        if started is not None:
+            lifetime = time.time() - started
+
+            if lifetime < MIN_CHILD_LIFETIME:
+                time.sleep(MIN_CHILD_LIFETIME - lifetime)
+
+        if self.keep_running:
+            self.spawn()
+
+        return pid
+
+    def run_forever(self):
+        """
+        Starts the child processes & keeps them running until interrupted.
+        """
+        self.keep_running = True
+        self.import_modules()
+        self.log.info(
+            '{} starting {} workers for "{}".'.format(
+                self.ident(), self.processes, self.queue_name
+            )
+        )
+
+        def handle(signum, frame):
+            self.interrupt()
+
+        signal.signal(signal.SIGINT, handle)
+        signal.signal(signal.SIGTERM, handle)
+
+        for _ in range(self.processes):
+            self.spawn()
+
+        while self.children:
+            try:
+                self.reap()
+            except ChildProcessError:
+                break
+
+        self.log.info("{} shutting down.".format(self.ident()))
+        return 0
@@ -1,14 +1,38 @@
+import asyncio
 import datetime
+import functools
+import inspect
 import json
 import time
 import uuid
 
-from .constants import WAITING, SUCCESS, FAILED, RETRYING, CANCELED
-from .exceptions import MultipleDelayError
-from .utils import determine_module, determine_name, import_attr
+from . import serializers
+from .compressors import COMPRESS_THRESHOLD, get_compressor
+from .constants import (
+    WAITING,
+    SUCCESS,
+    FAILED,
+    RETRYING,
+    CANCELED,
+    MIN_PRIORITY,
+    MAX_PRIORITY,
+)
+from .exceptions import (
+    InvalidPriorityError,
+    MultipleDelayError,
+    NoResultStoreError,
+    ResultTimeoutError,
+    TaskFailed,
+)
+from .retries import get_retry_policy
+from .serializers import JSONSerializer, get_serializer
+from .utils import callable_cache, determine_module, determine_name
+
+
+class BaseTask(object):
+    # No ``__dict__`` here, so subclasses can choose to use ``__slots__``.
+    __slots__ = ()
 
-
-class Task(object):
     def __init__(
         self,
         task_id=None,
@@ -20,6 +44,8 @@ class Task(object):
         depends_on=None,
         delay_by=None,
         delay_until=None,
+        retry_policy=None,
+        priority=0,
     ):
         """
         A base class for managing the execution & serialization of tasks.
@@ -50,14 +76,24 @@ class Task(object):
             on_error (callable): Optional. A hook function to run when the
                 task is fails. If a non-zero number of retries are provided,
                 this will fire *each time* the task fails. Defaults to `None`.
-            depends_on (list): Optional. A list of task_ids that must be
-                complete before this task will fire. Defaults to `None`.
+            depends_on (list): Optional. A list of task_ids (or `Task`
+                instances) that must complete successfully before this task
+                will fire. Only
+                enforced by backends that can park tasks (see
+                `Gator.push`). Defaults to `None`.
             delay_by (int): Optional. The number of seconds to delay before
                 the task can be processed. *Mutually exclusive* with
                 `delay_until`.
             delay_until (float|datetime|date): Optional. The Unix timestamp
                 (or a UTC datetime/date object) to delay processing the task
                 until. *Mutually exclusive* with `delay_by`.
+            retry_policy (RetryPolicy): Optional. How long to wait before
+                each retry & which exceptions are worth retrying (see
+                `alligator.retries`). Defaults to `None` (retry right away,
+                on any exception).
+            priority (int): Optional. From `0` to `9`. Higher priority tasks
+                are popped before any lower ones waiting in the same queue
+                (on backends that support it). Defaults to `0`.
         """
         self.task_id = task_id
         self.retries = int(retries)
@@ -67,8 +103,30 @@ class Task(object):
         self.on_success = on_success
         self.on_error = on_error
         self.depends_on = depends_on
+
+        if self.depends_on:
+            self.depends_on = [
+                getattr(depends, "task_id", depends)
+                for depends in self.depends_on
+            ]
         self.delay_until = delay_until
+        self.retry_policy = retry_policy
+        self.priority = int(priority or 0)
+
+        if not MIN_PRIORITY <= self.priority <= MAX_PRIORITY:
+            raise InvalidPriorityError(
+                "Priority must be between {} & {}, not {}.".format(
+                    MIN_PRIORITY, MAX_PRIORITY, self.priority
+                )
+            )
+
+        # How many times the task has failed & the last wait before a
+        # retry.
+        self.attempts = 0
+        self.retry_delay = None
         self.result = None
+        # Where to look for the result, once pushed (see `Task.wait`).
+        self.result_store = None
 
         if self.delay_until is not None:
             if isinstance(
@@ -159,14 +217,151 @@ class Task(object):
         """
         self.status = RETRYING
 
-    def serialize(self):
+    def should_retry(self, err):
         """
-        Serializes the `Task` data for storing in the queue.
+        Returns whether the task should be retried after failing.
+
+        Args:
+            err (Exception): What the task raised
+
+        Returns:
+            bool: `True` if there are retries left (& the `retry_policy`
+                allows it)
+        """
+        if self.retries <= 0:
+            return False
+
+        if self.retry_policy is None:
+            return True
+
+        return self.retry_policy.should_retry(err)
+
+    def schedule_retry(self):
+        """
+        Sets `delay_until` for the next retry, per the `retry_policy`.
+
+        Without a `retry_policy`, the task is due right away.
+
+        Returns:
+            float: The new `delay_until` (or `None`)
+        """
+        if self.retry_policy is None:
+            self.delay_until = None
+            return None
+
+        self.retry_delay = self.retry_policy.next_delay(
+            self.attempts, previous=self.retry_delay
+        )
+        self.delay_until = time.time() + self.retry_delay
+        return self.delay_until
+
+    def ready(self):
+        """
+        Returns whether the task has finished (successfully or not).
 
-        All data must be JSON-serializable in order to be stored properly.
+        For tasks run by a worker, this checks the ``Gator.result_store``
+        (without waiting).
 
         Returns:
-            str: A JSON string of the task data.
+            bool: `True` if the task has finished
+        """
+        if self.status in (SUCCESS, FAILED):
+            return True
+
+        if self.result_store is None:
+            return False
+
+        stored = self.result_store.get_results([self.task_id])
+
+        if self.task_id not in stored:
+            return False
+
+        self.load_result(stored[self.task_id])
+        return True
+
+    def wait(self, timeout=None):
+        """
+        Waits for the task to finish & returns its result.
+
+        For tasks run by a worker, this requires a ``Gator.result_store``.
+        Waits are woken up when the result arrives, rather than polling
+        (except with the SQLite store).
+
+        Ex::
+
+            task = gator.task(add, 2, 3)
+            task.wait(timeout=10)
+            # 5
+
+        Args:
+            timeout (float): Optional. The most seconds to wait. Default is
+                `None` (wait forever).
+
+        Returns:
+            The task's result
+        """
+        if self.status not in (SUCCESS, FAILED):
+            if self.result_store is None:
+                raise NoResultStoreError(
+                    "Task '{}' has no result store to wait on.".format(
+                        self.task_id
+                    )
+                )
+
+            stored = self.result_store.wait_for(self.task_id, timeout=timeout)
+
+            if stored is None:
+                raise ResultTimeoutError(
+                    "Task '{}' didn't finish within {} seconds.".format(
+                        self.task_id, timeout
+                    )
+                )
+
+            self.load_result(stored)
+            return stored.get()
+
+        if self.status == FAILED:
+            raise TaskFailed("Task '{}' failed.".format(self.task_id))
+
+        return self.result
+
+    async def wait_async(self, timeout=None):
+        """
+        Waits for the task to finish within an ``asyncio`` event loop.
+
+        Works just like `Task.wait`, but waits in the loop's default
+        executor, so it doesn't stall the loop.
+
+        Args:
+            timeout (float): Optional. The most seconds to wait. Default is
+                `None` (wait forever).
+
+        Returns:
+            The task's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.wait, timeout=timeout)
+        )
+
+    def load_result(self, stored):
+        """
+        Updates the task's status & result from its stored result.
+
+        Args:
+            stored (Result): The result (see `alligator.results`)
+        """
+        self.status = stored.status
+
+        if self.status != FAILED and not stored.too_large:
+            self.result = stored.result
+
+    def to_dict(self):
+        """
+        Returns the `Task` data as a dictionary, ready for serialization.
+
+        Returns:
+            dict: The task data.
         """
         data = {
             "task_id": self.task_id,
@@ -200,25 +395,89 @@ class Task(object):
         if self.delay_until:
             data["options"]["delay_until"] = self.delay_until
 
-        return json.dumps(data)
+        if self.depends_on:
+            data["options"]["depends_on"] = list(self.depends_on)
+
+        if self.priority:
+            data["options"]["priority"] = self.priority
+
+        if self.retry_policy:
+            data["options"]["retry_policy"] = self.retry_policy.to_dict()
+
+        if self.attempts:
+            data["options"]["attempts"] = self.attempts
+
+        if self.retry_delay:
+            data["options"]["retry_delay"] = self.retry_delay
+
+        return data
+
+    def serialize(
+        self,
+        serializer=None,
+        compressor=None,
+        compress_threshold=COMPRESS_THRESHOLD,
+    ):
+        """
+        Serializes the `Task` data for storing in the queue.
+
+        By default, all data must be JSON-serializable in order to be stored
+        properly.
+
+        Args:
+            serializer (str|Serializer): Optional. The serializer to use
+                (see `alligator.serializers`). Default is `None` (a plain
+                JSON string, or JSON with a header if compressing).
+            compressor (str|Compressor): Optional. The compressor to use
+                for large tasks (see `alligator.compressors`). Default is
+                `None` (no compression).
+            compress_threshold (int): Optional. The serialized size (in
+                bytes) at which to start compressing. Default is `1024`.
+
+        Returns:
+            str|bytes: A JSON string of the task data, or bytes (with a
+                header) if a serializer or compressor was provided.
+        """
+        data = self.to_dict()
+        serializer = get_serializer(serializer)
+        compressor = get_compressor(compressor)
+
+        if serializer is None:
+            if compressor is None:
+                return json.dumps(data)
+
+            serializer = JSONSerializer()
+
+        return serializers.dumps(
+            data,
+            serializer,
+            compressor=compressor,
+            compress_threshold=compress_threshold,
+        )
 
     @classmethod
-    def deserialize(cls, data):
+    def deserialize(cls, data, blob_store=None):
         """
         Given some data from the queue, deserializes it into a `Task`
         instance.
 
         The data must be similar in format to what comes from
-        `Task.serialize` (a JSON-serialized dictionary). Required keys are
-        `task_id`, `retries` & `is_async`.
+        `Task.serialize` (either a JSON-serialized dictionary or a payload
+        with a header naming its serializer). Required keys are `task_id`,
+        `retries` & `is_async`.
+
+        The callables are resolved via `alligator.utils.callable_cache`.
 
         Args:
-            data (str): A JSON-serialized string of the task data
+            data (str|bytes): The serialized task data
+            blob_store (BlobStore): Optional. Where to fetch the task data
+                from if ``data`` is a claim check (see `alligator.blobs`).
+                Default is `None`.
 
         Returns:
             Task: A populated task
         """
-        data = json.loads(data)
+        data = serializers.loads(data, blob_store=blob_store)
         options = data.get("options", {})
 
         task = cls(
@@ -227,30 +486,46 @@ class Task(object):
             is_async=data["is_async"],
         )
 
-        func = import_attr(data["module"], data["callable"])
+        func = callable_cache.resolve(data["module"], data["callable"])
         task.to_call(func, *data.get("args", []), **data.get("kwargs", {}))
 
         if options.get("on_start"):
-            task.on_start = import_attr(
+            task.on_start = callable_cache.resolve(
                 options["on_start"]["module"], options["on_start"]["callable"]
             )
 
         if options.get("on_success"):
-            task.on_success = import_attr(
+            task.on_success = callable_cache.resolve(
                 options["on_success"]["module"],
                 options["on_success"]["callable"],
             )
 
         if options.get("on_error"):
-            task.on_error = import_attr(
+            task.on_error = callable_cache.resolve(
                 options["on_error"]["module"], options["on_error"]["callable"]
             )
 
         if options.get("delay_until"):
             task.delay_until = options["delay_until"]
 
+        if options.get("depends_on"):
+            task.depends_on = options["depends_on"]
+
+        task.priority = options.get("priority", 0)
+        task.load_retry_options(options)
         return task
 
+    def load_retry_options(self, options):
+        """
+        Restores the retry policy & state from serialized options.
+
+        Args:
+            options (dict): The task's ``options`` data
+        """
+        self.retry_policy = get_retry_policy(options.get("retry_policy"))
+        self.attempts = options.get("attempts", 0)
+        self.retry_delay = options.get("retry_delay")
+
     def run(self):
         """
         Runs the task.
@@ -271,25 +546,264 @@ class Task(object):
         Finally, it returns itself, with `Task.result` set to the result
         from the target function's execution.
 
+        If the target or hook functions are ``async def`` functions, each
+        is run to completion in a new event loop. Within a running loop,
+        use `Task.run_async` instead.
+
+        Returns:
+            Task: The processed Task.
+        """
+        if self.on_start:
+            self.wait_for(self.on_start(self))
+
+        try:
+            self.result = self.wait_for(
+                self.func(*self.func_args, **self.func_kwargs)
+            )
+        except Exception as err:
+            self.to_failed()
+
+            if self.on_error:
+                self.wait_for(self.on_error(self, err))
+
+            raise
+
+        self.to_success()
+
+        if self.on_success:
+            self.wait_for(self.on_success(self, self.result))
+
+        return self
+
+    async def run_async(self):
+        """
+        Runs the task within an ``asyncio`` event loop.
+
+        Works just like `Task.run`, except that ``async def`` target &
+        hook functions are awaited. Plain (blocking) target functions are
+        run in the loop's default executor, so they don't stall the loop.
+
         Returns:
             Task: The processed Task.
         """
         if self.on_start:
-            self.on_start(self)
+            await self.maybe_await(self.on_start(self))
 
         try:
-            self.result = self.func(*self.func_args, **self.func_kwargs)
+            if inspect.iscoroutinefunction(self.func):
+                self.result = await self.func(
+                    *self.func_args, **self.func_kwargs
+                )
+            else:
+                loop = asyncio.get_running_loop()
+                self.result = await self.maybe_await(
+                    await loop.run_in_executor(
+                        None,
+                        functools.partial(
+                            self.func, *self.func_args, **self.func_kwargs
+                        ),
+                    )
+                )
         except Exception as err:
             self.to_failed()
 
             if self.on_error:
-                self.on_error(self, err)
+                await self.maybe_await(self.on_error(self, err))
 
             raise
 
         self.to_success()
 
         if self.on_success:
-            self.on_success(self, self.result)
+            await self.maybe_await(self.on_success(self, self.result))
 
         return self
+
+    @staticmethod
+    def wait_for(value):
+        """
+        If a target/hook function returned a coroutine (an ``async def``
+        function), runs it to completion in a new event loop.
+
+        Args:
+            value: The return value of the function
+
+        Returns:
+            The (awaited, if needed) value
+        """
+        if inspect.iscoroutine(value):
+            return asyncio.run(value)
+
+        return value
+
+    @staticmethod
+    async def maybe_await(value):
+        """
+        Awaits the return value of a target/hook function, if needed.
+
+        Args:
+            value: The return value of the function
+
+        Returns:
+            The (awaited, if needed) value
+        """
+        if inspect.isawaitable(value):
+            return await value
+
+        return value
+
+
+class Task(BaseTask):
+    """
+    A task, with all its data decoded up front.
+
+    Instances have a ``__dict__``, so hook functions (or subclasses) can
+    freely add attributes. See `BaseTask` for the arguments.
+    """
+
+    pass
+
+
+# Marks a `LightTask` attribute that hasn't been decoded yet.
+UNRESOLVED = object()
+
+
+class Deferred(object):
+    """
+    A descriptor for a `LightTask` attribute that's only decoded (by the
+    ``loader`` function) the first time it's accessed.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def __set_name__(self, owner, name):
+        self.slot = "_{}".format(name)
+
+    def __get__(self, task, owner=None):
+        if task is None:
+            return self
+
+        value = getattr(task, self.slot)
+
+        if value is UNRESOLVED:
+            value = self.loader(task)
+            setattr(task, self.slot, value)
+
+        return value
+
+    def __set__(self, task, value):
+        setattr(task, self.slot, value)
+
+
+def load_hook(name):
+    def loader(task):
+        hook = (task._data.get("options") or {}).get(name)
+
+        if not hook:
+            return None
+
+        return callable_cache.resolve(hook["module"], hook["callable"])
+
+    return loader
+
+
+class LightTask(BaseTask):
+    """
+    A leaner `Task` for busy workers.
+
+    Uses ``__slots__`` (no per-instance ``__dict__``) & when deserialized,
+    only decodes the head of the payload (the task's ID, retries,
+    ``is_async``, callable path & options) up front. The arguments are
+    only decoded (& decompressed, or fetched from the blob store) on first
+    access, & the callable & hook functions are only imported then, so a
+    task can be inspected (& deferred or routed) cheaply.
+
+    The head can only be decoded on its own if the task was queued with a
+    ``serializer`` (see `Gator`). Plain JSON payloads are decoded in full.
+
+    Ex::
+
+        gator = Gator('redis://localhost:6379/0', task_class=LightTask)
+
+    Hook functions can't add new attributes to a ``LightTask``.
+    """
+
+    __slots__ = (
+        "task_id",
+        "retries",
+        "is_async",
+        "status",
+        "depends_on",
+        "delay_until",
+        "retry_policy",
+        "priority",
+        "attempts",
+        "retry_delay",
+        "result",
+        "result_store",
+        "_data",
+        "_load_data",
+        "_func",
+        "_func_args",
+        "_func_kwargs",
+        "_on_start",
+        "_on_success",
+        "_on_error",
+    )
+
+    func = Deferred(
+        lambda task: callable_cache.resolve(
+            task._data["module"], task._data["callable"]
+        )
+    )
+    func_args = Deferred(
+        lambda task: tuple(task._full_data().get("args") or [])
+    )
+    func_kwargs = Deferred(lambda task: task._full_data().get("kwargs") or {})
+    on_start = Deferred(load_hook("on_start"))
+    on_success = Deferred(load_hook("on_success"))
+    on_error = Deferred(load_hook("on_error"))
+
+    @classmethod
+    def deserialize(cls, data, blob_store=None):
+        """
+        Given some data from the queue, deserializes it into a `LightTask`
+        instance, only decoding the head of the payload. The arguments are
+        decoded (& the callable & hooks imported) when first accessed.
+
+        Args:
+            data (str|bytes): The serialized task data
+            blob_store (BlobStore): Optional. Where to fetch the task data
+                from if ``data`` is a claim check (see `alligator.blobs`).
+                Default is `None`.
+
+        Returns:
+            LightTask: A (lazily) populated task
+        """
+        data, load_data = serializers.loads_head(data, blob_store=blob_store)
+        options = data.get("options") or {}
+
+        task = cls(
+            task_id=data["task_id"],
+            retries=data["retries"],
+            is_async=data["is_async"],
+            depends_on=options.get("depends_on") or None,
+            delay_until=options.get("delay_until") or None,
+            priority=options.get("priority", 0),
+        )
+        task.load_retry_options(options)
+        task._data = data
+        task._load_data = load_data
+        task._func = task._func_args = task._func_kwargs = UNRESOLVED
+        task._on_start = task._on_success = task._on_error = UNRESOLVED
+        return task
+
+    def _full_data(self):
+        # Decodes the rest of the payload (the arguments), the first time
+        # they're needed.
+        if self._load_data is not None:
+            self._data = self._load_data()
+            self._load_data = None
+
+        return self._data
@@ -1,4 +1,5 @@
 import importlib
+import threading
 
 from .exceptions import UnknownModuleError, UnknownCallableError
 
@@ -92,3 +93,151 @@ def import_attr(module_name, attr_name):
         return getattr(module, attr_name)
     except AttributeError as err:
         raise UnknownCallableError(str(err))
+
+
+class CallableCache(object):
+    def __init__(self, max_size=1024, strict=False):
+        """
+        A bounded cache of callables, keyed by ``(module_name, attr_name)``.
+
+        Resolving a task's callable (& hooks) with `import_attr` on every
+        deserialization is costly in a busy worker. Once a callable has
+        been resolved, later lookups are a single dict lookup.
+
+        Callables may also be registered up front (see
+        `CallableCache.register`). Registered callables never touch the
+        import machinery. With ``strict=True``, *only* registered callables
+        can be resolved, which keeps arbitrary queue data from importing
+        arbitrary code.
+
+        Ex::
+
+            from alligator.utils import callable_cache
+
+            @callable_cache.register
+            def send_welcome_email(user_id):
+                # ...
+
+            func = callable_cache.resolve('myapp.tasks', 'send_welcome_email')
+
+        Args:
+            max_size (int): Optional. The most callables to cache. Once
+                full, the oldest entries are evicted first. Defaults to
+                `1024`.
+            strict (bool): Optional. Whether to only resolve registered
+                callables. Defaults to `False`.
+        """
+        self.max_size = max(1, int(max_size))
+        self.strict = strict
+        self.registry = {}
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def register(self, func):
+        """
+        Adds a callable to the registry.
+
+        Returns the callable, so this can also be used as a decorator.
+
+        Args:
+            func (callable): The callable
+
+        Returns:
+            callable: The same callable
+        """
+        key = (determine_module(func), determine_name(func))
+
+        with self.lock:
+            self.registry[key] = func
+            self.cache.pop(key, None)
+
+        return func
+
+    def preload(self):
+        """
+        Resolves all the registered callables into the cache ahead of time.
+
+        Workers call this on startup.
+
+        Returns:
+            int: The number of callables cached
+        """
+        with self.lock:
+            for key, func in list(self.registry.items())[-self.max_size :]:
+                self._store(key, func)
+
+            return len(self.cache)
+
+    def resolve(self, module_name, attr_name):
+        """
+        Given a dotted Python path & an attribute name, returns the callable.
+
+        If not found (or not registered, when ``strict``), raises
+        ``UnknownCallableError``.
+
+        Args:
+            module_name (str): The dotted Python path
+            attr_name (str): The attribute name
+
+        Returns:
+            callable
+        """
+        key = (module_name, attr_name)
+
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+
+        func = self.registry.get(key)
+
+        if func is None:
+            if self.strict:
+                raise UnknownCallableError(
+                    "'{}.{}' is not a registered callable.".format(
+                        module_name, attr_name
+                    )
+                )
+
+            func = import_attr(module_name, attr_name)
+
+        with self.lock:
+            self._store(key, func)
+
+        return func
+
+    def _store(self, key, func):
+        if key not in self.cache and len(self.cache) >= self.max_size:
+            # Dicts keep insertion order, so this is the oldest entry.
+            self.cache.pop(next(iter(self.cache)))
+
+        self.cache[key] = func
+
+    def invalidate(self, module_name=None, attr_name=None):
+        """
+        Drops entries from the cache, so they're resolved afresh next time.
+
+        Useful after reloading a module. Registered callables stay
+        registered.
+
+        Args:
+            module_name (str): Optional. Only drop entries from this
+                module. Default is `None` (drop everything).
+            attr_name (str): Optional. Only drop this entry from the
+                module. Default is `None` (the whole module).
+        """
+        with self.lock:
+            if module_name is None:
+                self.cache.clear()
+                return
+
+            for key in list(self.cache):
+                if key[0] != module_name:
+                    continue
+
+                if attr_name is None or key[1] == attr_name:
+                    del self.cache[key]
+
+
+# The cache used when deserializing tasks.
+callable_cache = CallableCache()
@@ -1,10 +1,16 @@
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
 import signal
+import threading
 import time
 import traceback
 
 from alligator.constants import ALL
+from alligator.polling import FixedPolling
+from alligator.utils import callable_cache
 
 
 class Worker(object):
@@ -15,6 +21,10 @@ class Worker(object):
         to_consume=ALL,
         nap_time=0.1,
         log_level=logging.INFO,
+        prefetch=1,
+        wait_timeout=1,
+        poll_strategy=None,
+        weights=None,
     ):
         """
         An object for consuming the queue & running the tasks.
@@ -32,14 +42,36 @@ class Worker(object):
             max_tasks (int): Optional. The maximum number of tasks to consume.
                 Useful if you're concerned about memory leaks or want
                 short-lived workers. Defaults to `0` (unlimited tasks).
-            to_consume (str): Optional. The queue name the worker should
-                consume from. Defaults to `ALL`.
+            to_consume (str|list): Optional. The queue name the worker
+                should consume from, or a list of queue names. With a list,
+                earlier queues are strictly preferred (unless ``weights``
+                are given). Defaults to `ALL` (the gator's queue).
             nap_time (float): Optional. To prevent high CPU usage in the busy
-                loop, you can specify a time delay (in seconds) between
-                tasks. Set to `0` to disable sleep & consume as fast as
+                loop, you can specify a time delay (in seconds) to sleep
+                when no task was found. Unused if the backend can wait for
+                tasks instead (see `wait_timeout`) or a `poll_strategy` is
+                provided. Set to `0` to disable sleep & consume as fast as
                 possible. Defaults to `0.1`
             log_level (int): Optional. The logging level you'd like for
                 output. Default is `logging.INFO`.
+            prefetch (int): Optional. The number of tasks to pull off the
+                queue at a time. They're kept in a local buffer, which is
+                only refilled once it runs dry. Higher values mean fewer
+                trips to the backend. Defaults to `1`.
+            wait_timeout (float): Optional. If the backend supports it, the
+                maximum number of seconds to block waiting for a task
+                before checking back in. Idle workers then cost almost
+                nothing & new tasks are picked up right away. Set to `0` to
+                disable. Defaults to `1`.
+            poll_strategy (object): Optional. For backends that can't wait
+                for tasks, decides how long to sleep between polls (see
+                `alligator.polling`). Defaults to `None` (a `FixedPolling`
+                using `nap_time`).
+            weights (dict|list): Optional. When consuming several queues,
+                shares them out in proportion to these weights (a dict of
+                queue names, or a list in ``to_consume`` order) instead of
+                strictly by order. Idle queues don't bank their share.
+                Defaults to `None` (strict order).
         """
         self.gator = gator
         self.max_tasks = int(max_tasks)
@@ -49,6 +81,70 @@ class Worker(object):
         self.keep_running = False
         self.log_level = log_level
         self.log = self.get_log(self.log_level)
+        self.prefetch = max(1, int(prefetch))
+        self.buffer = collections.deque()
+        self.wait_timeout = wait_timeout
+        self.poll_strategy = poll_strategy
+
+        if self.poll_strategy is None:
+            self.poll_strategy = FixedPolling(self.nap_time)
+
+        self.gators = self.get_gators(to_consume)
+        self.quanta = self.get_quanta(weights)
+        self.deficits = [0] * len(self.gators)
+        self.turn = 0
+
+    def get_gators(self, to_consume):
+        """
+        Returns a `Gator` for each queue the worker consumes from.
+
+        Args:
+            to_consume (str|list): The queue name(s)
+
+        Returns:
+            list: The `Gator` objects, in order of preference.
+        """
+        if isinstance(to_consume, str):
+            to_consume = [to_consume]
+
+        gators = []
+
+        for queue_name in to_consume:
+            if queue_name in (ALL, self.gator.queue_name):
+                gators.append(self.gator)
+            else:
+                gators.append(self.gator.for_queue(queue_name))
+
+        return gators
+
+    def get_quanta(self, weights):
+        """
+        Returns how many tasks each queue gets per round when consuming
+        by weight.
+
+        Args:
+            weights (dict|list): The weights, or `None` for strict order
+
+        Returns:
+            list: The per-queue quanta (the smallest being `1`), or `None`.
+        """
+        if weights is None:
+            return None
+
+        if isinstance(weights, dict):
+            weights = [
+                weights.get(gator.queue_name, 1) for gator in self.gators
+            ]
+
+        weights = [float(weight) for weight in weights]
+
+        if len(weights) != len(self.gators) or min(weights) <= 0:
+            raise ValueError(
+                "Provide a positive weight for each queue consumed."
+            )
+
+        smallest = min(weights)
+        return [weight / smallest for weight in weights]
 
     def get_log(self, log_level=logging.INFO):
         """
@@ -82,11 +178,15 @@ class Worker(object):
     def starting(self):
         """
         Prints a startup message to stdout.
+
+        Also resolves any registered task callables ahead of time (see
+        `alligator.utils.CallableCache`).
         """
         self.keep_running = True
+        callable_cache.preload()
         ident = self.ident()
         self.log.info(
-            '{} starting & consuming "{}".'.format(ident, self.to_consume)
+            '{} starting & consuming "{}".'.format(ident, self.consuming())
         )
 
         if self.max_tasks:
@@ -96,6 +196,15 @@ class Worker(object):
         else:
             self.log.info("{} will never die.".format(ident))
 
+    def consuming(self):
+        """
+        Returns the queue name(s) being consumed, for the printed messages.
+        """
+        if len(self.gators) > 1:
+            return ", ".join(gator.queue_name for gator in self.gators)
+
+        return self.to_consume
+
     def interrupt(self):
         """
         Prints an interrupt message to stdout.
@@ -104,7 +213,7 @@ class Worker(object):
         ident = self.ident()
         self.log.info(
             '{} for "{}" saw interrupt. Finishing in-progress task.'.format(
-                ident, self.to_consume
+                ident, self.consuming()
             )
         )
 
@@ -116,7 +225,7 @@ class Worker(object):
         ident = self.ident()
         self.log.info(
             '{} for "{}" shutting down. Consumed {} tasks.'.format(
-                ident, self.to_consume, self.tasks_complete
+                ident, self.consuming(), self.tasks_complete
             )
         )
 
@@ -129,6 +238,139 @@ class Worker(object):
         if result is not None:
             self.log.info(result)
 
+    def can_block(self):
+        """
+        Returns whether fetching waits on the backend for tasks.
+
+        Only a worker consuming a single queue blocks, since waiting on one
+        queue would starve the others.
+
+        Returns:
+            bool: `True` if fetches block, `False` if polling is needed.
+        """
+        return (
+            bool(self.wait_timeout)
+            and len(self.gators) == 1
+            and self.gator.can_block()
+        )
+
+    def next_gators(self):
+        """
+        Yields the queues to fetch from, in the order they should be tried.
+
+        With weights, this is a deficit round-robin: each queue gets its
+        quantum of credit when its turn comes around & keeps the turn until
+        the credit is used up (see `Worker.took`).
+
+        Yields:
+            tuple: The queue's index, `Gator` & the most tasks to fetch
+                from it (`None` for no limit).
+        """
+        if self.quanta is None:
+            for index, gator in enumerate(self.gators):
+                yield index, gator, None
+
+            return
+
+        start = self.turn
+
+        for offset in range(len(self.gators)):
+            index = (start + offset) % len(self.gators)
+
+            if self.deficits[index] < 1:
+                self.deficits[index] += self.quanta[index]
+
+            yield index, self.gators[index], int(self.deficits[index])
+
+    def took(self, index, wanted, fetched):
+        """
+        Records how many tasks were fetched from a queue.
+
+        Args:
+            index (int): The queue's index
+            wanted (int): How many tasks were asked for
+            fetched (int): How many tasks were actually fetched
+        """
+        if self.quanta is None:
+            return
+
+        self.deficits[index] -= fetched
+
+        if fetched < wanted:
+            # Idle queues don't bank credit.
+            self.deficits[index] = 0
+
+        if self.deficits[index] < 1:
+            self.turn = (index + 1) % len(self.gators)
+        else:
+            self.turn = index
+
+    def fetch_tasks(self, count):
+        """
+        Fetches up to ``count`` tasks from the queue(s) being consumed.
+
+        Args:
+            count (int): The most tasks to fetch
+
+        Returns:
+            list: ``(gator, data)`` pairs, where ``gator`` is the `Gator`
+                for the queue the task came from.
+        """
+        if len(self.gators) == 1:
+            timeout = self.wait_timeout if self.can_block() else None
+            return [
+                (self.gator, data)
+                for data in self.gator.fetch(count, timeout=timeout)
+            ]
+
+        fetched = []
+
+        while len(fetched) < count:
+            before = len(fetched)
+
+            for index, gator, limit in self.next_gators():
+                wanted = count - len(fetched)
+
+                if limit is not None:
+                    wanted = min(wanted, limit)
+
+                got = gator.fetch(wanted)
+                fetched.extend((gator, data) for data in got)
+                self.took(index, wanted, len(got))
+
+                if len(fetched) >= count:
+                    break
+
+            if self.quanta is None or len(fetched) == before:
+                # Every queue has had its chance.
+                break
+
+        return fetched
+
+    def fill_buffer(self):
+        """
+        Refills the local buffer of tasks from the queue.
+
+        No more than `Worker.prefetch` tasks are fetched, nor more than the
+        number of tasks left before `Worker.max_tasks` is reached.
+
+        Returns:
+            int: The number of tasks added to the buffer.
+        """
+        count = self.prefetch
+
+        if self.max_tasks:
+            count = max(1, min(count, self.max_tasks - self.tasks_complete))
+
+        try:
+            fetched = self.fetch_tasks(count)
+        except Exception as err:
+            self.log.exception(err)
+            return 0
+
+        self.buffer.extend(fetched)
+        return len(fetched)
+
     def check_and_run_task(self):
         """
         Handles the logic of checking for & executing a task.
@@ -141,26 +383,41 @@ class Worker(object):
             bool: `True` if a task was run successfully, `False` if there was
                 no task to process or executing the task failed.
         """
-        if self.gator.len():
-            try:
-                task = self.gator.pop()
-            except Exception as err:
-                self.log.exception(err)
-                return False
+        if not self.buffer and not self.fill_buffer():
+            return False
+
+        gator, data = self.buffer.popleft()
 
-            if task is None:
-                return False
+        try:
+            task = gator.process(data)
+        except Exception as err:
+            self.log.exception(err)
+            return False
 
-            self.tasks_complete += 1
-            self.result(task.result)
-            return True
+        if task is None:
+            return False
 
-        return False
+        self.tasks_complete += 1
+        self.result(task.result)
+        return True
+
+    def drain_buffer(self):
+        """
+        Runs any tasks still sitting in the local buffer.
+
+        Since they've already been taken off the queue, they'd otherwise be
+        lost when the worker stops.
+        """
+        while self.buffer:
+            self.check_and_run_task()
 
     def run_forever(self):
         """
         Causes the worker to run either forever or until the
         `Worker.max_tasks` are reached.
+
+        Both `SIGINT` & `SIGTERM` let the in-progress task finish before
+        stopping.
         """
         self.starting()
 
@@ -168,15 +425,412 @@ class Worker(object):
             self.interrupt()
 
         signal.signal(signal.SIGINT, handle)
+        signal.signal(signal.SIGTERM, handle)
 
         while self.keep_running:
             if self.max_tasks and self.tasks_complete >= self.max_tasks:
                 self.stopping()
                 break
 
-            self.check_and_run_task()
+            started = time.monotonic()
+            found = self.check_and_run_task()
+
+            if self.can_block() and not found:
+                if time.monotonic() - started >= self.wait_timeout:
+                    # We already waited on the backend.
+                    continue
+
+                # It came back early (say, the backend is down), so back
+                # off rather than spinning.
+
+            nap = self.poll_strategy.next_nap(found)
+
+            if nap > 0:
+                time.sleep(nap)
+
+        self.drain_buffer()
+        return 0
+
+
+class ThreadedWorker(Worker):
+    def __init__(self, gator, concurrency=4, **kwargs):
+        """
+        A worker that runs several tasks at once, each in its own thread.
+
+        Best suited to I/O-bound tasks (HTTP calls, database queries, etc.),
+        which spend most of their time waiting. Tasks are only pulled off
+        the queue when there's a free thread to run them.
+
+        Ex::
+
+            from alligator import Gator
+            from alligator.workers import ThreadedWorker
+
+            gator = Gator('redis://localhost:6379/0')
+            worker = ThreadedWorker(gator, concurrency=16, prefetch=8)
+            worker.run_forever()
+
+        Args:
+            gator (Gator): A configured `Gator` object
+            concurrency (int): Optional. The maximum number of tasks to run
+                at once. Defaults to `4`.
+            kwargs (dict): Optional. Any of the `Worker` arguments. Here,
+                `prefetch` is the most tasks fetched in a single trip to
+                the backend (never more than the number of free threads).
+        """
+        super(ThreadedWorker, self).__init__(gator, **kwargs)
+        self.concurrency = max(1, int(concurrency))
+        self.slots = threading.BoundedSemaphore(self.concurrency)
+        self.lock = threading.Lock()
+        self.task_done = threading.Event()
+        self.in_flight = 0
+        self.executor = None
+
+    def get_executor(self):
+        """
+        Returns the thread pool tasks are run in, creating it if needed.
+
+        Returns:
+            concurrent.futures.ThreadPoolExecutor: The thread pool.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix="alligator-worker",
+            )
+
+        return self.executor
+
+    def run_task(self, data, gator=None):
+        """
+        Runs a single task. Called within one of the pool's threads.
 
-            if self.nap_time >= 0:
-                time.sleep(self.nap_time)
+        Args:
+            data (str): The raw task data
+            gator (Gator): Optional. The `Gator` for the queue the task
+                came from. Default is `None` (`Worker.gator`).
+        """
+        gator = gator or self.gator
+
+        try:
+            task = gator.process(data)
+
+            if task is not None:
+                with self.lock:
+                    self.tasks_complete += 1
+
+                self.result(task.result)
+        except Exception as err:
+            self.log.exception(err)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+            self.slots.release()
+            self.task_done.set()
+
+    def check_and_run_task(self):
+        """
+        Handles the logic of checking for tasks & handing them off to the
+        thread pool.
+
+        Waits for a free thread first, then fetches as many tasks as there
+        are free threads (up to `Worker.prefetch`). Tasks already running
+        count towards `Worker.max_tasks`, so no extra tasks are fetched
+        once enough are in progress.
+
+        Returns:
+            bool: `True` if any tasks were handed off, `False` if there was
+                no task to process.
+        """
+        wait_for = self.wait_timeout or 1
+
+        if not self.slots.acquire(timeout=wait_for):
+            return False
+
+        acquired = 1
+
+        while acquired < self.prefetch and self.slots.acquire(blocking=False):
+            acquired += 1
+
+        count = acquired
+
+        if self.max_tasks:
+            with self.lock:
+                remaining = (
+                    self.max_tasks - self.tasks_complete - self.in_flight
+                )
+
+            count = min(count, remaining)
+
+        fetched = []
+
+        if count > 0:
+            try:
+                fetched = self.fetch_tasks(count)
+            except Exception as err:
+                self.log.exception(err)
+
+        for _ in range(acquired - len(fetched)):
+            self.slots.release()
+
+        if count <= 0:
+            # Everything we need is already running. Wait for a task to
+            # finish before checking again.
+            self.task_done.wait(wait_for)
+            self.task_done.clear()
+            return False
+
+        executor = self.get_executor()
+
+        for gator, data in fetched:
+            with self.lock:
+                self.in_flight += 1
+
+            executor.submit(self.run_task, data, gator)
+
+        return len(fetched) > 0
+
+    def wait_for_tasks(self):
+        """
+        Waits for all the in-progress tasks to finish, then shuts down the
+        thread pool.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def run_forever(self):
+        """
+        Causes the worker to run either forever or until the
+        `Worker.max_tasks` are reached.
+
+        On interrupt, all in-progress tasks are allowed to finish.
+        """
+        try:
+            return super(ThreadedWorker, self).run_forever()
+        finally:
+            self.wait_for_tasks()
+
+
+class AsyncWorker(Worker):
+    def __init__(self, gator, concurrency=10, **kwargs):
+        """
+        A worker that runs many tasks at once on a single ``asyncio`` event
+        loop.
+
+        Best suited to ``async def`` tasks, which can all wait on I/O at
+        the same time. Plain (blocking) tasks are run in the loop's default
+        executor. Tasks are only pulled off the queue when there's a free
+        slot to run them.
+
+        Ex::
+
+            from alligator.gator import AsyncGator
+            from alligator.workers import AsyncWorker
+
+            gator = AsyncGator('redis://localhost:6379/0')
+            worker = AsyncWorker(gator, concurrency=100, prefetch=10)
+            worker.run_forever()
+
+        Args:
+            gator (AsyncGator): A configured `AsyncGator` object
+            concurrency (int): Optional. The maximum number of tasks to run
+                at once. Defaults to `10`.
+            kwargs (dict): Optional. Any of the `Worker` arguments. Here,
+                `prefetch` is the most tasks fetched in a single trip to
+                the backend (never more than the number of free slots).
+        """
+        super(AsyncWorker, self).__init__(gator, **kwargs)
+        self.concurrency = max(1, int(concurrency))
+        self.slots = None
+        self.running = set()
+
+    async def run_task(self, data, gator=None):
+        """
+        Runs a single task.
+
+        Args:
+            data (str): The raw task data
+            gator (AsyncGator): Optional. The `AsyncGator` for the queue the
+                task came from. Default is `None` (`Worker.gator`).
+        """
+        gator = gator or self.gator
+
+        try:
+            task = await gator.process(data)
+
+            if task is not None:
+                self.tasks_complete += 1
+                self.result(task.result)
+        except Exception as err:
+            self.log.exception(err)
+        finally:
+            self.slots.release()
+
+    async def check_and_run_task(self):
+        """
+        Handles the logic of checking for tasks & scheduling them on the
+        event loop.
+
+        Waits for a free slot first, then fetches as many tasks as there
+        are free slots (up to `Worker.prefetch`). Tasks already running
+        count towards `Worker.max_tasks`, so no extra tasks are fetched
+        once enough are in progress.
+
+        Returns:
+            bool: `True` if any tasks were scheduled, `False` if there was
+                no task to process.
+        """
+        await self.slots.acquire()
+        acquired = 1
+
+        while acquired < self.prefetch and not self.slots.locked():
+            await self.slots.acquire()
+            acquired += 1
+
+        count = acquired
+
+        if self.max_tasks:
+            remaining = (
+                self.max_tasks - self.tasks_complete - len(self.running)
+            )
+            count = min(count, remaining)
+
+        fetched = []
+
+        if count > 0:
+            try:
+                fetched = await self.fetch_tasks(count)
+            except Exception as err:
+                self.log.exception(err)
+
+        for _ in range(acquired - len(fetched)):
+            self.slots.release()
+
+        if count <= 0:
+            # Everything we need is already running. Wait for a task to
+            # finish before checking again.
+            if self.running:
+                await asyncio.wait(
+                    self.running,
+                    timeout=self.wait_timeout or 1,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+            return False
+
+        for gator, data in fetched:
+            running = asyncio.ensure_future(self.run_task(data, gator))
+            self.running.add(running)
+            running.add_done_callback(self.running.discard)
+
+        return len(fetched) > 0
+
+    async def fetch_tasks(self, count):
+        """
+        Fetches up to ``count`` tasks from the queue(s) being consumed.
+
+        Args:
+            count (int): The most tasks to fetch
+
+        Returns:
+            list: ``(gator, data)`` pairs, where ``gator`` is the
+                `AsyncGator` for the queue the task came from.
+        """
+        if len(self.gators) == 1:
+            timeout = self.wait_timeout if self.can_block() else None
+            fetched = await self.gator.fetch(count, timeout=timeout)
+            return [(self.gator, data) for data in fetched]
+
+        fetched = []
+
+        while len(fetched) < count:
+            before = len(fetched)
+
+            for index, gator, limit in self.next_gators():
+                wanted = count - len(fetched)
+
+                if limit is not None:
+                    wanted = min(wanted, limit)
+
+                got = await gator.fetch(wanted)
+                fetched.extend((gator, data) for data in got)
+                self.took(index, wanted, len(got))
+
+                if len(fetched) >= count:
+                    break
+
+            if self.quanta is None or len(fetched) == before:
+                # Every queue has had its chance.
+                break
+
+        return fetched
+
+    async def wait_for_tasks(self):
+        """
+        Waits for all the in-progress tasks to finish.
+        """
+        if self.running:
+            await asyncio.wait(self.running)
+
+    async def run(self):
+        """
+        Consumes the queue either forever or until the `Worker.max_tasks`
+        are reached.
+
+        Both `SIGINT` & `SIGTERM` (where the loop supports it) let all the
+        in-progress tasks finish before stopping.
+        """
+        self.slots = asyncio.BoundedSemaphore(self.concurrency)
+        self.starting()
+
+        loop = asyncio.get_running_loop()
+        handled = []
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.interrupt)
+                handled.append(signum)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Not the main thread or not supported by the platform.
+                pass
+
+        try:
+            while self.keep_running:
+                if self.max_tasks and self.tasks_complete >= self.max_tasks:
+                    self.stopping()
+                    break
+
+                started = time.monotonic()
+                found = await self.check_and_run_task()
+
+                if self.can_block() and not found:
+                    if time.monotonic() - started >= self.wait_timeout:
+                        # We already waited on the backend.
+                        continue
+
+                    # It came back early (say, the backend is down), so
+                    # back off rather than spinning.
+
+                nap = self.poll_strategy.next_nap(found)
+
+                if nap > 0:
+                    await asyncio.sleep(nap)
+
+            await self.wait_for_tasks()
+        finally:
+            for signum in handled:
+                loop.remove_signal_handler(signum)
 
         return 0
+
+    def run_forever(self):
+        """
+        Starts a new event loop & runs the worker within it (see
+        `AsyncWorker.run`).
+
+        To run the worker within an existing event loop, await
+        `AsyncWorker.run` instead.
+        """
+        return asyncio.run(self.run())
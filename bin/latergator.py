@@ -1,20 +1,154 @@
 #!/usr/bin/env python
+import argparse
 import sys
 
 from alligator import Gator, Worker
+from alligator.blobs import FileBlobStore
+from alligator.constants import ALL
+from alligator.schedules import Scheduler
+from alligator.supervisor import Supervisor
+from alligator.utils import import_module
 
 
-def main(dsn):
-    gator = Gator(dsn)
+def main(
+    dsn,
+    processes=1,
+    max_tasks=0,
+    queue_name=ALL,
+    imports=None,
+    blob_dir=None,
+    lease_time=None,
+    dead_letter_queue=None,
+    beat=False,
+):
+    gator_kwargs = {}
 
-    worker = Worker(gator)
-    worker.run_forever()
+    if blob_dir:
+        gator_kwargs["blob_store"] = FileBlobStore(blob_dir)
 
+    if lease_time:
+        gator_kwargs["lease_time"] = lease_time
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python latergator.py <DSN>")
-        sys.exit(1)
+    if dead_letter_queue:
+        gator_kwargs["dead_letter_queue"] = dead_letter_queue
+
+    if beat:
+        # The periodic tasks are registered as the modules are imported.
+        for module_name in imports or []:
+            import_module(module_name)
+
+        gator = Gator(dsn, queue_name=queue_name, **gator_kwargs)
+        scheduler = Scheduler(gator)
+        return scheduler.run_forever()
+
+    if processes > 1:
+        supervisor = Supervisor(
+            dsn,
+            processes=processes,
+            max_tasks=max_tasks,
+            queue_name=queue_name,
+            imports=imports,
+            gator_kwargs=gator_kwargs,
+        )
+        return supervisor.run_forever()
+
+    gator = Gator(dsn, queue_name=queue_name, **gator_kwargs)
 
-    dsn = sys.argv[1]
-    main(dsn)
+    worker = Worker(gator, max_tasks=max_tasks, to_consume=queue_name)
+    return worker.run_forever()
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="latergator.py", description="Runs Alligator workers."
+    )
+    parser.add_argument("dsn", help="The DSN of the queue to consume.")
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        default=1,
+        help="The number of worker processes to fork. Defaults to 1.",
+    )
+    parser.add_argument(
+        "-m",
+        "--max-tasks",
+        type=int,
+        default=0,
+        help=(
+            "The number of tasks a worker consumes before exiting "
+            "(& being replaced, with --processes). Defaults to 0 (unlimited)."
+        ),
+    )
+    parser.add_argument(
+        "-q",
+        "--queue",
+        default=ALL,
+        help='The name of the queue to consume. Defaults to "all".',
+    )
+    parser.add_argument(
+        "-i",
+        "--import",
+        dest="imports",
+        action="append",
+        default=[],
+        help=(
+            "A task module to import before forking (or, with --beat, that "
+            "registers periodic tasks). Can be given more than once."
+        ),
+    )
+    parser.add_argument(
+        "-b",
+        "--blob-dir",
+        default=None,
+        help=(
+            "The directory oversized tasks are stored in (see "
+            "alligator.blobs.FileBlobStore). Defaults to none."
+        ),
+    )
+    parser.add_argument(
+        "-l",
+        "--lease-time",
+        type=float,
+        default=None,
+        help=(
+            "Reserve tasks for this many seconds, only removing them once "
+            "they've run (see Gator.lease_time). Defaults to none."
+        ),
+    )
+    parser.add_argument(
+        "-d",
+        "--dead-letter-queue",
+        default=None,
+        help=(
+            "The queue to move tasks that can't be processed to (see "
+            "Gator.dead_letter_queue). Defaults to none."
+        ),
+    )
+    parser.add_argument(
+        "--beat",
+        action="store_true",
+        default=False,
+        help=(
+            "Run the scheduler, pushing periodic tasks onto the queue (see "
+            "alligator.schedules), instead of a worker."
+        ),
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    args = get_parser().parse_args()
+    sys.exit(
+        main(
+            args.dsn,
+            processes=args.processes,
+            max_tasks=args.max_tasks,
+            queue_name=args.queue,
+            imports=args.imports,
+            blob_dir=args.blob_dir,
+            lease_time=args.lease_time,
+            dead_letter_queue=args.dead_letter_queue,
+            beat=args.beat,
+        )
+    )
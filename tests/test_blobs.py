@@ -0,0 +1,48 @@
+import os
+import shutil
+import unittest
+
+from alligator.blobs import FileBlobStore
+from alligator.exceptions import MissingBlobError
+
+
+BLOB_DIR = "/tmp/alligator_test_blobs"
+
+
+class FileBlobStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        super(FileBlobStoreTestCase, self).setUp()
+        shutil.rmtree(BLOB_DIR, ignore_errors=True)
+        self.store = FileBlobStore(BLOB_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(BLOB_DIR, ignore_errors=True)
+        super(FileBlobStoreTestCase, self).tearDown()
+
+    def test_put(self):
+        key = self.store.put(b"a fat payload")
+        self.assertEqual(len(key), 64)
+        self.assertTrue(os.path.exists(self.store.key_path(key)))
+
+        # Content-addressed, so the same payload is stored once.
+        self.assertEqual(self.store.put(b"a fat payload"), key)
+        self.assertEqual(os.listdir(os.path.join(BLOB_DIR, key[:2])), [key])
+
+    def test_open(self):
+        key = self.store.put(b"a fat payload")
+
+        with self.store.open(key) as blob:
+            self.assertEqual(blob[:5], b"a fat")
+
+        self.assertEqual(self.store.get(key), b"a fat payload")
+
+        with self.assertRaises(MissingBlobError):
+            self.store.get("nope" * 16)
+
+    def test_delete(self):
+        key = self.store.put(b"a fat payload")
+        self.store.delete(key)
+        self.assertFalse(os.path.exists(self.store.key_path(key)))
+
+        # Already gone is fine.
+        self.store.delete(key)
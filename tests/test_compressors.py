@@ -0,0 +1,41 @@
+import unittest
+
+from alligator import compressors
+from alligator.compressors import (
+    LZMACompressor,
+    ZlibCompressor,
+    ZstdCompressor,
+    get_compressor,
+)
+from alligator.exceptions import UnknownCompressorError
+
+
+RAW = b"<li>A rendered template, repeated a whole bunch.</li>" * 200
+
+
+class CompressorsTestCase(unittest.TestCase):
+    def assertRoundTrip(self, compressor):
+        compressed = compressor.compress(RAW)
+        self.assertTrue(len(compressed) * 10 < len(RAW))
+        self.assertEqual(compressor.decompress(compressed), RAW)
+
+    def test_get_compressor(self):
+        self.assertEqual(get_compressor(None), None)
+        self.assertTrue(isinstance(get_compressor("zlib"), ZlibCompressor))
+        self.assertTrue(isinstance(get_compressor(2), LZMACompressor))
+
+        zlib = ZlibCompressor(level=1)
+        self.assertEqual(get_compressor(zlib), zlib)
+
+        with self.assertRaises(UnknownCompressorError):
+            get_compressor("rar")
+
+    def test_zlib(self):
+        self.assertRoundTrip(ZlibCompressor())
+
+    def test_lzma(self):
+        self.assertRoundTrip(LZMACompressor())
+
+    @unittest.skipIf(compressors.zstandard is None, "zstandard not installed")
+    def test_zstd(self):
+        self.assertRoundTrip(ZstdCompressor())
@@ -1,10 +1,13 @@
 import os
+import threading
+import time
 import unittest
 from unittest import mock
 
 from alligator.backends.sqlite_backend import Client as SQLiteClient
 from alligator.constants import ALL
 from alligator.gator import Gator, Options
+from alligator.serializers import get_serializer
 from alligator.tasks import Task
 
 
@@ -49,6 +52,290 @@ class CustomBackendTestCase(unittest.TestCase):
         self.gator.backend.drop_all(ALL)
         self.assertEqual(self.gator.backend.len(ALL), 0)
 
+    def test_push_many(self):
+        self.assertEqual(self.gator.backend.len(ALL), 0)
+
+        self.gator.push_many(add, [(1, 3), (5, 7), (3, 13)])
+        self.assertEqual(self.gator.backend.len(ALL), 3)
+
+        self.assertEqual(self.gator.pop().result, 4)
+        self.assertEqual(self.gator.pop().result, 12)
+        self.assertEqual(self.gator.pop().result, 16)
+
+    def test_binary(self):
+        self.gator.serializer = get_serializer("marshal")
+        task = self.gator.task(add, 2, 5)
+
+        data = self.gator.backend.get(ALL, task.task_id)
+        self.assertTrue(isinstance(data, bytes))
+        self.assertEqual(self.gator.process(data).result, 7)
+
+    def test_pop_many(self):
+        self.gator.push_many(add, [(1, 3), (5, 7), (3, 13)])
+
+        fetched = self.gator.backend.pop_many(ALL, 2)
+        self.assertEqual(len(fetched), 2)
+        self.assertEqual(self.gator.backend.len(ALL), 1)
+        self.assertEqual(self.gator.process(fetched[0]).result, 4)
+        self.assertEqual(self.gator.process(fetched[1]).result, 12)
+
+        fetched = self.gator.backend.pop_many(ALL, 2)
+        self.assertEqual(len(fetched), 1)
+        self.assertEqual(self.gator.backend.len(ALL), 0)
+
+    def test_auto_create_tables(self):
+        gator = Gator(self.conn_string, queue_name="fresh")
+        gator.task(add, 1, 3)
+        self.assertEqual(gator.backend.len("fresh"), 1)
+        self.assertEqual(gator.pop().result, 4)
+
+    def test_wal(self):
+        cur = self.gator.backend.conn.execute("PRAGMA journal_mode")
+        self.assertEqual(cur.fetchone()[0], "wal")
+
+    def test_push_same_task_id(self):
+        self.gator.backend.push(ALL, "abc", "first")
+        self.gator.backend.push(ALL, "abc", "second")
+        self.assertEqual(self.gator.backend.len(ALL), 1)
+        self.assertEqual(self.gator.backend.get(ALL, "abc"), "second")
+        self.assertEqual(self.gator.backend.get(ALL, "abc"), None)
+
+    def test_concurrent_pops(self):
+        self.gator.push_many(add, [(i, i) for i in range(100)])
+        results = []
+
+        def consume():
+            backend = SQLiteClient(self.conn_string)
+
+            while True:
+                fetched = backend.pop_many(ALL, 3)
+
+                if not fetched:
+                    break
+
+                results.extend(fetched)
+
+        threads = [threading.Thread(target=consume) for i in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 100)
+        self.assertEqual(len(set(results)), 100)
+
+    @mock.patch("alligator.backends.sqlite_backend.HAS_RETURNING", False)
+    def test_pop_without_returning(self):
+        self.gator.push_many(add, [(1, 3), (5, 7), (3, 13)])
+
+        fetched = self.gator.backend.pop_many(ALL, 2)
+        self.assertEqual(self.gator.process(fetched[0]).result, 4)
+        self.assertEqual(self.gator.process(fetched[1]).result, 12)
+        self.assertEqual(self.gator.backend.len(ALL), 1)
+
+    def test_durability(self):
+        self.assertEqual(self.gator.backend.durability, "normal")
+
+        backend = SQLiteClient(self.conn_string + "?durability=full")
+        self.assertEqual(backend.path, "/tmp/alligator_test.db")
+        cur = backend.conn.execute("PRAGMA synchronous")
+        # ``FULL``
+        self.assertEqual(cur.fetchone()[0], 2)
+
+        with self.assertRaises(ValueError):
+            SQLiteClient(self.conn_string + "?durability=nope")
+
+    def test_batch_durability(self):
+        gator = Gator(
+            self.conn_string
+            + "?durability=batch&batch_size=3&batch_interval=60000"
+        )
+        outside = SQLiteClient(self.conn_string)
+
+        gator.task(add, 1, 3)
+        gator.task(add, 5, 7)
+        # Still buffered.
+        self.assertEqual(outside.len(ALL), 0)
+
+        # Reads flush first.
+        self.assertEqual(gator.backend.len(ALL), 2)
+        self.assertEqual(outside.len(ALL), 2)
+
+        # Filling the buffer flushes it.
+        gator.push_many(add, [(1, 1), (2, 2), (3, 3)])
+        self.assertEqual(outside.len(ALL), 5)
+
+        gator.task(add, 3, 13)
+        self.assertEqual(outside.len(ALL), 5)
+        gator.flush()
+        self.assertEqual(outside.len(ALL), 6)
+
+        self.assertEqual(gator.pop().result, 4)
+
+    def test_batch_interval(self):
+        gator = Gator(self.conn_string + "?durability=batch&batch_interval=10")
+        outside = SQLiteClient(self.conn_string)
+        gator.task(add, 1, 3)
+
+        for i in range(100):
+            if outside.len(ALL):
+                break
+
+            time.sleep(0.01)
+
+        self.assertEqual(outside.len(ALL), 1)
+
+    def test_reserve(self):
+        backend = self.gator.backend
+        self.gator.push_many(add, [(1, 3), (5, 7)])
+
+        reserved = backend.reserve(ALL, 5, 30)
+        self.assertEqual(len(reserved), 2)
+        self.assertEqual(backend.len(ALL), 0)
+
+        backend.ack(ALL, reserved[0][0])
+        backend.nack(ALL, reserved[1][0])
+        self.assertEqual(backend.len(ALL), 1)
+        self.assertEqual(self.gator.pop().result, 12)
+        self.assertEqual(backend.reap(ALL), 0)
+
+    def test_priority(self):
+        backend = self.gator.backend
+        backend.push(ALL, "low", "1")
+        backend.push(ALL, "high", "2", priority=9)
+        backend.push_many(ALL, [("mid", "3", None)], priority=5)
+        self.assertEqual(backend.pop_many(ALL, 2), ["2", "3"])
+
+        # Re-queued tasks keep their priority.
+        backend.push(ALL, "urgent", "4", priority=5)
+        reserved = backend.reserve(ALL, 1, 30)
+        self.assertEqual(reserved, [("urgent", "4")])
+        backend.nack(ALL, "urgent")
+        self.assertEqual(backend.pop_many(ALL, 5), ["4", "1"])
+
+        # Parked tasks too.
+        backend.park(ALL, "parked", "5", ["first"], priority=3)
+        backend.push(ALL, "plain", "6")
+        backend.mark_complete(ALL, "first")
+        self.assertEqual(backend.pop_many(ALL, 5), ["5", "6"])
+
+        with mock.patch(
+            "alligator.backends.sqlite_backend.HAS_RETURNING", False
+        ):
+            backend.push(ALL, "low", "1")
+            backend.push(ALL, "high", "2", priority=9)
+            self.assertEqual(backend.pop_many(ALL, 2), ["2", "1"])
+
+    def test_add_priority(self):
+        backend = self.gator.backend
+        backend.conn.execute(
+            "CREATE TABLE `queue_old` ("
+            "id INTEGER PRIMARY KEY, "
+            "task_id TEXT NOT NULL UNIQUE, "
+            "data BLOB, "
+            "delay_until REAL NOT NULL"
+            ")"
+        )
+        backend.setup_tables(queue_name="old")
+        backend.push("old", "hello", "1", priority=2)
+        self.assertEqual(backend.pop("old"), "1")
+
+    @mock.patch("time.time")
+    def test_reap(self, mock_time):
+        mock_time.return_value = 12345678
+        backend = self.gator.backend
+        self.gator.task(add, 1, 3)
+        backend.reserve(ALL, 1, 30)
+
+        self.assertEqual(backend.reap(ALL), 0)
+        mock_time.return_value = 12345708
+        self.assertEqual(backend.reap(ALL), 1)
+        self.assertEqual(self.gator.pop().result, 4)
+
+    def test_park(self):
+        backend = self.gator.backend
+        backend.push(ALL, "first", "1")
+        backend.push(ALL, "other", "0")
+        backend.park(ALL, "second", "2", ["first", "other"])
+        backend.park(ALL, "third", "3", ["second"], delay_until=1)
+        self.assertEqual(backend.len(ALL), 2)
+
+        self.assertEqual(backend.pop(ALL), "1")
+        self.assertEqual(backend.mark_complete(ALL, "first"), 0)
+        self.assertEqual(backend.pop(ALL), "0")
+        self.assertEqual(backend.mark_complete(ALL, "other"), 1)
+        self.assertEqual(backend.pop_many(ALL, 5), ["2"])
+        self.assertEqual(backend.mark_complete(ALL, "second"), 1)
+        self.assertEqual(backend.pop_many(ALL, 5), ["3"])
+
+        # Dependencies that are no longer queued don't count.
+        backend.park(ALL, "fourth", "4", ["first"])
+        self.assertEqual(backend.pop(ALL), "4")
+
+        # Reserved ones still do.
+        backend.push(ALL, "nope", "6")
+        backend.reserve(ALL, 1, 30)
+        backend.park(ALL, "fifth", "5", ["nope"])
+        self.assertEqual(backend.len(ALL), 0)
+        backend.ack(ALL, "nope")
+        self.assertEqual(backend.mark_complete(ALL, "nope"), 1)
+        self.assertEqual(backend.pop(ALL), "5")
+
+        # Parked tasks can still be fetched by ID.
+        backend.push(ALL, "later", "7")
+        backend.park(ALL, "sixth", "8", ["later"])
+        self.assertEqual(backend.get(ALL, "sixth"), "8")
+
+    @mock.patch("time.time")
+    def test_lock(self, mock_time):
+        mock_time.return_value = 12345678
+        backend = self.gator.backend
+        self.assertTrue(backend.acquire_lock("beat", "first", 30))
+        self.assertFalse(backend.acquire_lock("beat", "second", 30))
+        self.assertTrue(backend.acquire_lock("beat", "first", 30))
+
+        backend.release_lock("beat", "second")
+        self.assertFalse(backend.acquire_lock("beat", "second", 30))
+        backend.release_lock("beat", "first")
+        self.assertTrue(backend.acquire_lock("beat", "second", 30))
+
+        mock_time.return_value = 12345708
+        self.assertTrue(backend.acquire_lock("beat", "first", 30))
+
+    @mock.patch("time.time")
+    def test_promote_delayed(self, mock_time):
+        mock_time.return_value = 12345678
+        backend = self.gator.backend
+
+        for offset, task_id in enumerate(["first", "second", "third"]):
+            backend.push(ALL, task_id, task_id, 12345700 + offset)
+
+        backend.push(ALL, "much_later", "4", 12399999)
+        backend.push(ALL, "hello", "5")
+
+        # Delayed tasks are kept off the queue until they're due.
+        cur = backend.conn.execute("SELECT COUNT(*) FROM `delayed_all`")
+        self.assertEqual(cur.fetchone()[0], 4)
+        self.assertEqual(backend.len(ALL), 5)
+        self.assertEqual(backend.pop_many(ALL, 5), ["5"])
+
+        mock_time.return_value = 12345710
+
+        with mock.patch("alligator.backends.sqlite_backend.PROMOTE_BATCH", 2):
+            self.assertEqual(backend.pop_many(ALL, 5), ["first", "second"])
+            self.assertEqual(backend.pop_many(ALL, 5), ["third"])
+
+        # Re-pushing a delayed task without a delay replaces it.
+        backend.push(ALL, "much_later", "6")
+        self.assertEqual(backend.len(ALL), 1)
+        self.assertEqual(backend.pop(ALL), "6")
+
+        backend.push(ALL, "even_later", "7", 12399999)
+        self.assertEqual(backend.get(ALL, "even_later"), "7")
+        self.assertEqual(backend.len(ALL), 0)
+
     @mock.patch("time.time")
     def test_delay_until(self, mock_time):
         mock_time.return_value = 12345678
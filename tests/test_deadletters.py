@@ -0,0 +1,40 @@
+import unittest
+
+from alligator.deadletters import DeadLetter
+from alligator.tasks import Task
+
+
+class DeadLetterTestCase(unittest.TestCase):
+    def test_from_error(self):
+        task = Task(task_id="hello")
+        task.attempts = 4
+
+        letter = DeadLetter.from_error(
+            '{"task_id": "hello"}',
+            IOError("Math is hard."),
+            task=task,
+            queue_name="all",
+        )
+        self.assertEqual(letter.error_class, "builtins.OSError")
+        self.assertEqual(letter.error, "Math is hard.")
+        self.assertEqual(letter.task_id, "hello")
+        self.assertEqual(letter.attempts, 4)
+        self.assertEqual(letter.queue_name, "all")
+        self.assertTrue(letter.dead_letter_id.startswith("dead:"))
+        self.assertTrue(letter.failed_at > 0)
+
+    def test_round_trip(self):
+        letter = DeadLetter(
+            b"\xa7\x02\x00binary",
+            error_class="alligator.exceptions.UnknownCallableError",
+            error="Nope.",
+            failed_at=12345678,
+        )
+        restored = DeadLetter.deserialize(letter.serialize())
+        self.assertEqual(restored.payload, b"\xa7\x02\x00binary")
+        self.assertEqual(restored.to_dict(), letter.to_dict())
+
+        letter = DeadLetter('{"task_id": "hello"}', task_id="hello")
+        restored = DeadLetter.deserialize(letter.serialize())
+        self.assertEqual(restored.payload, '{"task_id": "hello"}')
+        self.assertEqual(restored.task_id, "hello")
@@ -1,8 +1,13 @@
+import asyncio
 import os
+import shutil
+import time
 import unittest
 
+from alligator import serializers
 from alligator.backends.locmem_backend import Client as LocmemClient
 from alligator.backends.redis_backend import Client as RedisClient
+from alligator.blobs import FileBlobStore
 from alligator.constants import (
     ALL,
     WAITING,
@@ -11,14 +16,32 @@ from alligator.constants import (
     RETRYING,
     CANCELED,
 )
-from alligator.gator import Gator
-from alligator.tasks import Task
+from alligator.exceptions import (
+    MissingBlobError,
+    NoResultStoreError,
+    ResultTimeoutError,
+    TaskFailed,
+    UnknownCallableError,
+)
+from alligator.gator import AsyncGator, Gator, Reservation
+from alligator.results import LocmemResultStore
+from alligator.retries import FixedBackoff
+from alligator.tasks import LightTask, Task
 
 
 class CustomTask(Task):
     pass
 
 
+class OldStyleTask(Task):
+    def serialize(self):
+        return super(OldStyleTask, self).serialize()
+
+    @classmethod
+    def deserialize(cls, data):
+        return super(OldStyleTask, cls).deserialize(data)
+
+
 class CustomClient(LocmemClient):
     pass
 
@@ -45,6 +68,11 @@ def eventual_success():
     return wrapped
 
 
+async def so_async(initial, incr):
+    await asyncio.sleep(0)
+    return initial + incr
+
+
 class GatorTestCase(unittest.TestCase):
     def setUp(self):
         super(GatorTestCase, self).setUp()
@@ -96,6 +124,166 @@ class GatorTestCase(unittest.TestCase):
         self.assertEqual(self.gator.backend.len(ALL), 0)
         self.assertEqual(res.result, 2)
 
+    def test_push_many(self):
+        self.assertEqual(self.gator.backend.len(ALL), 0)
+
+        tasks = self.gator.push_many(
+            so_computationally_expensive,
+            [(1, 1), [2, 3], {"initial": 5, "incr": 8}],
+            batch_size=2,
+        )
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual(self.gator.backend.len(ALL), 3)
+
+        self.assertEqual(self.gator.pop().result, 2)
+        self.assertEqual(self.gator.pop().result, 5)
+        self.assertEqual(self.gator.pop().result, 13)
+
+    def test_push_many_fallback(self):
+        class NoBatchClient(LocmemClient):
+            push_many = None
+
+        gator = Gator("locmem://", backend_class=NoBatchClient)
+        gator.push_many(so_computationally_expensive, [(1, 1), (2, 3)])
+        self.assertEqual(gator.backend.len(ALL), 2)
+
+    def test_push_many_sync(self):
+        tasks = self.gator.push_many(
+            so_computationally_expensive, [(1, 1), (2, 3)], is_async=False
+        )
+        self.assertEqual(self.gator.backend.len(ALL), 0)
+        self.assertEqual([task.result for task in tasks], [2, 5])
+
+    def test_priority(self):
+        if self.gator.backend.__class__.__module__.endswith("sqs_backend"):
+            self.skipTest("SQS doesn't support priorities.")
+
+        self.gator.task(so_computationally_expensive, 1, 1)
+
+        with self.gator.options(priority=5) as opts:
+            opts.task(so_computationally_expensive, 2, 3)
+
+        self.gator.push_many(
+            so_computationally_expensive, [(4, 5), (6, 7)], priority=9
+        )
+
+        results = [self.gator.pop().result for _ in range(4)]
+        self.assertEqual(results, [9, 13, 5, 2])
+
+    def test_for_queue(self):
+        urgent = self.gator.for_queue("urgent")
+        self.assertEqual(urgent.queue_name, "urgent")
+        self.assertEqual(self.gator.queue_name, ALL)
+        self.assertTrue(urgent.backend is self.gator.backend)
+
+        urgent.backend.drop_all("urgent")
+        urgent.task(so_computationally_expensive, 1, 1)
+        self.assertEqual(urgent.len(), 1)
+        self.assertEqual(self.gator.len(), 0)
+        self.assertEqual(urgent.pop().result, 2)
+
+    def test_serializer(self):
+        gator = Gator(self.conn_string, serializer="marshal")
+        task = gator.task(so_computationally_expensive, 3, 4)
+        self.assertEqual(gator.backend.len(ALL), 1)
+
+        data = gator.backend.get(ALL, task.task_id)
+        self.assertTrue(isinstance(data, bytes))
+        self.assertEqual(gator.process(data).result, 7)
+
+    def test_compressor(self):
+        gator = Gator(self.conn_string, compressor="zlib")
+        fat = "a rendered template " * 5000
+        task = gator.task(len, fat)
+
+        data = gator.backend.get(ALL, task.task_id)
+        self.assertTrue(len(data) * 10 < len(fat))
+        self.assertEqual(gator.process(data).result, len(fat))
+
+    def test_blob_store(self):
+        blob_store = FileBlobStore("/tmp/alligator_test_gator_blobs")
+        gator = Gator(
+            self.conn_string,
+            serializer="marshal",
+            blob_store=blob_store,
+            blob_threshold=1024,
+        )
+        fat = "a rendered template " * 500
+        task = gator.task(len, fat)
+        small = gator.task(len, "tiny")
+
+        # Only a claim check (& the task's head) goes in the queue.
+        data = gator.backend.get(ALL, task.task_id)
+        key = serializers.blob_key(data)
+        self.assertTrue(len(data) < 200)
+        self.assertTrue(os.path.exists(blob_store.key_path(key)))
+        self.assertEqual(
+            serializers.blob_key(gator.backend.get(ALL, small.task_id)), None
+        )
+
+        with self.assertRaises(MissingBlobError):
+            Task.deserialize(data)
+
+        self.assertEqual(gator.process(data).result, len(fat))
+        self.assertFalse(os.path.exists(blob_store.key_path(key)))
+
+    def test_blob_store_failed(self):
+        path = "/tmp/alligator_test_gator_failed_blobs"
+        shutil.rmtree(path, ignore_errors=True)
+        gator = Gator(
+            self.conn_string,
+            blob_store=FileBlobStore(path),
+            blob_threshold=1024,
+        )
+        fat = "a rendered template " * 500
+
+        def count_blobs():
+            return sum(len(files) for _, _, files in os.walk(path))
+
+        # Without a dead letter queue, the blob goes with the task.
+        gator.task(fail_task, fat, 1)
+
+        with self.assertRaises(IOError):
+            gator.pop()
+
+        self.assertEqual(count_blobs(), 0)
+
+        # Otherwise, the dead letter keeps the claim check (& the blob).
+        gator.dead_letter_queue = "all:dead"
+        gator.backend.drop_all("all:dead")
+
+        with gator.options(retries=1) as opts:
+            opts.task(fail_task, fat, 1)
+
+        self.assertEqual(gator.pop(), None)
+        self.assertEqual(count_blobs(), 1)
+
+        with self.assertRaises(IOError):
+            gator.pop()
+
+        self.assertEqual(count_blobs(), 1)
+        letter = gator.replay()[0]
+        key = serializers.blob_key(letter.payload)
+        self.assertTrue(os.path.exists(gator.blob_store.key_path(key)))
+
+        with self.assertRaises(IOError):
+            gator.pop()
+
+        self.assertEqual(count_blobs(), 1)
+
+    def test_light_task(self):
+        gator = Gator(self.conn_string, task_class=LightTask)
+        gator.task(so_computationally_expensive, 3, 4)
+
+        complete = gator.pop()
+        self.assertTrue(isinstance(complete, LightTask))
+        self.assertEqual(complete.result, 7)
+
+    def test_old_style_task_class(self):
+        gator = Gator(self.conn_string, task_class=OldStyleTask)
+        gator.task(so_computationally_expensive, 3, 4)
+        self.assertEqual(gator.pop().result, 7)
+
     def test_pop(self):
         self.assertEqual(self.gator.backend.len(ALL), 0)
 
@@ -106,6 +294,188 @@ class GatorTestCase(unittest.TestCase):
         complete = self.gator.pop()
         self.assertEqual(complete.result, 2)
 
+    def test_fetch(self):
+        self.assertEqual(self.gator.fetch(), [])
+
+        self.gator.push_many(so_computationally_expensive, [(1, 1), (2, 3)])
+        self.gator.task(so_computationally_expensive, 5, 8)
+
+        fetched = self.gator.fetch(2)
+        self.assertEqual(len(fetched), 2)
+        self.assertEqual(self.gator.backend.len(ALL), 1)
+
+        self.assertEqual(self.gator.process(fetched[0]).result, 2)
+        self.assertEqual(self.gator.process(fetched[1]).result, 5)
+
+        fetched = self.gator.fetch(2)
+        self.assertEqual(len(fetched), 1)
+        self.assertEqual(self.gator.process(fetched[0]).result, 13)
+
+    def test_fetch_timeout(self):
+        self.assertEqual(self.gator.fetch(timeout=0.1), [])
+
+        self.gator.task(so_computationally_expensive, 5, 8)
+        fetched = self.gator.fetch(5, timeout=1)
+        self.assertEqual(len(fetched), 1)
+        self.assertEqual(self.gator.process(fetched[0]).result, 13)
+
+    def test_reserve(self):
+        gator = Gator(self.conn_string, lease_time=30)
+        self.assertTrue(gator.can_reserve())
+        self.assertFalse(gator.can_block())
+        self.assertFalse(self.gator.can_reserve())
+
+        gator.push_many(so_computationally_expensive, [(1, 1), (2, 3)])
+        fetched = gator.fetch(5, timeout=1)
+        self.assertEqual(len(fetched), 2)
+        self.assertTrue(isinstance(fetched[0], Reservation))
+        self.assertEqual(gator.backend.len(ALL), 0)
+
+        self.assertEqual(gator.process(fetched[0]).result, 2)
+
+        # Failures are acknowledged too, once retries are used up.
+        gator.task(fail_task, 1, 1)
+
+        with self.assertRaises(IOError):
+            gator.pop()
+
+        # Unacknowledged tasks go back on the queue.
+        self.assertEqual(gator.backend.reap(ALL), 0)
+        gator.nack(fetched[1])
+        self.assertEqual(gator.backend.len(ALL), 1)
+        self.assertEqual(gator.pop().result, 5)
+        self.assertEqual(gator.pop(), None)
+
+    def test_reserve_retry(self):
+        gator = Gator(self.conn_string, lease_time=30)
+
+        with gator.options(retries=1) as opts:
+            opts.task(fail_task, 1, 1)
+
+        # The failed attempt is acknowledged, but its retry stays queued.
+        self.assertEqual(gator.pop(), None)
+        self.assertEqual(gator.backend.len(ALL), 1)
+
+        with self.assertRaises(IOError):
+            gator.pop()
+
+        self.assertEqual(gator.backend.len(ALL), 0)
+        self.assertEqual(gator.reap(), 0)
+
+    def test_reserve_expired(self):
+        gator = Gator(self.conn_string, lease_time=0.1)
+        gator.task(so_computationally_expensive, 5, 8)
+
+        # Reserved by a worker that then "dies".
+        self.assertEqual(len(gator.fetch()), 1)
+        self.assertEqual(gator.fetch(), [])
+
+        time.sleep(0.2)
+        fetched = gator.fetch()
+        self.assertEqual(len(fetched), 1)
+        self.assertEqual(gator.process(fetched[0]).result, 13)
+
+        time.sleep(0.2)
+        self.assertEqual(gator.reap(), 0)
+        self.assertEqual(gator.fetch(), [])
+
+    def test_depends_on(self):
+        first = self.gator.task(so_computationally_expensive, 1, 1)
+
+        with self.gator.options(depends_on=[first]) as opts:
+            second = opts.task(so_computationally_expensive, 2, 3)
+            third = opts.task_many(so_computationally_expensive, [(3, 5)])[0]
+
+        self.assertTrue(self.gator.can_park(second))
+        self.assertFalse(self.gator.can_park(first))
+        self.assertEqual(second.depends_on, [first.task_id])
+
+        # Only the dependency is runnable.
+        self.assertEqual(self.gator.backend.len(ALL), 1)
+        self.assertEqual(self.gator.pop().task_id, first.task_id)
+
+        popped = sorted(
+            self.gator.process(data).task_id for data in self.gator.fetch(5)
+        )
+        self.assertEqual(popped, sorted([second.task_id, third.task_id]))
+
+        # Dependencies that are no longer queued don't hold tasks back.
+        with self.gator.options(depends_on=[first.task_id]) as opts:
+            opts.task(so_computationally_expensive, 8, 13)
+
+        self.assertEqual(self.gator.pop().result, 21)
+
+    def test_depends_on_reserved(self):
+        gator = Gator(self.conn_string, lease_time=30)
+        first = gator.task(so_computationally_expensive, 1, 1)
+        fetched = gator.fetch()
+
+        # Still running, so it holds the task back.
+        with gator.options(depends_on=[first]) as opts:
+            second = opts.task(so_computationally_expensive, 2, 3)
+
+        self.assertEqual(gator.backend.len(ALL), 0)
+        self.assertEqual(gator.process(fetched[0]).result, 2)
+        self.assertEqual(gator.pop().task_id, second.task_id)
+
+    def test_depends_on_failed(self):
+        first = self.gator.task(fail_task, 1, 1)
+
+        with self.gator.options(depends_on=[first]) as opts:
+            opts.task(so_computationally_expensive, 2, 3)
+
+        with self.assertRaises(IOError):
+            self.gator.pop()
+
+        # Tasks that depend on a failure stay parked.
+        self.assertEqual(self.gator.backend.len(ALL), 0)
+
+    def test_results(self):
+        LocmemResultStore.results.clear()
+        gator = Gator(self.conn_string, result_store=LocmemResultStore())
+
+        task = gator.task(so_computationally_expensive, 2, 3)
+        failing = gator.task(fail_task, 1, 1)
+        self.assertFalse(task.ready())
+
+        with self.assertRaises(ResultTimeoutError):
+            task.wait(timeout=0.01)
+
+        gator.pop()
+
+        with self.assertRaises(IOError):
+            gator.pop()
+
+        self.assertTrue(task.ready())
+        self.assertEqual(task.status, SUCCESS)
+        self.assertEqual(task.wait(timeout=1), 5)
+
+        with self.assertRaises(TaskFailed):
+            failing.wait(timeout=1)
+
+        results = gator.get_results([task, failing.task_id, "nope"])
+        self.assertEqual(
+            sorted(results), sorted([task.task_id, failing.task_id])
+        )
+        self.assertEqual(results[task.task_id].get(), 5)
+        self.assertEqual(results[failing.task_id].status, FAILED)
+
+    def test_results_missing_store(self):
+        task = self.gator.task(so_computationally_expensive, 2, 3)
+
+        with self.assertRaises(NoResultStoreError):
+            task.wait()
+
+        with self.assertRaises(NoResultStoreError):
+            self.gator.get_results([task])
+
+        # Sync tasks don't need a store.
+        with self.gator.options(is_async=False) as opts:
+            task = opts.task(so_computationally_expensive, 2, 3)
+
+        self.assertTrue(task.ready())
+        self.assertEqual(task.wait(), 5)
+
     def test_get(self):
         self.assertEqual(self.gator.backend.len(ALL), 0)
 
@@ -159,6 +529,88 @@ class GatorTestCase(unittest.TestCase):
             self.assertEqual(task.retries, 0)
             self.assertEqual(task.status, FAILED)
 
+    def test_execute_backoff(self):
+        task = Task(retries=3, retry_policy=FixedBackoff(60))
+        task.to_call(fail_task, 2, 7)
+
+        self.assertEqual(self.gator.execute(task), None)
+        self.assertEqual(task.status, RETRYING)
+        self.assertEqual(task.retries, 2)
+        self.assertEqual(task.attempts, 1)
+        self.assertTrue(task.delay_until > time.time() + 50)
+
+        # Not due yet.
+        self.assertEqual(self.gator.backend.len(ALL), 1)
+        self.assertEqual(self.gator.pop(), None)
+
+    def test_execute_retry_on(self):
+        task = Task(retries=3, retry_policy=FixedBackoff(retry_on=[KeyError]))
+        task.to_call(fail_task, 2, 7)
+
+        with self.assertRaises(IOError):
+            self.gator.execute(task)
+
+        self.assertEqual(task.retries, 3)
+        self.assertEqual(self.gator.backend.len(ALL), 0)
+
+    def test_dead_letter_exhausted(self):
+        gator = Gator(self.conn_string, dead_letter_queue="all:dead")
+        gator.backend.drop_all("all:dead")
+
+        with gator.options(retries=1) as opts:
+            task = opts.task(fail_task, 2, 7)
+
+        # The retry goes back on the queue, the final failure doesn't.
+        with self.assertRaises(IOError):
+            gator.pop()
+            gator.pop()
+
+        self.assertEqual(gator.backend.len(ALL), 0)
+        self.assertEqual(gator.backend.len("all:dead"), 1)
+
+        replayed = gator.replay()
+        self.assertEqual(len(replayed), 1)
+        self.assertEqual(replayed[0].task_id, task.task_id)
+        self.assertEqual(replayed[0].error_class, "builtins.OSError")
+        self.assertEqual(replayed[0].attempts, 2)
+        self.assertEqual(gator.backend.len("all:dead"), 0)
+
+        # Back on the queue, with no retries left.
+        fetched = gator.fetch()
+        self.assertEqual(gator.deserialize(fetched[0]).retries, 0)
+
+    def test_dead_letter_undeserializable(self):
+        gator = Gator(self.conn_string, dead_letter_queue="all:dead")
+        gator.backend.drop_all("all:dead")
+        task = Task()
+        task.to_call(so_computationally_expensive, 2, 7)
+        # As if the callable was renamed in a later deploy.
+        broken = task.serialize().replace("so_computationally", "gone")
+        gator.backend.push(ALL, task.task_id, broken)
+
+        with self.assertRaises(UnknownCallableError):
+            gator.pop()
+
+        self.assertEqual(gator.backend.len("all:dead"), 1)
+
+        replayed = gator.replay(count=5)
+        self.assertEqual(len(replayed), 1)
+        self.assertEqual(replayed[0].task_id, None)
+        self.assertEqual(
+            replayed[0].error_class,
+            "alligator.exceptions.UnknownCallableError",
+        )
+        self.assertEqual(gator.backend.len(ALL), 1)
+        self.assertEqual(gator.backend.pop(ALL), replayed[0].payload)
+
+    def test_dead_letter_disabled(self):
+        self.gator.task(fail_task, 2, 7)
+
+        with self.assertRaises(IOError):
+            self.gator.pop()
+
+        self.assertEqual(self.gator.dead_letter(b"", IOError()), None)
+
     def test_execute_retries(self):
         task = Task(retries=3, is_async=True)
         task.to_call(eventual_success(), 2, 7)
@@ -196,3 +648,179 @@ class GatorTestCase(unittest.TestCase):
 
         self.assertEqual(res.retries, 2)
         self.assertEqual(res.result, 12)
+
+    def test_options_task_many(self):
+        self.assertEqual(self.gator.backend.len(ALL), 0)
+
+        with self.gator.options(retries=2) as opts:
+            tasks = opts.task_many(
+                so_computationally_expensive, [(1, 1), (4, 5)]
+            )
+
+        self.assertEqual(self.gator.backend.len(ALL), 2)
+        self.assertEqual([task.retries for task in tasks], [2, 2])
+
+
+class AsyncGatorTestCase(unittest.TestCase):
+    def setUp(self):
+        super(AsyncGatorTestCase, self).setUp()
+        self.conn_string = os.environ.get("ALLIGATOR_CONN")
+        self.gator = AsyncGator(self.conn_string)
+
+        # Just reach in & clear things out.
+        asyncio.run(self.gator.backend.drop_all(ALL))
+
+    def test_build_backend(self):
+        backend = self.gator.build_backend("locmem://")
+        self.assertEqual(backend.__class__.__name__, "AsyncClient")
+        self.assertTrue(isinstance(backend.client, LocmemClient))
+
+    def test_task(self):
+        async def run():
+            task = await self.gator.task(so_async, 1, 1)
+            self.assertEqual(await self.gator.len(), 1)
+            return await self.gator.get(task.task_id)
+
+        complete = asyncio.run(run())
+        self.assertEqual(complete.status, SUCCESS)
+        self.assertEqual(complete.result, 2)
+
+    def test_push_sync(self):
+        async def run():
+            task = Task(is_async=False)
+            return await self.gator.push(task, so_async, 3, 4)
+
+        task = asyncio.run(run())
+        self.assertEqual(task.result, 7)
+
+    def test_push_many(self):
+        async def run():
+            tasks = await self.gator.push_many(
+                so_computationally_expensive, [(1, 1), (2, 3)]
+            )
+            self.assertEqual(await self.gator.len(), 2)
+            fetched = await self.gator.fetch(5, timeout=0.1)
+            return tasks, [
+                (await self.gator.process(data)).result for data in fetched
+            ]
+
+        tasks, results = asyncio.run(run())
+        self.assertEqual(len(tasks), 2)
+        self.assertEqual(sorted(results), [2, 5])
+
+    def test_pop(self):
+        async def run():
+            self.assertEqual(await self.gator.pop(), None)
+            await self.gator.task(so_async, 5, 8)
+            return await self.gator.pop()
+
+        self.assertEqual(asyncio.run(run()).result, 13)
+
+    def test_reserve(self):
+        gator = AsyncGator(self.conn_string, lease_time=30)
+
+        async def run():
+            await gator.task(so_async, 5, 8)
+            fetched = await gator.fetch(5)
+            self.assertTrue(isinstance(fetched[0], Reservation))
+            self.assertEqual(await gator.len(), 0)
+            task = await gator.process(fetched[0])
+            self.assertEqual(await gator.reap(), 0)
+            return task
+
+        self.assertEqual(asyncio.run(run()).result, 13)
+
+    def test_reserve_retry(self):
+        gator = AsyncGator(self.conn_string, lease_time=30)
+
+        async def run():
+            task = Task(retries=1)
+            await gator.push(task, fail_task, 1, 1)
+
+            # The failed attempt is acknowledged, but its retry stays
+            # queued.
+            self.assertEqual(await gator.pop(), None)
+            self.assertEqual(await gator.len(), 1)
+
+            with self.assertRaises(IOError):
+                await gator.pop()
+
+            self.assertEqual(await gator.len(), 0)
+
+        asyncio.run(run())
+
+    def test_depends_on(self):
+        async def run():
+            first = await self.gator.task(so_async, 1, 1)
+            task = Task(depends_on=[first])
+            await self.gator.push(task, so_async, 5, 8)
+            self.assertEqual(await self.gator.len(), 1)
+
+            await self.gator.pop()
+            return await self.gator.pop()
+
+        self.assertEqual(asyncio.run(run()).result, 13)
+
+    def test_results(self):
+        gator = AsyncGator(self.conn_string, result_store=LocmemResultStore())
+
+        async def run():
+            task = await gator.task(so_async, 5, 8)
+            await gator.pop()
+            results = await gator.get_results([task])
+            self.assertEqual(results[task.task_id].get(), 13)
+            return await task.wait_async(timeout=1)
+
+        self.assertEqual(asyncio.run(run()), 13)
+
+    def test_cancel(self):
+        async def run():
+            task = await self.gator.task(so_async, 5, 8)
+            return await self.gator.cancel(task.task_id)
+
+        self.assertEqual(asyncio.run(run()).status, CANCELED)
+
+    def test_execute_retries(self):
+        async def run():
+            task = Task(retries=3, is_async=False)
+            task.to_call(eventual_success(), 2, 7)
+            return await self.gator.execute(task)
+
+        complete = asyncio.run(run())
+        self.assertEqual(complete.result, 9)
+        self.assertEqual(complete.retries, 1)
+
+    def test_options(self):
+        async def run():
+            with self.gator.options(retries=2) as opts:
+                task = await opts.task(so_async, 1, 1)
+
+            self.assertEqual(task.retries, 2)
+            return await self.gator.len()
+
+        self.assertEqual(asyncio.run(run()), 1)
+
+    def test_blob_store_failed(self):
+        path = "/tmp/alligator_test_async_gator_failed_blobs"
+        shutil.rmtree(path, ignore_errors=True)
+        gator = AsyncGator(
+            self.conn_string,
+            blob_store=FileBlobStore(path),
+            blob_threshold=1024,
+            dead_letter_queue="all:dead",
+        )
+        fat = "a rendered template " * 500
+
+        async def run():
+            await gator.backend.drop_all("all:dead")
+            await gator.task(fail_task, fat, 1)
+
+            with self.assertRaises(IOError):
+                await gator.pop()
+
+            return await gator.replay()
+
+        letter = asyncio.run(run())[0]
+        key = serializers.blob_key(letter.payload)
+        self.assertTrue(os.path.exists(gator.blob_store.key_path(key)))
+        self.assertEqual(sum(len(files) for _, _, files in os.walk(path)), 1)
@@ -1,4 +1,6 @@
 import os
+import threading
+import time
 import unittest
 from unittest import mock
 
@@ -19,30 +21,30 @@ class LocmemTestCase(unittest.TestCase):
         # Just reach in & clear things out.
         LocmemClient.queues = {}
         LocmemClient.task_data = {}
+        LocmemClient.leases = {}
+        LocmemClient.pending = {}
+        LocmemClient.dependents = {}
+        LocmemClient.locks = {}
+        LocmemClient.priorities = {}
 
     def test_init(self):
         self.assertEqual(LocmemClient.queues, {})
         self.assertEqual(LocmemClient.task_data, {})
 
     def test_len(self):
-        LocmemClient.queues = {
-            "all": [["a", None], ["b", 12345678], ["c", None]]
-        }
+        self.backend.push("all", "a", "1")
+        self.backend.push("all", "b", "2", delay_until=time.time() + 60)
+        self.backend.push("all", "c", "3")
         self.assertEqual(self.backend.len("all"), 3)
         self.assertEqual(self.backend.len("something"), 0)
 
     def test_drop_all(self):
-        LocmemClient.queues = {
-            "all": [["a", None], ["b", 12345678], ["c", None]]
-        }
-        LocmemClient.task_data = {
-            "a": {"whatev": True},
-            "b": "grump",
-            "d": "another",
-        }
+        self.backend.push("all", "a", {"whatev": True})
+        self.backend.push("all", "b", "grump", delay_until=12345678)
+        self.backend.push("other", "d", "another")
 
         self.backend.drop_all("all")
-        self.assertEqual(LocmemClient.queues, {"all": []})
+        self.assertEqual(self.backend.len("all"), 0)
         self.assertEqual(LocmemClient.task_data, {"d": "another"})
 
     def test_push(self):
@@ -50,24 +52,51 @@ class LocmemTestCase(unittest.TestCase):
         self.assertEqual(LocmemClient.task_data, {})
 
         self.backend.push("all", "hello", {"whee": 1})
-        self.assertEqual(LocmemClient.queues, {"all": [["hello", None]]})
+        queue = LocmemClient.queues["all"]
+        self.assertEqual(list(queue.ready), [["hello", None]])
+        self.assertEqual(queue.delayed, [])
         self.assertEqual(LocmemClient.task_data, {"hello": {"whee": 1}})
 
-    def test_push_delayed(self):
+    @mock.patch("time.time")
+    def test_push_delayed(self, mock_time):
+        mock_time.return_value = 12345678
         self.assertEqual(LocmemClient.queues, {})
         self.assertEqual(LocmemClient.task_data, {})
 
         self.backend.push("all", "hello", {"whee": 1}, delay_until=12345798)
-        self.assertEqual(LocmemClient.queues, {"all": [["hello", 12345798]]})
+        queue = LocmemClient.queues["all"]
+        self.assertEqual(list(queue.ready), [])
+        self.assertEqual(queue.next_delay(), 12345798)
         self.assertEqual(LocmemClient.task_data, {"hello": {"whee": 1}})
 
+    @mock.patch("time.time")
+    def test_push_many(self, mock_time):
+        mock_time.return_value = 12345678
+        task_ids = self.backend.push_many(
+            "all",
+            [
+                ("hello", {"whee": 1}, None),
+                ("world", {"whee": 2}, 12345798),
+            ],
+        )
+        self.assertEqual(task_ids, ["hello", "world"])
+
+        queue = LocmemClient.queues["all"]
+        self.assertEqual(list(queue.ready), [["hello", None]])
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(
+            LocmemClient.task_data,
+            {"hello": {"whee": 1}, "world": {"whee": 2}},
+        )
+
     def test_pop(self):
         self.backend.push("all", "hello", {"whee": 1})
 
         data = self.backend.pop("all")
         self.assertEqual(data, {"whee": 1})
-        self.assertEqual(LocmemClient.queues, {"all": []})
+        self.assertEqual(self.backend.len("all"), 0)
         self.assertEqual(LocmemClient.task_data, {})
+        self.assertEqual(self.backend.pop("all"), None)
 
     @mock.patch("time.time")
     def test_pop_skip_delayed(self, mock_time):
@@ -80,18 +109,225 @@ class LocmemTestCase(unittest.TestCase):
         # "future" time isn't pulled off the queue.
         data = self.backend.pop("all")
         self.assertEqual(data, {"whoo": 2})
-        self.assertEqual(LocmemClient.queues, {"all": [["hello", 12345798]]})
+        self.assertEqual(self.backend.pop("all"), None)
+        self.assertEqual(self.backend.len("all"), 1)
         self.assertEqual(LocmemClient.task_data, {"hello": {"whee": 1}})
 
+        # Once it comes due, it's popped.
+        mock_time.return_value = 12345798
+        self.assertEqual(self.backend.pop("all"), {"whee": 1})
+
+    @mock.patch("time.time")
+    def test_pop_many(self, mock_time):
+        mock_time.return_value = 12345678
+
+        self.backend.push("all", "hello", {"whee": 1})
+        self.backend.push("all", "hallo", {"whoo": 2}, delay_until=12345798)
+        self.backend.push("all", "world", {"whee": 3})
+        self.backend.push("all", "waldo", {"whee": 4})
+
+        data = self.backend.pop_many("all", 2)
+        self.assertEqual(data, [{"whee": 1}, {"whee": 3}])
+
+        data = self.backend.pop_many("all", 5)
+        self.assertEqual(data, [{"whee": 4}])
+        self.assertEqual(self.backend.len("all"), 1)
+
+        data = self.backend.pop_many("all", 5)
+        self.assertEqual(data, [])
+
+    def test_pop_blocking(self):
+        start = time.time()
+        self.assertEqual(self.backend.pop_blocking("all", 0.1), [])
+        self.assertTrue(time.time() - start >= 0.1)
+
+        def push_later():
+            time.sleep(0.1)
+            LocmemClient(CONN_STRING).push("all", "hello", {"whee": 1})
+
+        pusher = threading.Thread(target=push_later)
+        pusher.start()
+
+        data = self.backend.pop_blocking("all", 5)
+        pusher.join()
+        self.assertEqual(data, [{"whee": 1}])
+        self.assertEqual(LocmemClient.task_data, {})
+
+    def test_pop_blocking_delayed(self):
+        self.backend.push(
+            "all", "hello", {"whee": 1}, delay_until=time.time() + 0.1
+        )
+
+        data = self.backend.pop_blocking("all", 5)
+        self.assertEqual(data, [{"whee": 1}])
+
     def test_get(self):
         self.backend.push("all", "hello", {"whee": 1})
         self.backend.push("all", "world", {"whee": 2})
 
         data = self.backend.get("all", "world")
         self.assertEqual(data, {"whee": 2})
-        self.assertEqual(LocmemClient.queues, {"all": [["hello", None]]})
+        self.assertEqual(self.backend.len("all"), 1)
         self.assertEqual(LocmemClient.task_data, {"hello": {"whee": 1}})
 
         # Try a non-existent one.
         data = self.backend.get("all", "nopenopenope")
         self.assertEqual(data, None)
+
+        # The removed task is skipped over when popping.
+        self.backend.push("all", "later", {"whee": 3})
+        self.assertEqual(self.backend.pop("all"), {"whee": 1})
+        self.assertEqual(self.backend.pop("all"), {"whee": 3})
+        self.assertEqual(self.backend.pop("all"), None)
+
+    def test_get_repushed(self):
+        self.backend.push("all", "hello", {"whee": 1})
+        self.backend.push("all", "world", {"whee": 2})
+        self.assertEqual(self.backend.get("all", "hello"), {"whee": 1})
+
+        # Re-using a task ID doesn't revive the old entry.
+        self.backend.push("all", "hello", {"whee": 3})
+        self.assertEqual(self.backend.pop("all"), {"whee": 2})
+        self.assertEqual(self.backend.pop("all"), {"whee": 3})
+        self.assertEqual(self.backend.pop("all"), None)
+
+    def test_compact(self):
+        for offset in range(200):
+            self.backend.push("all", str(offset), offset)
+
+        for offset in range(150):
+            self.backend.get("all", str(offset))
+
+        queue = LocmemClient.queues["all"]
+        self.assertTrue(len(queue.ready) < 200)
+        self.assertEqual(self.backend.len("all"), 50)
+        self.assertEqual(
+            self.backend.pop_many("all", 100), list(range(150, 200))
+        )
+
+    def test_reserve(self):
+        self.backend.push("all", "hello", {"whee": 1})
+        self.backend.push("all", "world", {"whee": 2})
+
+        reserved = self.backend.reserve("all", 5, 30)
+        self.assertEqual(
+            reserved, [("hello", {"whee": 1}), ("world", {"whee": 2})]
+        )
+        self.assertEqual(self.backend.len("all"), 0)
+        self.assertEqual(self.backend.reserve("all", 5, 30), [])
+
+        self.backend.ack("all", "hello")
+        self.assertEqual(LocmemClient.task_data, {"world": {"whee": 2}})
+
+        # Acking twice is harmless.
+        self.backend.ack("all", "hello")
+
+        self.backend.nack("all", "world")
+        self.assertEqual(self.backend.len("all"), 1)
+        self.assertEqual(self.backend.pop("all"), {"whee": 2})
+
+    def test_priority(self):
+        self.backend.push("all", "low", {"whee": 1})
+        self.backend.push("all", "high", {"whee": 2}, priority=9)
+        self.backend.push_many(
+            "all",
+            [("mid", {"whee": 3}, None), ("mid2", {"whee": 4}, None)],
+            priority=5,
+        )
+        self.assertEqual(self.backend.len("all"), 4)
+        self.assertEqual(
+            self.backend.pop_many("all", 2), [{"whee": 2}, {"whee": 3}]
+        )
+
+        # Re-queued tasks keep their priority.
+        reserved = self.backend.reserve("all", 1, 30)
+        self.assertEqual(reserved, [("mid2", {"whee": 4})])
+        self.backend.push("all", "later", {"whee": 5})
+        self.backend.nack("all", "mid2")
+        self.assertEqual(
+            self.backend.pop_many("all", 5),
+            [{"whee": 4}, {"whee": 1}, {"whee": 5}],
+        )
+        self.assertEqual(LocmemClient.priorities, {})
+
+    @mock.patch("time.time")
+    def test_reap(self, mock_time):
+        mock_time.return_value = 12345678
+        self.backend.push("all", "hello", {"whee": 1})
+        self.backend.reserve("all", 1, 30)
+
+        self.assertEqual(self.backend.reap("all"), 0)
+        self.assertEqual(self.backend.len("all"), 0)
+
+        mock_time.return_value = 12345708
+        self.assertEqual(self.backend.reap("all"), 1)
+        self.assertEqual(self.backend.len("all"), 1)
+        self.assertEqual(self.backend.reap("all"), 0)
+
+        # A late ack can't remove the re-queued task.
+        self.backend.ack("all", "hello")
+        self.assertEqual(self.backend.pop("all"), {"whee": 1})
+
+    def test_park(self):
+        self.backend.push("all", "first", {"whee": 1})
+        self.backend.push("all", "second", {"whee": 2})
+        self.backend.park("all", "third", {"whee": 3}, ["first", "second"])
+
+        # Parked tasks stay out of the queue.
+        self.assertEqual(self.backend.len("all"), 2)
+        self.assertEqual(self.backend.pop("all"), {"whee": 1})
+        self.assertEqual(self.backend.mark_complete("all", "first"), 0)
+        self.assertEqual(self.backend.len("all"), 1)
+
+        self.assertEqual(self.backend.pop("all"), {"whee": 2})
+        self.assertEqual(self.backend.mark_complete("all", "second"), 1)
+        self.assertEqual(self.backend.pop("all"), {"whee": 3})
+        self.assertEqual(LocmemClient.pending, {"all": {}})
+        self.assertEqual(LocmemClient.dependents, {})
+
+        # Dependencies that are no longer queued don't count.
+        self.backend.park("all", "fourth", {"whee": 4}, ["first"])
+        self.assertEqual(self.backend.pop("all"), {"whee": 4})
+
+    def test_park_get(self):
+        self.backend.push("all", "nope", {"whee": 0})
+        self.backend.park("all", "hello", {"whee": 1}, ["nope"])
+        self.assertEqual(self.backend.get("all", "hello"), {"whee": 1})
+
+        # Gone, so completing the dependency releases nothing.
+        self.assertEqual(self.backend.pop("all"), {"whee": 0})
+        self.assertEqual(self.backend.mark_complete("all", "nope"), 0)
+        self.assertEqual(self.backend.len("all"), 0)
+
+    def test_park_reserved(self):
+        # Reserved dependencies still hold tasks back.
+        self.backend.push("all", "first", {"whee": 1})
+        self.assertEqual(len(self.backend.reserve("all", 1, 30)), 1)
+        self.backend.park("all", "second", {"whee": 2}, ["first", "gone"])
+        self.assertEqual(self.backend.len("all"), 0)
+
+        self.backend.ack("all", "first")
+        self.assertEqual(self.backend.mark_complete("all", "first"), 1)
+        self.assertEqual(self.backend.pop("all"), {"whee": 2})
+
+        # Tasks without dependents leave nothing behind.
+        self.assertEqual(self.backend.mark_complete("all", "second"), 0)
+        self.assertEqual(LocmemClient.dependents, {})
+
+    @mock.patch("time.time")
+    def test_lock(self, mock_time):
+        mock_time.return_value = 12345678
+        self.assertTrue(self.backend.acquire_lock("beat", "first", 30))
+        self.assertFalse(self.backend.acquire_lock("beat", "second", 30))
+        # Renewing is fine.
+        self.assertTrue(self.backend.acquire_lock("beat", "first", 30))
+
+        # Only the owner can release it.
+        self.backend.release_lock("beat", "second")
+        self.assertFalse(self.backend.acquire_lock("beat", "second", 30))
+        self.backend.release_lock("beat", "first")
+        self.assertTrue(self.backend.acquire_lock("beat", "second", 30))
+
+        # Expired locks can be taken.
+        mock_time.return_value = 12345708
+        self.assertTrue(self.backend.acquire_lock("beat", "first", 30))
@@ -0,0 +1,40 @@
+import unittest
+from unittest import mock
+
+from alligator.polling import FixedPolling, BackoffPolling
+
+
+class FixedPollingTestCase(unittest.TestCase):
+    def test_next_nap(self):
+        polling = FixedPolling(0.5)
+        self.assertEqual(polling.next_nap(False), 0.5)
+        self.assertEqual(polling.next_nap(False), 0.5)
+        self.assertEqual(polling.next_nap(True), 0)
+
+    def test_next_nap_disabled(self):
+        polling = FixedPolling(-1)
+        self.assertEqual(polling.next_nap(False), 0)
+
+
+class BackoffPollingTestCase(unittest.TestCase):
+    def test_next_nap(self):
+        polling = BackoffPolling(initial=0.1, maximum=0.5, jitter=False)
+        self.assertEqual(polling.next_nap(True), 0)
+        self.assertEqual(polling.next_nap(False), 0.1)
+        self.assertEqual(polling.next_nap(False), 0.2)
+        self.assertEqual(polling.next_nap(False), 0.4)
+        self.assertEqual(polling.next_nap(False), 0.5)
+        self.assertEqual(polling.next_nap(False), 0.5)
+
+        # Finding a task resets things.
+        self.assertEqual(polling.next_nap(True), 0)
+        self.assertEqual(polling.next_nap(False), 0.1)
+
+    @mock.patch("random.uniform")
+    def test_next_nap_jitter(self, mock_uniform):
+        mock_uniform.return_value = 0.15
+
+        polling = BackoffPolling(initial=0.1, maximum=0.5)
+        self.assertEqual(polling.next_nap(False), 0.15)
+        self.assertEqual(polling.next_nap(False), 0.15)
+        mock_uniform.assert_called_with(0.1, 0.2)
@@ -2,6 +2,7 @@ import os
 import redis
 import time
 import unittest
+from unittest import mock
 
 from alligator.backends.redis_backend import Client as RedisClient
 
@@ -45,13 +46,225 @@ class RedisTestCase(unittest.TestCase):
         time.sleep(1)
 
         data = self.backend.pop("all")
-        self.assertEqual(data, '{"whee": 1}')
+        self.assertEqual(data, b'{"whee": 1}')
         self.assertEqual(self.backend.len("all"), 0)
 
+    def test_pop_skip_delayed(self):
+        self.backend.push("all", "later", '{"whee": 1}', time.time() + 60)
+        self.backend.push("all", "hello", '{"whee": 2}')
+        time.sleep(1)
+
+        data = self.backend.pop("all")
+        self.assertEqual(data, b'{"whee": 2}')
+        self.assertEqual(self.backend.pop("all"), None)
+        self.assertEqual(self.backend.len("all"), 1)
+
+    def test_promote_delayed(self):
+        later = time.time() + 0.1
+
+        for task_id in ("first", "second", "third"):
+            self.backend.push("all", task_id, task_id, later)
+
+        self.backend.push("all", "much_later", "4", time.time() + 60)
+        self.backend.push("all", "hello", "5")
+
+        # Delayed tasks are kept off the queue until they're due.
+        self.assertEqual(self.backend.conn.zcard("all"), 1)
+        self.assertEqual(self.backend.conn.zcard("all:delayed"), 4)
+        self.assertEqual(self.backend.len("all"), 5)
+        self.assertEqual(self.backend.pop_many("all", 5), [b"5"])
+
+        time.sleep(0.2)
+
+        with mock.patch("alligator.backends.redis_backend.PROMOTE_BATCH", 2):
+            self.assertEqual(
+                self.backend.pop_many("all", 5), [b"first", b"second"]
+            )
+            self.assertEqual(self.backend.pop_many("all", 5), [b"third"])
+
+        self.assertEqual(self.backend.conn.zcard("all:delayed"), 1)
+        self.assertEqual(self.backend.get("all", "much_later"), b"4")
+        self.assertEqual(self.backend.len("all"), 0)
+
+    def test_pop_many(self):
+        self.backend.push("all", "hello", '{"whee": 1}')
+        self.backend.push("all", "world", '{"whee": 2}')
+        self.backend.push("all", "later", '{"whee": 3}', time.time() + 60)
+        time.sleep(1)
+
+        data = self.backend.pop_many("all", 5)
+        self.assertEqual(data, [b'{"whee": 1}', b'{"whee": 2}'])
+        self.assertEqual(self.backend.len("all"), 1)
+
+    @mock.patch("time.time")
+    def test_push_many_fifo(self, mock_time):
+        # A big batch's scores run past the next push's clock, but batches
+        # still don't interleave.
+        mock_time.return_value = 1000
+        self.backend.push_many(
+            "all", [("z{}".format(i), i, None) for i in range(2000)]
+        )
+        mock_time.return_value = 1000.001
+        self.backend.push("all", "a", "last")
+
+        # Nor do they if the clock goes backwards.
+        mock_time.return_value = 999
+        self.backend.push("all", "b", "very last")
+
+        popped = self.backend.pop_many("all", 3000)
+        self.assertEqual(len(popped), 2002)
+        self.assertEqual(popped[:2], [b"0", b"1"])
+        self.assertEqual(popped[-2:], [b"last", b"very last"])
+
+    def test_pop_blocking(self):
+        self.assertEqual(self.backend.pop_blocking("all", 0.1), [])
+
+        self.backend.push("all", "later", '{"whee": 1}', time.time() + 0.2)
+        data = self.backend.pop_blocking("all", 5)
+        self.assertEqual(data, [b'{"whee": 1}'])
+
+    def test_pop_blocking_priority(self):
+        from alligator.backends.redis_backend import PRIORITY_SPAN
+
+        # A prioritized task in the queue that isn't quite due yet.
+        due_at = time.time() + 0.2
+        self.backend.conn.zadd("all", {"soon": due_at - 9 * PRIORITY_SPAN})
+        self.backend.conn.hset("all:priorities", "soon", 9)
+        self.backend.conn.set("soon", '{"whee": 1}')
+        self.assertAlmostEqual(self.backend._next_due("all"), due_at, 3)
+
+        self.backend.push("all", "later", '{"whee": 2}', due_at + 60)
+        self.assertAlmostEqual(self.backend._next_due("all"), due_at, 3)
+
+        with mock.patch.object(
+            self.backend.conn, "blpop", wraps=self.backend.conn.blpop
+        ) as blpop:
+            data = self.backend.pop_blocking("all", 5)
+
+        self.assertEqual(data, [b'{"whee": 1}'])
+        # It waited for the task, rather than polling.
+        self.assertTrue(blpop.call_count <= 2)
+
     def test_get(self):
         self.backend.push("all", "hello", '{"whee": 1}')
         self.backend.push("all", "world", '{"whee": 2}')
 
         data = self.backend.get("all", "world")
-        self.assertEqual(data, '{"whee": 2}')
+        self.assertEqual(data, b'{"whee": 2}')
+        self.assertEqual(self.backend.len("all"), 1)
+
+    def test_reserve(self):
+        self.backend.push("all", "hello", '{"whee": 1}')
+        self.backend.push("all", "world", '{"whee": 2}')
+
+        reserved = self.backend.reserve("all", 5, 30)
+        self.assertEqual(
+            reserved,
+            [(b"hello", b'{"whee": 1}'), (b"world", b'{"whee": 2}')],
+        )
+        self.assertEqual(self.backend.len("all"), 0)
+        self.assertEqual(self.backend.reserve("all", 5, 30), [])
+
+        self.backend.ack("all", b"hello")
+        self.assertEqual(self.backend.conn.get("hello"), None)
+
+        self.backend.nack("all", b"world")
+        self.assertEqual(self.backend.pop("all"), b'{"whee": 2}')
+
+    def test_priority(self):
+        self.backend.push("all", "low", '{"whee": 1}')
+        self.backend.push("all", "high", '{"whee": 2}', priority=9)
+        self.backend.push_many(
+            "all", [("mid", '{"whee": 3}', None)], priority=5
+        )
+        self.assertEqual(
+            self.backend.pop_many("all", 2), [b'{"whee": 2}', b'{"whee": 3}']
+        )
+
+        # Re-queued tasks keep their priority.
+        self.backend.push("all", "urgent", '{"whee": 4}', priority=5)
+        self.backend.reserve("all", 1, 30)
+        self.backend.nack("all", b"urgent")
+        self.assertEqual(
+            self.backend.pop_many("all", 5), [b'{"whee": 4}', b'{"whee": 1}']
+        )
+
+        # Delayed tasks keep theirs once they're due.
+        self.backend.push("all", "plain", '{"whee": 5}')
+        self.backend.push(
+            "all", "delayed", '{"whee": 6}', delay_until=1, priority=1
+        )
+        self.assertEqual(
+            self.backend.pop_many("all", 5), [b'{"whee": 6}', b'{"whee": 5}']
+        )
+
+    def test_reap(self):
+        self.backend.push("all", "hello", '{"whee": 1}')
+        self.backend.reserve("all", 1, 0.1)
+        self.assertEqual(self.backend.reap("all"), 0)
+
+        time.sleep(0.2)
+        self.assertEqual(self.backend.reap("all"), 1)
+        self.assertEqual(self.backend.pop("all"), b'{"whee": 1}')
+
+    def test_park(self):
+        self.backend.push("all", "first", '{"whee": 1}')
+        self.backend.push("all", "other", '{"whee": 0}')
+        self.backend.park("all", "second", '{"whee": 2}', ["first", "other"])
+        self.assertEqual(self.backend.len("all"), 2)
+
+        self.assertEqual(self.backend.pop("all"), b'{"whee": 1}')
+        self.assertEqual(self.backend.mark_complete("all", "first"), 0)
+        self.assertEqual(self.backend.pop("all"), b'{"whee": 0}')
+        self.assertEqual(self.backend.mark_complete("all", "other"), 1)
         self.assertEqual(self.backend.len("all"), 1)
+        self.assertEqual(self.backend.pop("all"), b'{"whee": 2}')
+        self.assertEqual(self.backend.conn.exists("second:waiting"), 0)
+
+        # Dependencies that are no longer queued don't count.
+        self.backend.park("all", "third", '{"whee": 3}', ["first"])
+        self.assertEqual(self.backend.pop("all"), b'{"whee": 3}')
+
+        # Parked tasks can still be fetched by ID.
+        self.backend.push("all", "nope", '{"whee": 5}')
+        self.backend.park("all", "fourth", '{"whee": 4}', ["nope"])
+        self.assertEqual(self.backend.get("all", "fourth"), b'{"whee": 4}')
+
+        # Completing a task nothing waits on writes nothing.
+        self.assertEqual(self.backend.mark_complete("all", "third"), 0)
+        self.assertEqual(self.backend.conn.exists("third:dependents"), 0)
+
+    def test_park_keys(self):
+        # Every key the scripts are handed up front is declared.
+        self.assertEqual(
+            self.backend._park_keys("all", "second", ["other", "first"]),
+            [
+                "all",
+                "all:notify",
+                "all:pending",
+                "all:delayed",
+                "all:priorities",
+                "second",
+                "second:waiting",
+                "first",
+                "first:dependents",
+                "other",
+                "other:dependents",
+            ],
+        )
+        self.assertEqual(
+            self.backend._complete_keys("first"), ["first:dependents"]
+        )
+
+    def test_lock(self):
+        self.assertTrue(self.backend.acquire_lock("beat", "first", 0.1))
+        self.assertFalse(self.backend.acquire_lock("beat", "second", 0.1))
+        self.assertTrue(self.backend.acquire_lock("beat", "first", 0.1))
+
+        self.backend.release_lock("beat", "second")
+        self.assertFalse(self.backend.acquire_lock("beat", "second", 0.1))
+        self.backend.release_lock("beat", "first")
+        self.assertTrue(self.backend.acquire_lock("beat", "second", 0.1))
+
+        time.sleep(0.2)
+        self.assertTrue(self.backend.acquire_lock("beat", "first", 0.1))
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from alligator.constants import FAILED, SUCCESS
+from alligator.exceptions import ResultTooLargeError, TaskFailed
+from alligator.results import (
+    LocmemResultStore,
+    RedisResultStore,
+    Result,
+    SQLiteResultStore,
+)
+from alligator.tasks import Task
+
+
+CONN_STRING = os.environ.get("ALLIGATOR_CONN")
+
+
+def save_later(store, result, wait=0.1):
+    def save():
+        time.sleep(wait)
+        store.save(result)
+
+    thread = threading.Thread(target=save)
+    thread.start()
+    return thread
+
+
+class ResultTestCase(unittest.TestCase):
+    def test_from_task(self):
+        task = Task(task_id="hello")
+        task.to_success()
+        task.result = 12
+
+        result = Result.from_task(task)
+        self.assertEqual(result.status, SUCCESS)
+        self.assertEqual(result.get(), 12)
+
+        result = Result.from_task(task, IOError("Math is hard."))
+        self.assertEqual(result.status, FAILED)
+        self.assertEqual(result.error_class, "builtins.OSError")
+        self.assertEqual(result.error, "Math is hard.")
+
+        with self.assertRaises(TaskFailed):
+            result.get()
+
+    def test_too_large(self):
+        result = Result("hello", SUCCESS, too_large=True)
+
+        with self.assertRaises(ResultTooLargeError):
+            result.get()
+
+
+class ResultStoreTests(object):
+    def test_get_results(self):
+        self.store.save(Result("hello", SUCCESS, result={"sum": 12}))
+        self.store.save(Result("world", FAILED, error="Nope."))
+
+        results = self.store.get_results(["hello", "nope", "world"])
+        self.assertEqual(sorted(results), ["hello", "world"])
+        self.assertEqual(results["hello"].get(), {"sum": 12})
+        self.assertEqual(results["world"].error, "Nope.")
+        self.assertEqual(self.store.get_results([]), {})
+
+    def test_max_size(self):
+        self.store.max_size = 200
+        self.store.save(Result("hello", SUCCESS, result="a" * 200))
+        result = self.store.get_results(["hello"])["hello"]
+        self.assertTrue(result.too_large)
+        self.assertEqual(result.result, None)
+
+    def test_wait_for(self):
+        self.assertEqual(self.store.wait_for("hello", timeout=0.1), None)
+
+        thread = save_later(self.store, Result("hello", SUCCESS, result=5))
+        start = time.time()
+        result = self.store.wait_for("hello", timeout=5)
+        thread.join()
+
+        self.assertEqual(result.get(), 5)
+        self.assertTrue(time.time() - start < 2)
+
+        # Already there.
+        self.assertEqual(self.store.wait_for("hello", timeout=0).get(), 5)
+
+
+class LocmemResultStoreTestCase(ResultStoreTests, unittest.TestCase):
+    def setUp(self):
+        super(LocmemResultStoreTestCase, self).setUp()
+        LocmemResultStore.results.clear()
+        self.store = LocmemResultStore()
+
+    def test_max_results(self):
+        store = LocmemResultStore(max_results=2)
+
+        for task_id in ("first", "second", "third"):
+            store.save(Result(task_id, SUCCESS))
+
+        self.assertEqual(list(LocmemResultStore.results), ["second", "third"])
+
+    @mock.patch("time.time")
+    def test_ttl(self, mock_time):
+        mock_time.return_value = 12345678
+        store = LocmemResultStore(ttl=60)
+        store.save(Result("hello", SUCCESS))
+        self.assertEqual(list(store.get_results(["hello"])), ["hello"])
+
+        mock_time.return_value = 12345738
+        self.assertEqual(store.get_results(["hello"]), {})
+
+
+class SQLiteResultStoreTestCase(ResultStoreTests, unittest.TestCase):
+    def setUp(self):
+        super(SQLiteResultStoreTestCase, self).setUp()
+
+        try:
+            os.unlink("/tmp/alligator_results.db")
+        except OSError:
+            pass
+
+        self.store = SQLiteResultStore("sqlite:///tmp/alligator_results.db")
+
+    @mock.patch("time.time")
+    def test_ttl(self, mock_time):
+        mock_time.return_value = 12345678
+        self.store.ttl = 60
+        self.store.save(Result("hello", SUCCESS))
+        self.assertEqual(list(self.store.get_results(["hello"])), ["hello"])
+
+        mock_time.return_value = 12345738
+        self.assertEqual(self.store.get_results(["hello"]), {})
+
+        # Expired results are cleaned up as others are saved.
+        self.store.save(Result("world", SUCCESS))
+        cur = self.store.conn.execute("SELECT task_id FROM `task_results`")
+        self.assertEqual(cur.fetchall(), [("world",)])
+
+
+@unittest.skipIf(not CONN_STRING.startswith("redis:"), "Skipping Redis tests")
+class RedisResultStoreTestCase(ResultStoreTests, unittest.TestCase):
+    def setUp(self):
+        super(RedisResultStoreTestCase, self).setUp()
+        self.store = RedisResultStore(CONN_STRING, ttl=60)
+        self.store.conn.flushdb()
+
+    def test_ttl(self):
+        self.store.save(Result("hello", SUCCESS))
+        ttl = self.store.conn.ttl("result:hello")
+        self.assertTrue(0 < ttl <= 60)
@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+
+from alligator.exceptions import UnknownRetryPolicyError
+from alligator.retries import (
+    DecorrelatedJitter,
+    ExponentialBackoff,
+    FixedBackoff,
+    get_retry_policy,
+)
+
+
+class RetriesTestCase(unittest.TestCase):
+    def test_fixed(self):
+        policy = FixedBackoff(5)
+        self.assertEqual(policy.next_delay(1), 5)
+        self.assertEqual(policy.next_delay(10, previous=5), 5)
+        self.assertEqual(FixedBackoff(500).next_delay(1), 300)
+
+    def test_exponential(self):
+        policy = ExponentialBackoff(base=2, max_delay=20)
+        self.assertEqual(
+            [policy.next_delay(attempts) for attempts in range(1, 6)],
+            [2, 4, 8, 16, 20],
+        )
+
+        policy = ExponentialBackoff(base=2, jitter=True)
+
+        with mock.patch("random.uniform", return_value=3) as mock_uniform:
+            self.assertEqual(policy.next_delay(3), 3)
+
+        mock_uniform.assert_called_once_with(0, 8)
+
+    def test_decorrelated(self):
+        policy = DecorrelatedJitter(base=1, max_delay=30)
+        previous = None
+
+        for attempts in range(1, 20):
+            delay = policy.next_delay(attempts, previous=previous)
+            self.assertTrue(1 <= delay <= 30)
+            self.assertTrue(delay <= (previous or 1) * 3)
+            previous = delay
+
+    def test_retry_on(self):
+        policy = FixedBackoff()
+        self.assertTrue(policy.should_retry(ValueError()))
+
+        policy = FixedBackoff(retry_on=[IOError, KeyError])
+        self.assertTrue(policy.should_retry(IOError()))
+        self.assertTrue(policy.should_retry(FileNotFoundError()))
+        self.assertFalse(policy.should_retry(ValueError()))
+
+    def test_round_trip(self):
+        policy = ExponentialBackoff(
+            base=0.5, factor=3, max_delay=60, retry_on=[ConnectionError]
+        )
+        data = policy.to_dict()
+        self.assertEqual(
+            data,
+            {
+                "name": "exponential",
+                "max_delay": 60,
+                "base": 0.5,
+                "factor": 3,
+                "jitter": False,
+                "retry_on": [["builtins", "ConnectionError"]],
+            },
+        )
+
+        restored = get_retry_policy(data)
+        self.assertTrue(isinstance(restored, ExponentialBackoff))
+        self.assertEqual(restored.to_dict(), data)
+        self.assertEqual(restored.retry_on, (ConnectionError,))
+
+    def test_get_retry_policy(self):
+        self.assertEqual(get_retry_policy(None), None)
+
+        policy = FixedBackoff()
+        self.assertEqual(get_retry_policy(policy), policy)
+
+        with self.assertRaises(UnknownRetryPolicyError):
+            get_retry_policy({"name": "whenever"})
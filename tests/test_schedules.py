@@ -0,0 +1,184 @@
+import calendar
+import datetime
+import os
+import unittest
+from unittest import mock
+
+from alligator.constants import ALL
+from alligator.gator import Gator
+from alligator.schedules import (
+    Crontab,
+    Interval,
+    Periodic,
+    Scheduler,
+    periodic,
+    registry,
+)
+
+
+CONN_STRING = os.environ.get("ALLIGATOR_CONN")
+
+
+def add(a, b):
+    return a + b
+
+
+def utc(*bits):
+    return calendar.timegm(datetime.datetime(*bits).timetuple())
+
+
+class IntervalTestCase(unittest.TestCase):
+    def test_next_after(self):
+        interval = Interval(60)
+        self.assertEqual(interval.next_after(120), 180)
+        self.assertEqual(interval.next_after(121.5), 180)
+        self.assertEqual(interval.next_after(179.9), 180)
+
+        interval = Interval(datetime.timedelta(minutes=5), anchor=10)
+        self.assertEqual(interval.next_after(10), 310)
+        self.assertEqual(interval.next_after(0), 10)
+
+        with self.assertRaises(ValueError):
+            Interval(0)
+
+
+class CrontabTestCase(unittest.TestCase):
+    def test_parse_field(self):
+        self.assertEqual(Crontab.parse_field("*/15", 0, 59), {0, 15, 30, 45})
+        self.assertEqual(Crontab.parse_field("1-3,7", 0, 59), {1, 2, 3, 7})
+        self.assertEqual(Crontab.parse_field("50/5", 0, 59), {50, 55})
+        self.assertEqual(Crontab.parse_field("10-20/5", 0, 59), {10, 15, 20})
+        # Only the parts with a step run on to the end.
+        self.assertEqual(
+            Crontab.parse_field("1,30/10", 0, 59), {1, 30, 40, 50}
+        )
+        self.assertEqual(Crontab.parse_field("45/5,2", 0, 59), {2, 45, 50, 55})
+
+        with self.assertRaises(ValueError):
+            Crontab.parse_field("60", 0, 59)
+
+        with self.assertRaises(ValueError):
+            Crontab("* * *")
+
+    def test_next_after(self):
+        # A Saturday.
+        now = utc(2026, 10, 17, 12, 0, 30)
+
+        self.assertEqual(
+            Crontab("*/15 * * * *", utc=True).next_after(now),
+            utc(2026, 10, 17, 12, 15),
+        )
+        self.assertEqual(
+            Crontab("30 3 * * 1-5", utc=True).next_after(now),
+            utc(2026, 10, 19, 3, 30),
+        )
+        self.assertEqual(
+            Crontab("@weekly", utc=True).next_after(now),
+            utc(2026, 10, 18),
+        )
+        self.assertEqual(
+            Crontab("0 0 29 2 *", utc=True).next_after(now),
+            utc(2028, 2, 29),
+        )
+        # Either the day of month or the weekday.
+        self.assertEqual(
+            Crontab("0 12 1 * 1", utc=True).next_after(now),
+            utc(2026, 10, 19, 12),
+        )
+
+        with self.assertRaises(ValueError):
+            Crontab("0 0 31 2 *", utc=True).next_after(now)
+
+
+class SchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        super(SchedulerTestCase, self).setUp()
+        self.gator = Gator(CONN_STRING)
+        self.gator.backend.drop_all(ALL)
+
+    def tearDown(self):
+        for scheduler in getattr(self, "schedulers", []):
+            scheduler.release_lock()
+
+        super(SchedulerTestCase, self).tearDown()
+
+    def build_scheduler(self, **kwargs):
+        scheduler = Scheduler(self.gator, entries=[], **kwargs)
+        self.schedulers = getattr(self, "schedulers", []) + [scheduler]
+        return scheduler
+
+    @mock.patch("time.time")
+    def test_tick(self, mock_time):
+        mock_time.return_value = 1000
+        scheduler = self.build_scheduler()
+        scheduler.add(Interval(60), add, args=[1, 2], retries=3)
+        scheduler.add(Interval(100), add, kwargs={"a": 3, "b": 4})
+        self.assertEqual(scheduler.next_run(), 1020)
+        self.assertEqual(scheduler.tick(1010), 0)
+
+        self.assertEqual(scheduler.tick(1020), 1)
+        self.assertEqual(scheduler.next_run(), 1080)
+        self.assertEqual(self.gator.len(), 1)
+
+        task = self.gator.pop()
+        self.assertEqual(task.result, 3)
+        self.assertEqual(task.retries, 3)
+
+        # Running late doesn't shift later runs.
+        self.assertEqual(scheduler.tick(1103), 2)
+        self.assertEqual(scheduler.next_run(), 1140)
+        self.assertEqual(sorted(t.result for t in self._pop_all()), [3, 7])
+
+        # Missed runs are only pushed once.
+        self.assertEqual(scheduler.tick(1500), 2)
+        self.assertEqual(scheduler.next_run(), 1560)
+
+    def _pop_all(self):
+        popped = []
+
+        while self.gator.len():
+            popped.append(self.gator.pop())
+
+        return popped
+
+    @mock.patch("time.time")
+    def test_leader_lock(self, mock_time):
+        if getattr(self.gator.backend, "acquire_lock", None) is None:
+            self.skipTest("The backend doesn't support locks.")
+
+        mock_time.return_value = 1000
+        leader = self.build_scheduler(lock_timeout=30)
+        standby = self.build_scheduler(lock_timeout=30)
+
+        for scheduler in (leader, standby):
+            scheduler.add(Interval(60), add, args=[1, 2])
+
+        self.assertEqual(leader.tick(1020), 1)
+        self.assertEqual(standby.tick(1020), 0)
+        self.assertTrue(leader.is_leader)
+        self.assertFalse(standby.is_leader)
+
+        # The standby keeps up, so it doesn't push the same run on takeover.
+        self.assertEqual(standby.next_run(), 1080)
+
+        leader.stopping()
+        self.assertEqual(standby.tick(1080), 1)
+        self.assertTrue(standby.is_leader)
+        self.assertEqual(self.gator.len(), 2)
+
+    def test_periodic(self):
+        registered = list(registry)
+
+        try:
+            periodic(Interval(60), retries=2)(add)
+            self.assertEqual(len(registry), len(registered) + 1)
+
+            entry = registry[-1]
+            self.assertTrue(isinstance(entry, Periodic))
+            self.assertEqual(entry.name, "tests.test_schedules.add")
+            self.assertEqual(entry.options, {"retries": 2})
+
+            scheduler = Scheduler(self.gator)
+            self.assertEqual(len(scheduler.heap), len(registry))
+        finally:
+            registry[:] = registered
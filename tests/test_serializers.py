@@ -0,0 +1,127 @@
+import json
+import unittest
+from unittest import mock
+
+from alligator import serializers
+from alligator.compressors import ZlibCompressor
+from alligator.exceptions import UnknownSerializerError
+from alligator.serializers import (
+    JSONSerializer,
+    MarshalSerializer,
+    MsgpackSerializer,
+    get_serializer,
+)
+
+
+TASK_DATA = {
+    "task_id": "hello",
+    "retries": 2,
+    "is_async": True,
+    "module": "tests.test_tasks",
+    "callable": "run_me",
+    "args": [1, "two"],
+    "kwargs": {"y": 2},
+    "options": {
+        "on_start": {"module": "tests.test_tasks", "callable": "start"},
+        "delay_until": 12345.5,
+    },
+}
+
+
+class SerializersTestCase(unittest.TestCase):
+    def assertRoundTrip(self, serializer):
+        payload = serializers.dumps(TASK_DATA, serializer)
+        self.assertTrue(payload.startswith(serializers.MAGIC))
+        self.assertEqual(payload[1], serializer.format_id)
+        self.assertEqual(serializers.loads(payload), TASK_DATA)
+        return payload
+
+    def test_get_serializer(self):
+        self.assertEqual(get_serializer(None), None)
+        self.assertTrue(isinstance(get_serializer("json"), JSONSerializer))
+        self.assertTrue(isinstance(get_serializer(2), MarshalSerializer))
+
+        marshal = MarshalSerializer()
+        self.assertEqual(get_serializer(marshal), marshal)
+
+        with self.assertRaises(UnknownSerializerError):
+            get_serializer("yaml")
+
+    def test_json(self):
+        self.assertRoundTrip(JSONSerializer())
+
+    def test_marshal(self):
+        payload = self.assertRoundTrip(MarshalSerializer())
+
+        # The compact layout drops the repeated keys.
+        self.assertTrue(len(payload) < len(json.dumps(TASK_DATA)))
+
+    @unittest.skipIf(serializers.msgpack is None, "msgpack not installed")
+    def test_msgpack(self):
+        payload = self.assertRoundTrip(MsgpackSerializer())
+        self.assertTrue(len(payload) < len(json.dumps(TASK_DATA)))
+
+    def test_loads_legacy(self):
+        # Headerless JSON, as queued by older versions.
+        self.assertEqual(serializers.loads(json.dumps(TASK_DATA)), TASK_DATA)
+        self.assertEqual(
+            serializers.loads(json.dumps(TASK_DATA).encode("utf-8")),
+            TASK_DATA,
+        )
+
+    def test_compression(self):
+        data = dict(TASK_DATA, args=["a fat argument " * 1000])
+        serializer = MarshalSerializer()
+
+        payload = serializers.dumps(data, serializer, ZlibCompressor())
+        self.assertEqual(payload[2] & serializers.COMPRESSION_MASK, 1)
+        self.assertTrue(len(payload) * 10 < len(serializer.dumps(data)))
+        self.assertEqual(serializers.loads(payload), data)
+
+        # Too small to bother.
+        payload = serializers.dumps(TASK_DATA, serializer, ZlibCompressor())
+        self.assertEqual(payload[2] & serializers.COMPRESSION_MASK, 0)
+        self.assertEqual(serializers.loads(payload), TASK_DATA)
+
+    def test_loads_head(self):
+        data = dict(TASK_DATA, args=["a fat argument " * 1000])
+        payload = serializers.dumps(
+            data, MarshalSerializer(), ZlibCompressor()
+        )
+
+        with mock.patch.object(
+            ZlibCompressor, "decompress", wraps=ZlibCompressor().decompress
+        ) as mock_decompress:
+            head, load_data = serializers.loads_head(payload)
+            self.assertEqual(head["task_id"], "hello")
+            self.assertEqual(head["callable"], "run_me")
+            self.assertEqual(head["options"], TASK_DATA["options"])
+
+            # The (compressed) arguments weren't touched.
+            self.assertEqual(mock_decompress.call_count, 0)
+            self.assertEqual(load_data(), data)
+            self.assertEqual(mock_decompress.call_count, 1)
+
+        # Headerless payloads are decoded in full.
+        head, load_data = serializers.loads_head(json.dumps(TASK_DATA))
+        self.assertEqual(head, TASK_DATA)
+        self.assertEqual(load_data(), TASK_DATA)
+
+    def test_claim_check(self):
+        payload = serializers.dumps(TASK_DATA, JSONSerializer())
+        blob_store = mock.MagicMock()
+        blob_store.open.return_value.__enter__.return_value = payload
+
+        check = serializers.claim_check("abc123", payload)
+        self.assertEqual(serializers.blob_key(check), "abc123")
+
+        # The head is copied over, so it's read without the blob.
+        head, load_data = serializers.loads_head(check, blob_store)
+        self.assertEqual(head["task_id"], "hello")
+        self.assertEqual(blob_store.open.call_count, 0)
+        self.assertEqual(load_data(), TASK_DATA)
+        blob_store.open.assert_called_once_with("abc123")
+
+        # Without a payload, there's only the key.
+        check = serializers.claim_check("abc123")
+        self.assertEqual(serializers.blob_key(check), "abc123")
@@ -1,6 +1,12 @@
 import os
 import time
 import unittest
+from unittest import mock
+
+try:
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
 
 
 CONN_STRING = os.environ.get("ALLIGATOR_CONN")
@@ -45,3 +51,282 @@ class SQSTestCase(unittest.TestCase):
 
         self.backend.drop_all("all")
         time.sleep(61)
+
+
+class FakeMessage(object):
+    def __init__(self, body, receipt_handle):
+        self.body = body
+        self.receipt_handle = receipt_handle
+        self.message_attributes = None
+
+
+class FakeQueue(object):
+    def __init__(self, bodies):
+        self.messages = [
+            FakeMessage(body, "receipt-{}".format(offset))
+            for offset, body in enumerate(bodies)
+        ]
+        self.receives = []
+        self.deleted = []
+        self.sent = []
+
+    def receive_messages(self, MaxNumberOfMessages, **kwargs):
+        self.receives.append(MaxNumberOfMessages)
+        received = self.messages[:MaxNumberOfMessages]
+        self.messages = self.messages[MaxNumberOfMessages:]
+        return received
+
+    def send_message(self, MessageBody, **kwargs):
+        self.sent.append(MessageBody)
+        message_id = "message-{}".format(len(self.sent))
+        self.messages.append(FakeMessage(MessageBody, message_id))
+        return {"MessageId": message_id}
+
+    def change_message_visibility_batch(self, Entries):
+        self.made_visible = [entry["ReceiptHandle"] for entry in Entries]
+
+    def delete_messages(self, Entries):
+        self.deleted.append([entry["ReceiptHandle"] for entry in Entries])
+
+
+class FakeResource(object):
+    def __init__(self, queues):
+        self.queues = queues
+        self.lookups = []
+
+    def get_queue_by_name(self, QueueName):
+        self.lookups.append(QueueName)
+        return self.queues[QueueName]
+
+
+class SQSQueuesTestCase(unittest.TestCase):
+    def setUp(self):
+        super(SQSQueuesTestCase, self).setUp()
+
+        from alligator.backends.sqs_backend import Client as SQSClient
+
+        self.backend = SQSClient("sqs://us-west-2/")
+        self.queues = {
+            "all": FakeQueue(["all-0"]),
+            "dead": FakeQueue(["dead-0"]),
+            "urgent": FakeQueue([]),
+        }
+        self.resource = FakeResource(self.queues)
+        self.backend.get_connection = lambda region: self.resource
+
+    def test_get_queue(self):
+        self.assertEqual(self.backend.pop("all"), "all-0")
+        self.assertEqual(self.backend.pop("dead"), "dead-0")
+        self.assertEqual(self.backend.pop("all"), None)
+
+        # Each queue is only looked up once.
+        self.assertEqual(self.resource.lookups, ["all", "dead"])
+
+        self.backend.flush()
+        self.assertEqual(self.queues["all"].deleted, [["receipt-0"]])
+        self.assertEqual(self.queues["dead"].deleted, [["receipt-0"]])
+
+    def test_dead_letter_queue(self):
+        from alligator.gator import Gator
+        from alligator.backends.sqs_backend import Client as SQSClient
+
+        gator = Gator(
+            "sqs://us-west-2/",
+            backend_class=SQSClient,
+            dead_letter_queue="dead",
+        )
+        gator.backend.get_connection = lambda region: self.resource
+        gator.task(int, "1")
+        gator.dead_letter("not a task", ValueError("Nope."))
+
+        self.assertEqual(len(self.queues["all"].sent), 1)
+        self.assertEqual(len(self.queues["dead"].sent), 1)
+
+    def test_multiple_queues_worker(self):
+        from alligator.gator import Gator
+        from alligator.backends.sqs_backend import Client as SQSClient
+        from alligator.workers import Worker
+
+        self.queues["all"].messages = []
+        gator = Gator("sqs://us-west-2/", backend_class=SQSClient)
+        gator.backend.get_connection = lambda region: self.resource
+        urgent = gator.for_queue("urgent")
+
+        gator.task(int, "1")
+        urgent.task(int, "2")
+        urgent.task(int, "3")
+
+        worker = Worker(gator, to_consume=["urgent", "all"])
+        fetched = worker.fetch_tasks(3)
+        self.assertEqual(
+            [gator.queue_name for gator, _ in fetched],
+            ["urgent", "urgent", "all"],
+        )
+        self.assertEqual(
+            [gator.process(data).result for gator, data in fetched],
+            [2, 3, 1],
+        )
+
+        gator.backend.flush()
+        self.assertEqual(len(self.queues["urgent"].deleted[0]), 2)
+        self.assertEqual(len(self.queues["all"].deleted[0]), 1)
+
+
+class SQSBufferTestCase(unittest.TestCase):
+    def setUp(self):
+        super(SQSBufferTestCase, self).setUp()
+
+        from alligator.backends.sqs_backend import Client as SQSClient
+
+        self.backend = SQSClient(
+            "sqs://us-west-2/?endpoint_url=http://localhost:5000"
+            "&delete_interval=5000"
+        )
+        self.queue = FakeQueue(["task-{}".format(i) for i in range(25)])
+        self.other = FakeQueue(["other-{}".format(i) for i in range(5)])
+        self.backend.get_connection = lambda region: FakeResource(
+            {"all": self.queue, "other": self.other}
+        )
+
+    def tearDown(self):
+        self.backend.flush()
+        super(SQSBufferTestCase, self).tearDown()
+
+    def test_conn_string(self):
+        self.assertEqual(self.backend.region, "us-west-2")
+        self.assertEqual(self.backend.endpoint_url, "http://localhost:5000")
+        self.assertEqual(self.backend.prefetch, 10)
+        self.assertEqual(self.backend.delete_interval, 5)
+
+        from alligator.backends.sqs_backend import Client as SQSClient
+
+        # Never longer than messages may sit in the buffer.
+        backend = SQSClient("sqs://us-west-2/?delete_interval=60000")
+        self.assertEqual(backend.delete_interval, 10)
+
+    def test_buffered_receives(self):
+        self.assertEqual(self.backend.pop("all"), "task-0")
+        self.assertEqual(self.queue.receives, [10])
+
+        # Served from the buffer.
+        for i in range(1, 10):
+            self.assertEqual(self.backend.pop("all"), "task-{}".format(i))
+
+        self.assertEqual(self.queue.receives, [10])
+
+        self.assertEqual(
+            self.backend.pop_many("all", 3), ["task-10", "task-11", "task-12"]
+        )
+        self.assertEqual(self.queue.receives, [10, 10])
+
+    def test_buffer_per_queue(self):
+        self.assertEqual(self.backend.pop("all"), "task-0")
+        self.assertEqual(self.backend.pop("other"), "other-0")
+        self.assertEqual(self.backend.pop_many("all", 2), ["task-1", "task-2"])
+        self.assertEqual(self.queue.receives, [10])
+        self.assertEqual(self.other.receives, [10])
+
+        # Dropping one queue leaves the others' buffers alone.
+        self.other.purge = lambda: None
+        self.backend.drop_all("other")
+        self.assertEqual(self.backend.pop("all"), "task-3")
+        self.assertEqual(self.queue.receives, [10])
+
+    def test_stale_buffer(self):
+        from alligator.backends import sqs_backend
+
+        self.backend.pop("all")
+
+        with mock.patch.object(sqs_backend, "BUFFER_TIMEOUT", -1):
+            # The buffered messages are left for SQS to redeliver.
+            self.assertEqual(self.backend.pop("all"), "task-10")
+
+    def test_coalesced_deletes(self):
+        for i in range(9):
+            self.backend.pop("all")
+
+        self.assertEqual(self.queue.deleted, [])
+
+        self.backend.pop("all")
+        self.assertEqual(len(self.queue.deleted), 1)
+        self.assertEqual(len(self.queue.deleted[0]), 10)
+
+        self.backend.pop_many("all", 2)
+        self.assertEqual(len(self.queue.deleted), 1)
+
+        self.backend.flush()
+        self.assertEqual(self.queue.deleted[1], ["receipt-10", "receipt-11"])
+
+        self.backend.flush()
+        self.assertEqual(len(self.queue.deleted), 2)
+
+    def test_timed_deletes(self):
+        self.backend.delete_interval = 0.05
+        self.backend.pop("all")
+        self.assertEqual(self.queue.deleted, [])
+
+        # Sent in the background, without another call to the backend.
+        time.sleep(0.2)
+        self.assertEqual(self.queue.deleted, [["receipt-0"]])
+        self.assertEqual(self.backend._timer, None)
+
+    def test_reserve(self):
+        reserved = self.backend.reserve("all", 3, 45)
+        self.assertEqual(
+            reserved,
+            [
+                ("receipt-0", "task-0"),
+                ("receipt-1", "task-1"),
+                ("receipt-2", "task-2"),
+            ],
+        )
+        self.assertEqual(self.queue.receives, [3])
+
+        # Deleted right away.
+        self.backend.ack("all", "receipt-0")
+        self.assertEqual(self.queue.deleted, [["receipt-0"]])
+
+        self.backend.nack("all", "receipt-1")
+        self.assertEqual(self.queue.made_visible, ["receipt-1"])
+        self.assertEqual(self.backend.reap("all"), 0)
+
+
+@unittest.skipIf(mock_aws is None, "Skipping moto tests")
+class MotoSQSTestCase(unittest.TestCase):
+    def setUp(self):
+        super(MotoSQSTestCase, self).setUp()
+        self.mock = mock_aws()
+        self.mock.start()
+
+        import boto3
+
+        from alligator.backends.sqs_backend import Client as SQSClient
+
+        boto3.client("sqs", region_name="us-east-1").create_queue(
+            QueueName="all"
+        )
+        self.backend = SQSClient("sqs://us-east-1/")
+
+    def tearDown(self):
+        self.mock.stop()
+        super(MotoSQSTestCase, self).tearDown()
+
+    def test_batches(self):
+        items = [(None, "task-{}".format(i), None) for i in range(15)]
+        self.assertEqual(len(self.backend.push_many("all", items)), 15)
+        self.backend.push("all", None, b"\x00binary")
+
+        popped = []
+
+        while True:
+            fetched = self.backend.pop_many("all", 4)
+
+            if not fetched:
+                break
+
+            popped.extend(fetched)
+
+        self.backend.flush()
+        self.assertEqual(len(popped), 16)
+        self.assertIn(b"\x00binary", popped)
+        self.assertEqual(self.backend.len("all"), 0)
@@ -0,0 +1,82 @@
+import os
+import signal
+import unittest
+
+from alligator.backends.sqlite_backend import Client as SQLiteClient
+from alligator.gator import Gator
+from alligator.supervisor import Supervisor
+from alligator.workers import Worker
+
+
+ALLOW_SLOW = bool(os.environ.get("ALLIGATOR_SLOW", False))
+DB_PATH = "/tmp/alligator_test_supervisor.db"
+CONN_STRING = "sqlite://{}".format(DB_PATH)
+
+
+def add(a, b):
+    return a + b
+
+
+class SupervisorTestCase(unittest.TestCase):
+    def setUp(self):
+        super(SupervisorTestCase, self).setUp()
+
+        try:
+            os.unlink(DB_PATH)
+        except OSError:
+            pass
+
+        self.supervisor = Supervisor(
+            CONN_STRING,
+            processes=3,
+            max_tasks=2,
+            imports=["tests.test_workers"],
+            worker_kwargs={"nap_time": 0},
+        )
+
+    def test_init(self):
+        self.assertEqual(self.supervisor.conn_string, CONN_STRING)
+        self.assertEqual(self.supervisor.processes, 3)
+        self.assertEqual(self.supervisor.max_tasks, 2)
+        self.assertEqual(self.supervisor.queue_name, "all")
+        self.assertEqual(self.supervisor.imports, ["tests.test_workers"])
+        self.assertEqual(self.supervisor.worker_class, Worker)
+        self.assertEqual(self.supervisor.children, {})
+
+    def test_ident(self):
+        ident = self.supervisor.ident()
+        self.assertTrue(ident.startswith("Alligator Supervisor (#"))
+
+    def test_build_worker(self):
+        worker = self.supervisor.build_worker()
+        self.assertTrue(isinstance(worker, Worker))
+        self.assertEqual(worker.gator.conn_string, CONN_STRING)
+        self.assertEqual(worker.max_tasks, 2)
+        self.assertEqual(worker.nap_time, 0)
+
+    @unittest.skipIf(not ALLOW_SLOW, "Skipping slow supervisor tests")
+    def test_spawn_and_reap(self):
+        gator = Gator(CONN_STRING, backend_class=SQLiteClient)
+        gator.backend.setup_tables()
+        gator.push_many(add, [(1, 2), (3, 4), (5, 6)])
+
+        pid = self.supervisor.spawn()
+        self.assertTrue(pid in self.supervisor.children)
+
+        # Not running, so the child isn't replaced once it's done.
+        self.assertEqual(self.supervisor.reap(), pid)
+        self.assertEqual(self.supervisor.children, {})
+        self.assertEqual(gator.backend.len("all"), 1)
+
+    @unittest.skipIf(not ALLOW_SLOW, "Skipping slow supervisor tests")
+    def test_interrupt(self):
+        gator = Gator(CONN_STRING, backend_class=SQLiteClient)
+        gator.backend.setup_tables()
+
+        self.supervisor.worker_kwargs = {"nap_time": 0.1}
+        pid = self.supervisor.spawn()
+        self.supervisor.interrupt()
+
+        reaped, status = os.waitpid(pid, 0)
+        self.assertEqual(reaped, pid)
+        self.assertTrue(os.WIFEXITED(status) or os.WIFSIGNALED(status))
@@ -1,10 +1,13 @@
+import asyncio
 import datetime
 import json
 import unittest
 from unittest import mock
 
 from alligator.constants import WAITING, SUCCESS, FAILED, RETRYING, CANCELED
-from alligator.tasks import Task
+from alligator.exceptions import InvalidPriorityError
+from alligator.retries import ExponentialBackoff
+from alligator.tasks import LightTask, Task
 
 
 def run_me(x, y=None):
@@ -193,6 +196,80 @@ class TaskTestCase(unittest.TestCase):
             },
         )
 
+    def test_serialize_serializer(self):
+        task = Task(task_id="hello", retries=3, on_start=start)
+        task.to_call(run_me, 1, y=2)
+
+        data = task.serialize(serializer="marshal")
+        self.assertTrue(isinstance(data, bytes))
+
+        task = Task.deserialize(data)
+        self.assertEqual(task.task_id, "hello")
+        self.assertEqual(task.retries, 3)
+        self.assertEqual(task.on_start, start)
+        self.assertEqual(task.func, run_me)
+        self.assertEqual(list(task.func_args), [1])
+        self.assertEqual(task.func_kwargs, {"y": 2})
+
+    def test_serialize_depends_on(self):
+        first = Task(task_id="first")
+        task = Task(task_id="second", depends_on=[first, "other"])
+        task.to_call(run_me, 1)
+        self.assertEqual(task.depends_on, ["first", "other"])
+
+        for task_class in (Task, LightTask):
+            restored = task_class.deserialize(task.serialize())
+            self.assertEqual(restored.depends_on, ["first", "other"])
+
+    def test_serialize_priority(self):
+        task = Task(task_id="hello", priority=7)
+        task.to_call(run_me, 1)
+        self.assertEqual(
+            json.loads(task.serialize())["options"]["priority"], 7
+        )
+
+        for task_class in (Task, LightTask):
+            self.assertEqual(
+                task_class.deserialize(task.serialize()).priority, 7
+            )
+
+        # The default isn't stored at all.
+        task = Task(task_id="world")
+        task.to_call(run_me, 1)
+        self.assertNotIn("priority", json.loads(task.serialize())["options"])
+
+        with self.assertRaises(InvalidPriorityError):
+            Task(priority=10)
+
+        with self.assertRaises(InvalidPriorityError):
+            Task(priority=-1)
+
+    @mock.patch("time.time")
+    def test_retry_policy(self, mock_time):
+        mock_time.return_value = 12345678
+        policy = ExponentialBackoff(base=2, retry_on=[IOError])
+        task = Task(retries=3, retry_policy=policy)
+        task.to_call(run_me, 1)
+
+        self.assertTrue(task.should_retry(IOError()))
+        self.assertFalse(task.should_retry(ValueError()))
+
+        task.attempts = 2
+        self.assertEqual(task.schedule_retry(), 12345682)
+        self.assertEqual(task.retry_delay, 4)
+
+        for task_class in (Task, LightTask):
+            restored = task_class.deserialize(
+                task.serialize(serializer="marshal")
+            )
+            self.assertEqual(restored.retry_policy.to_dict(), policy.to_dict())
+            self.assertEqual(restored.attempts, 2)
+            self.assertEqual(restored.retry_delay, 4)
+            self.assertEqual(restored.delay_until, 12345682)
+
+        task.retries = 0
+        self.assertFalse(task.should_retry(IOError()))
+
     def test_deserialize(self):
         raw_json = json.dumps(
             {
@@ -273,3 +350,105 @@ class TaskTestCase(unittest.TestCase):
         self.assertEqual(task.result, 15)
         self.assertTrue(task.started)
         self.assertEqual(task.success_result, 15)
+
+    def test_run_coroutine(self):
+        async def start(t):
+            t.started = True
+
+        async def success(t, result):
+            t.success_result = result
+
+        async def success_task(initial, incr_by=1):
+            await asyncio.sleep(0)
+            return initial + incr_by
+
+        task = Task(on_start=start, on_success=success)
+        task.to_call(success_task, 12, 3)
+        task.run()
+        self.assertEqual(task.status, SUCCESS)
+        self.assertEqual(task.result, 15)
+        self.assertTrue(task.started)
+        self.assertEqual(task.success_result, 15)
+
+    def test_run_async(self):
+        async def start(t):
+            t.started = True
+
+        def success(t, result):
+            t.success_result = result
+
+        async def error(t, err):
+            t.err_msg = str(err)
+
+        async def success_task(initial, incr_by=1):
+            await asyncio.sleep(0)
+            return initial + incr_by
+
+        def blocking_task(initial, incr_by=1):
+            return initial * incr_by
+
+        async def fail_task(initial):
+            raise IOError("Math is hard.")
+
+        task = Task(on_start=start, on_success=success, on_error=error)
+        task.to_call(success_task, 12, 3)
+        asyncio.run(task.run_async())
+        self.assertEqual(task.result, 15)
+        self.assertTrue(task.started)
+        self.assertEqual(task.success_result, 15)
+
+        # Plain functions work too.
+        task.to_call(blocking_task, 12, 3)
+        asyncio.run(task.run_async())
+        self.assertEqual(task.result, 36)
+
+        task.to_call(fail_task, 2)
+
+        with self.assertRaises(IOError):
+            asyncio.run(task.run_async())
+
+        self.assertEqual(task.status, FAILED)
+        self.assertEqual(task.err_msg, "Math is hard.")
+
+
+class LightTaskTestCase(unittest.TestCase):
+    def test_slots(self):
+        task = LightTask()
+
+        with self.assertRaises(AttributeError):
+            task.whatever = True
+
+    def test_deserialize(self):
+        task = Task(task_id="hello", retries=3, on_start=start)
+        task.to_call(run_me, 1, y=2)
+        data = task.serialize(serializer="marshal")
+
+        with mock.patch(
+            "alligator.tasks.callable_cache.resolve"
+        ) as mock_resolve:
+            light = LightTask.deserialize(data)
+            self.assertEqual(light.task_id, "hello")
+            self.assertEqual(light.retries, 3)
+            self.assertEqual(light.is_async, True)
+
+        # Nothing was imported (& the arguments weren't decoded) yet.
+        self.assertEqual(mock_resolve.call_count, 0)
+        self.assertEqual(light._data.get("args"), None)
+
+        self.assertEqual(light.func, run_me)
+        self.assertEqual(light.func_args, (1,))
+        self.assertEqual(light.func_kwargs, {"y": 2})
+        self.assertEqual(light.on_start, start)
+        self.assertEqual(light.on_success, None)
+
+        light.run()
+        self.assertEqual(light.status, SUCCESS)
+
+    def test_round_trip(self):
+        light = LightTask(task_id="hello", delay_by=60)
+        light.to_call(run_me, 1, y=2)
+
+        task = Task.deserialize(light.serialize())
+        self.assertEqual(task.task_id, "hello")
+        self.assertEqual(task.func, run_me)
+        self.assertEqual(task.delay_until, light.delay_until)
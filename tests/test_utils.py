@@ -1,9 +1,11 @@
 import re
 import unittest
+from unittest import mock
 
 from alligator import __version__, version
 from alligator.exceptions import UnknownModuleError, UnknownCallableError
 from alligator.utils import (
+    CallableCache,
     determine_module,
     determine_name,
     import_module,
@@ -48,3 +50,78 @@ class UtilsTestCase(unittest.TestCase):
 
         if len(__version__) > 3:
             self.assertTrue(__version__[3] in v)
+
+
+def registered_task():
+    pass
+
+
+class CallableCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        super(CallableCacheTestCase, self).setUp()
+        self.cache = CallableCache(max_size=2)
+
+    def test_resolve(self):
+        import random
+
+        with mock.patch(
+            "alligator.utils.import_attr", wraps=import_attr
+        ) as mock_import:
+            self.assertEqual(
+                self.cache.resolve("random", "choice"), random.choice
+            )
+            self.assertEqual(
+                self.cache.resolve("random", "choice"), random.choice
+            )
+
+        # Only imported once.
+        self.assertEqual(mock_import.call_count, 1)
+
+        with self.assertRaises(UnknownCallableError):
+            self.cache.resolve("random", "yolo")
+
+    def test_resolve_bounded(self):
+        self.cache.resolve("random", "choice")
+        self.cache.resolve("random", "randint")
+        self.cache.resolve("random", "shuffle")
+
+        # The oldest got evicted.
+        self.assertEqual(
+            sorted(self.cache.cache),
+            [("random", "randint"), ("random", "shuffle")],
+        )
+
+    def test_register(self):
+        self.assertEqual(self.cache.register(registered_task), registered_task)
+        self.assertEqual(self.cache.cache, {})
+        self.assertEqual(self.cache.preload(), 1)
+
+        with mock.patch("alligator.utils.import_attr") as mock_import:
+            func = self.cache.resolve("tests.test_utils", "registered_task")
+
+        self.assertEqual(func, registered_task)
+        self.assertEqual(mock_import.call_count, 0)
+
+    def test_strict(self):
+        self.cache.strict = True
+        self.cache.register(registered_task)
+        self.assertEqual(
+            self.cache.resolve("tests.test_utils", "registered_task"),
+            registered_task,
+        )
+
+        with self.assertRaises(UnknownCallableError):
+            self.cache.resolve("random", "choice")
+
+    def test_invalidate(self):
+        self.cache.resolve("random", "choice")
+        self.cache.resolve("os.path", "join")
+
+        self.cache.invalidate("random", "randint")
+        self.assertEqual(len(self.cache.cache), 2)
+
+        self.cache.invalidate("random")
+        self.assertEqual(list(self.cache.cache), [("os.path", "join")])
+
+        self.cache.invalidate()
+        self.assertEqual(self.cache.cache, {})
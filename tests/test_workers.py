@@ -1,9 +1,14 @@
+import asyncio
 import os
+import threading
+import time
 import unittest
 from unittest import mock
 
-from alligator.gator import Gator
-from alligator.workers import Worker
+from alligator.backends.sqlite_backend import Client as SQLiteClient
+from alligator.gator import AsyncGator, Gator
+from alligator.polling import FixedPolling
+from alligator.workers import AsyncWorker, Worker, ThreadedWorker
 
 
 ALLOW_SLOW = bool(os.environ.get("ALLIGATOR_SLOW", False))
@@ -40,6 +45,22 @@ def raise_error(val):
     raise ValueError("You've chosen... poorly.")
 
 
+SLOW_CALLS = []
+SLOW_LOCK = threading.Lock()
+
+
+def slow_append(val):
+    time.sleep(0.2)
+
+    with SLOW_LOCK:
+        SLOW_CALLS.append(val)
+
+
+async def slow_async_append(val):
+    await asyncio.sleep(0.2)
+    SLOW_CALLS.append(val)
+
+
 @unittest.skipIf(not ALLOW_SLOW, "Skipping slow worker tests")
 class WorkerTestCase(unittest.TestCase):
     def setUp(self):
@@ -57,6 +78,8 @@ class WorkerTestCase(unittest.TestCase):
         self.assertEqual(self.worker.to_consume, "all")
         self.assertEqual(self.worker.nap_time, 1)
         self.assertEqual(self.worker.tasks_complete, 0)
+        self.assertTrue(isinstance(self.worker.poll_strategy, FixedPolling))
+        self.assertEqual(self.worker.poll_strategy.nap_time, 1)
 
     def test_ident(self):
         ident = self.worker.ident()
@@ -77,6 +100,30 @@ class WorkerTestCase(unittest.TestCase):
         self.assertEqual(self.worker.tasks_complete, 1)
         self.assertEqual(read_file(), 2)
 
+    def test_check_and_run_task_prefetch(self):
+        worker = Worker(self.gator, prefetch=3, nap_time=1)
+        self.gator.task(incr_file, 2)
+        self.gator.task(incr_file, 3)
+        self.gator.task(incr_file, 4)
+        self.gator.task(incr_file, 5)
+
+        self.assertTrue(worker.check_and_run_task())
+        self.assertEqual(self.gator.backend.len("all"), 1)
+        self.assertEqual(len(worker.buffer), 2)
+        self.assertEqual(read_file(), 2)
+
+        # The buffer shouldn't be refilled until it runs dry.
+        self.assertTrue(worker.check_and_run_task())
+        self.assertTrue(worker.check_and_run_task())
+        self.assertEqual(self.gator.backend.len("all"), 1)
+        self.assertEqual(len(worker.buffer), 0)
+
+        self.assertTrue(worker.check_and_run_task())
+        self.assertEqual(self.gator.backend.len("all"), 0)
+        self.assertFalse(worker.check_and_run_task())
+        self.assertEqual(worker.tasks_complete, 4)
+        self.assertEqual(read_file(), 14)
+
     def test_check_and_run_task_trap_exception(self):
         self.assertEqual(read_file(), 0)
 
@@ -88,9 +135,7 @@ class WorkerTestCase(unittest.TestCase):
         self.assertEqual(self.gator.backend.len("all"), 4)
         self.assertEqual(self.worker.tasks_complete, 0)
 
-        with mock.patch.object(
-            self.worker.log, "exception"
-        ) as mock_exception:
+        with mock.patch.object(self.worker.log, "exception") as mock_exception:
             self.assertTrue(self.worker.check_and_run_task())
             self.assertTrue(self.worker.check_and_run_task())
 
@@ -120,3 +165,263 @@ class WorkerTestCase(unittest.TestCase):
 
         self.assertEqual(self.gator.backend.len("all"), 1)
         self.assertEqual(read_file(), 5)
+
+    def test_run_forever_prefetch(self):
+        worker = Worker(self.gator, max_tasks=2, nap_time=0, prefetch=5)
+        self.gator.task(incr_file, 2)
+        self.gator.task(incr_file, 3)
+        self.gator.task(incr_file, 4)
+
+        # Never fetch more than the remaining number of tasks.
+        worker.run_forever()
+
+        self.assertEqual(self.gator.backend.len("all"), 1)
+        self.assertEqual(len(worker.buffer), 0)
+        self.assertEqual(read_file(), 5)
+
+    def test_run_forever_backend_down(self):
+        strategy = mock.Mock()
+        strategy.next_nap.return_value = 0
+        worker = Worker(self.gator, max_tasks=1, poll_strategy=strategy)
+        self.assertTrue(worker.can_block())
+
+        self.gator.task(incr_file, 2)
+        fetched = self.gator.fetch()
+        down = IOError("The backend is down.")
+
+        with mock.patch.object(
+            self.gator, "fetch", side_effect=[down, down, fetched]
+        ):
+            worker.run_forever()
+
+        # Failed fetches back off, rather than spinning.
+        self.assertEqual(read_file(), 2)
+        self.assertEqual(
+            strategy.next_nap.call_args_list,
+            [mock.call(False), mock.call(False), mock.call(True)],
+        )
+
+    def test_multiple_queues(self):
+        urgent = self.gator.for_queue("urgent")
+        urgent.backend.drop_all("urgent")
+        worker = Worker(self.gator, to_consume=["urgent", "all"])
+        self.assertEqual(worker.consuming(), "urgent, all")
+        self.assertFalse(worker.can_block())
+
+        self.gator.task(incr_file, 2)
+        urgent.task(incr_file, 3)
+        urgent.task(incr_file, 4)
+
+        # Earlier queues are strictly preferred.
+        fetched = worker.fetch_tasks(2)
+        self.assertEqual(
+            [gator.queue_name for gator, _ in fetched], ["urgent", "urgent"]
+        )
+        worker.buffer.extend(fetched)
+
+        for _ in range(3):
+            self.assertTrue(worker.check_and_run_task())
+
+        self.assertFalse(worker.check_and_run_task())
+        self.assertEqual(read_file(), 9)
+
+    def test_multiple_queues_weighted(self):
+        urgent = self.gator.for_queue("urgent")
+        urgent.backend.drop_all("urgent")
+        worker = Worker(
+            self.gator,
+            to_consume=["urgent", "all"],
+            weights={"urgent": 3},
+        )
+        self.assertEqual(worker.quanta, [3, 1])
+
+        urgent.push_many(incr_file, [1] * 7)
+        self.gator.push_many(incr_file, [1] * 4)
+        consumed = [worker.fetch_tasks(1)[0][0].queue_name for _ in range(10)]
+        self.assertEqual(
+            consumed,
+            ["urgent"] * 3
+            + ["all"]
+            + ["urgent"] * 3
+            + ["all", "urgent"]
+            + ["all"],
+        )
+
+        # Idle queues don't bank their share.
+        self.assertEqual(worker.deficits[0], 0)
+        urgent.push_many(incr_file, [1] * 2)
+        self.gator.push_many(incr_file, [1] * 2)
+        self.assertEqual(len(worker.fetch_tasks(5)), 5)
+
+        with self.assertRaises(ValueError):
+            Worker(self.gator, to_consume=["urgent", "all"], weights=[1])
+
+        with self.assertRaises(ValueError):
+            Worker(self.gator, to_consume=["urgent", "all"], weights=[1, 0])
+
+    def test_run_forever_poll_strategy(self):
+        try:
+            os.unlink("/tmp/alligator_test_workers.db")
+        except OSError:
+            pass
+
+        gator = Gator(
+            "sqlite:///tmp/alligator_test_workers.db",
+            backend_class=SQLiteClient,
+        )
+        gator.backend.setup_tables()
+        strategy = mock.Mock()
+        strategy.next_nap.return_value = 0
+        worker = Worker(gator, max_tasks=2, poll_strategy=strategy)
+
+        gator.task(incr_file, 2)
+        gator.task(incr_file, 3)
+        worker.run_forever()
+
+        self.assertEqual(read_file(), 5)
+        strategy.next_nap.assert_called_with(True)
+
+
+@unittest.skipIf(not ALLOW_SLOW, "Skipping slow worker tests")
+class ThreadedWorkerTestCase(unittest.TestCase):
+    def setUp(self):
+        super(ThreadedWorkerTestCase, self).setUp()
+        self.gator = Gator("locmem://")
+        self.gator.backend.drop_all("all")
+        del SLOW_CALLS[:]
+
+    def test_init(self):
+        worker = ThreadedWorker(self.gator, concurrency=3, max_tasks=2)
+        self.assertEqual(worker.gator, self.gator)
+        self.assertEqual(worker.concurrency, 3)
+        self.assertEqual(worker.max_tasks, 2)
+        self.assertEqual(worker.in_flight, 0)
+
+    def test_check_and_run_task(self):
+        worker = ThreadedWorker(self.gator, concurrency=2, prefetch=5)
+        self.gator.push_many(slow_append, [1, 2, 3])
+
+        # Only as many tasks as there are free threads get fetched.
+        self.assertTrue(worker.check_and_run_task())
+        self.assertEqual(worker.in_flight, 2)
+        self.assertEqual(self.gator.backend.len("all"), 1)
+
+        worker.wait_for_tasks()
+        self.assertEqual(worker.in_flight, 0)
+        self.assertEqual(worker.tasks_complete, 2)
+        self.assertEqual(sorted(SLOW_CALLS), [1, 2])
+
+    def test_run_forever(self):
+        worker = ThreadedWorker(
+            self.gator, concurrency=4, prefetch=4, max_tasks=4
+        )
+        self.gator.push_many(slow_append, [1, 2, 3, 4, 5])
+
+        start = time.time()
+        worker.run_forever()
+
+        # All four ran at the same time.
+        self.assertTrue(time.time() - start < 0.6)
+        self.assertEqual(worker.tasks_complete, 4)
+        self.assertEqual(sorted(SLOW_CALLS), [1, 2, 3, 4])
+        self.assertEqual(self.gator.backend.len("all"), 1)
+
+    def test_run_forever_sqlite(self):
+        try:
+            os.unlink("/tmp/alligator_test_workers.db")
+        except OSError:
+            pass
+
+        gator = Gator(
+            "sqlite:///tmp/alligator_test_workers.db",
+            backend_class=SQLiteClient,
+        )
+        gator.backend.setup_tables()
+        gator.push_many(slow_append, [1, 2, 3])
+        worker = ThreadedWorker(gator, concurrency=3, max_tasks=3, nap_time=0)
+
+        worker.run_forever()
+
+        self.assertEqual(sorted(SLOW_CALLS), [1, 2, 3])
+        self.assertEqual(gator.backend.len("all"), 0)
+
+
+@unittest.skipIf(not ALLOW_SLOW, "Skipping slow worker tests")
+class AsyncWorkerTestCase(unittest.TestCase):
+    def setUp(self):
+        super(AsyncWorkerTestCase, self).setUp()
+        self.gator = AsyncGator("locmem://")
+        asyncio.run(self.gator.backend.drop_all("all"))
+        del SLOW_CALLS[:]
+
+    def test_init(self):
+        worker = AsyncWorker(self.gator, concurrency=3, max_tasks=2)
+        self.assertEqual(worker.gator, self.gator)
+        self.assertEqual(worker.concurrency, 3)
+        self.assertEqual(worker.max_tasks, 2)
+        self.assertEqual(worker.running, set())
+
+    def test_run_forever(self):
+        worker = AsyncWorker(
+            self.gator, concurrency=10, prefetch=10, max_tasks=8
+        )
+        asyncio.run(self.gator.push_many(slow_async_append, list(range(10))))
+
+        start = time.time()
+        worker.run_forever()
+
+        # All eight ran at the same time, on the one loop.
+        self.assertTrue(time.time() - start < 0.6)
+        self.assertEqual(worker.tasks_complete, 8)
+        self.assertEqual(sorted(SLOW_CALLS), list(range(8)))
+        self.assertEqual(asyncio.run(self.gator.len()), 2)
+
+    def test_run_forever_bounded(self):
+        worker = AsyncWorker(
+            self.gator, concurrency=2, prefetch=5, max_tasks=4
+        )
+        asyncio.run(self.gator.push_many(slow_async_append, [1, 2, 3, 4]))
+
+        start = time.time()
+        worker.run_forever()
+
+        # Only two at a time.
+        self.assertTrue(time.time() - start >= 0.4)
+        self.assertEqual(worker.tasks_complete, 4)
+        self.assertEqual(sorted(SLOW_CALLS), [1, 2, 3, 4])
+
+    def test_run_forever_backend_down(self):
+        strategy = mock.Mock()
+        strategy.next_nap.return_value = 0
+        worker = AsyncWorker(self.gator, max_tasks=1, poll_strategy=strategy)
+        asyncio.run(self.gator.push_many(slow_async_append, [1]))
+        fetched = asyncio.run(self.gator.fetch())
+        down = IOError("The backend is down.")
+
+        with mock.patch.object(
+            self.gator, "fetch", side_effect=[down, down, fetched]
+        ):
+            worker.run_forever()
+
+        # Failed fetches back off, rather than spinning.
+        self.assertEqual(SLOW_CALLS, [1])
+        self.assertEqual(
+            strategy.next_nap.call_args_list[:3],
+            [mock.call(False), mock.call(False), mock.call(True)],
+        )
+
+    def test_run_forever_sqlite(self):
+        try:
+            os.unlink("/tmp/alligator_test_workers.db")
+        except OSError:
+            pass
+
+        gator = AsyncGator("sqlite:///tmp/alligator_test_workers.db")
+        gator.backend.client.setup_tables()
+        asyncio.run(gator.push_many(slow_append, [1, 2, 3]))
+        worker = AsyncWorker(gator, concurrency=3, max_tasks=3, nap_time=0)
+
+        worker.run_forever()
+
+        self.assertEqual(sorted(SLOW_CALLS), [1, 2, 3])
+        self.assertEqual(asyncio.run(gator.len()), 0)